@@ -1,8 +1,9 @@
-from typing import Tuple
+from typing import Tuple, Type
 
 from django.contrib import admin
 
 from drug_insights_hub.accounts.models import Affiliation, UserProfile
+from drug_insights_hub.core.pagination import EstimatedCountPaginator
 
 
 @admin.register(Affiliation)
@@ -13,18 +14,11 @@ class AffiliationAdmin(admin.ModelAdmin):
         "description",
         "website",
     )
-    list_filter: Tuple[str, str, str, str] = (
-        "name",
-        "location",
-        "description",
-        "website",
-    )
-    search_fields: Tuple[str, str, str, str] = (
-        "name",
-        "location",
-        "description",
-        "website",
-    )
+    list_filter: Tuple[str] = ("location",)
+    # Both have trigram indexes on PostgreSQL, see accounts migration 0002.
+    search_fields: Tuple[str, str] = ("name", "location")
+    paginator: Type[EstimatedCountPaginator] = EstimatedCountPaginator
+    show_full_result_count: bool = False
 
 
 @admin.register(UserProfile)
@@ -36,20 +30,12 @@ class UserProfileAdmin(admin.ModelAdmin):
         "specialization",
         "user",
     )
-    list_filter: Tuple[str, str, str, str] = (
-        "bio",
-        "interests",
-        "specialization",
-        "user",
-    )
-    search_fields: Tuple[str, str, str, str] = (
-        "bio",
-        "interests",
-        "specialization",
-        "user",
-    )
+    list_filter: Tuple[str] = ("specialization",)
+    list_select_related: Tuple[str] = ("user",)
+    search_fields: Tuple[str] = ("user__username",)
+    paginator: Type[EstimatedCountPaginator] = EstimatedCountPaginator
+    show_full_result_count: bool = False
 
+    @admin.display(description="Username", ordering="user__username")
     def username(self, obj: UserProfile) -> str:
         return obj.user.username
-
-    username.short_description = "Username"
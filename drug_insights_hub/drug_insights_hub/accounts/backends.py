@@ -0,0 +1,18 @@
+from typing import Optional, Type
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.models import User
+
+USER_MODEL: Type[User] = get_user_model()
+
+
+class AffiliationModelBackend(ModelBackend):
+    def get_user(self, user_id: int) -> Optional[User]:
+        try:
+            user: User = USER_MODEL._default_manager.select_related(
+                "userprofile__affiliation"
+            ).get(pk=user_id)
+        except USER_MODEL.DoesNotExist:
+            return None
+        return user if self.user_can_authenticate(user) else None
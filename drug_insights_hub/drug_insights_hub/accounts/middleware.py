@@ -0,0 +1,40 @@
+from typing import Awaitable, Callable, Optional
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.contrib.auth.models import User
+from django.core.exceptions import ObjectDoesNotExist
+from django.http import HttpRequest, HttpResponse
+
+from drug_insights_hub.accounts.models import Affiliation
+
+
+def get_affiliation(user: User) -> Optional[Affiliation]:
+    if not user.is_authenticated:
+        return None
+    try:
+        return user.userprofile.affiliation
+    except ObjectDoesNotExist:
+        return None
+
+
+class AffiliationMiddleware:
+    sync_capable: bool = True
+    async_capable: bool = True
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        self.get_response: Callable[[HttpRequest], HttpResponse] = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> HttpResponse | Awaitable:
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        request.affiliation = get_affiliation(request.user)
+        return self.get_response(request)
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        # Resolve the user once so async views and templates can read
+        # request.user without touching the database.
+        request.user = await request.auser()
+        request.affiliation = await sync_to_async(get_affiliation)(request.user)
+        return await self.get_response(request)
@@ -0,0 +1,43 @@
+# Generated by Django 5.0.3 on 2026-10-18 11:52
+
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+# index -> (table, column) searched with icontains, which PostgreSQL runs as
+# UPPER(column::text) LIKE UPPER('%term%'). auth_user_username_trgm is created
+# on auth's table from this app: the accounts admin and user lookup search it,
+# and auth's own migrations never touch the index. Reversing this migration
+# drops it.
+SEARCH_INDEXES = {
+    "accounts_affiliation_name_trgm": ("accounts_affiliation", "name"),
+    "accounts_affiliation_location_trgm": ("accounts_affiliation", "location"),
+    "auth_user_username_trgm": ("auth_user", "username"),
+}
+
+
+def create_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        for name, (table, column) in SEARCH_INDEXES.items():
+            schema_editor.execute(
+                f"CREATE INDEX {name} ON {table} "
+                f"USING gin (UPPER({column}::text) gin_trgm_ops)"
+            )
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        for name in SEARCH_INDEXES:
+            schema_editor.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
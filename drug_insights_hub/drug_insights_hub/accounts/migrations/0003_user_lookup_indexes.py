@@ -0,0 +1,38 @@
+# Generated by Django 5.0.3 on 2026-10-18 12:40
+
+from django.db import migrations
+
+# index -> (table, column) searched with istartswith by the user lookup, which
+# PostgreSQL runs as UPPER(column::text) LIKE UPPER('term%'). username is
+# covered by auth_user_username_trgm. Like that index, these are created on
+# auth's table from this app, which owns the lookup.
+LOOKUP_INDEXES = {
+    "auth_user_first_name_prefix": ("auth_user", "first_name"),
+    "auth_user_last_name_prefix": ("auth_user", "last_name"),
+}
+
+
+def create_lookup_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        for name, (table, column) in LOOKUP_INDEXES.items():
+            schema_editor.execute(
+                f"CREATE INDEX {name} ON {table} "
+                f"(UPPER({column}::text) text_pattern_ops)"
+            )
+
+
+def drop_lookup_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        for name in LOOKUP_INDEXES:
+            schema_editor.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_admin_search_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_lookup_indexes, drop_lookup_indexes),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.0.3 on 2026-10-18 13:05
+
+from django.contrib.auth import BACKEND_SESSION_KEY
+from django.contrib.sessions.backends.db import SessionStore
+from django.db import migrations
+
+# Sessions remember the backend that logged them in, and Django drops those
+# whose backend is no longer in AUTHENTICATION_BACKENDS. Listing ModelBackend
+# again would run every failed login through both backends.
+MODEL_BACKEND = "django.contrib.auth.backends.ModelBackend"
+AFFILIATION_BACKEND = "drug_insights_hub.accounts.backends.AffiliationModelBackend"
+
+
+def rename_backend(apps, old, new):
+    Session = apps.get_model("sessions", "Session")
+    store = SessionStore()
+    renamed = []
+    for session in Session.objects.filter(session_data__isnull=False).iterator():
+        data = store.decode(session.session_data)
+        if data.get(BACKEND_SESSION_KEY) != old:
+            continue
+        data[BACKEND_SESSION_KEY] = new
+        session.session_data = store.encode(data)
+        renamed.append(session)
+    Session.objects.bulk_update(renamed, ["session_data"], batch_size=1000)
+
+
+def forwards(apps, schema_editor):
+    rename_backend(apps, MODEL_BACKEND, AFFILIATION_BACKEND)
+
+
+def backwards(apps, schema_editor):
+    rename_backend(apps, AFFILIATION_BACKEND, MODEL_BACKEND)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_user_lookup_indexes'),
+        ('sessions', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards, backwards),
+    ]
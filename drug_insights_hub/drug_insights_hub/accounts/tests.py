@@ -1,9 +1,15 @@
-from django.contrib.auth import get_user_model
-from django.contrib.auth.models import User
-from django.test import TestCase
+from importlib import import_module
+
+from django.apps import apps as django_apps
+from django.contrib.auth import authenticate, get_user_model
+from django.contrib.auth.models import AnonymousUser, User
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase
 from django.urls import reverse
 
-from drug_insights_hub.accounts.models import UserProfile
+from drug_insights_hub.accounts.backends import AffiliationModelBackend
+from drug_insights_hub.accounts.middleware import AffiliationMiddleware
+from drug_insights_hub.accounts.models import Affiliation, UserProfile
 
 USER_MODEL = get_user_model()
 
@@ -67,4 +73,97 @@ class UserLoginViewTest(TestCase):
 
     def test_template_render(self):
         response = self.client.get(reverse("login"))
-        self.assertTemplateUsed(response, "accounts/login.html")
\ No newline at end of file
+        self.assertTemplateUsed(response, "accounts/login.html")
+
+
+class AffiliationResolutionTest(TestCase):
+    def setUp(self):
+        self.affiliation = Affiliation.objects.create(
+            name="Test Affiliation",
+            location="Sofia",
+            description="Test description",
+            website="https://example.com",
+        )
+        self.user = USER_MODEL.objects.create_user(
+            username="test_user", password="test_password"
+        )
+        self.user.userprofile.affiliation = self.affiliation
+        self.user.userprofile.save()
+
+    def test_backend_loads_profile_and_affiliation_in_one_query(self):
+        with self.assertNumQueries(1):
+            user = AffiliationModelBackend().get_user(self.user.pk)
+            self.assertEqual(user.userprofile.affiliation.name, "Test Affiliation")
+
+    def test_sessions_logged_in_with_model_backend_are_migrated(self):
+        migration = import_module(
+            "drug_insights_hub.accounts.migrations.0004_session_backend_path"
+        )
+        self.client.force_login(self.user, backend=migration.MODEL_BACKEND)
+        migration.forwards(django_apps, None)
+
+        response = self.client.get(reverse("index"))
+        self.assertEqual(response.context["user"], self.user)
+
+    def test_failed_logins_run_one_backend(self):
+        # One username query per attempt: a second ModelBackend would repeat
+        # the query and the password hashing.
+        with self.assertNumQueries(2):
+            self.assertIsNone(
+                authenticate(username="test_user", password="wrong_password")
+            )
+            self.assertIsNone(authenticate(username="nobody", password="password"))
+
+    def test_middleware_attaches_affiliation(self):
+        request = RequestFactory().get("/")
+        request.user = AnonymousUser()
+        AffiliationMiddleware(lambda request: HttpResponse())(request)
+        self.assertIsNone(request.affiliation)
+
+        request.user = AffiliationModelBackend().get_user(self.user.pk)
+        with self.assertNumQueries(0):
+            AffiliationMiddleware(lambda request: HttpResponse())(request)
+        self.assertEqual(request.affiliation, self.affiliation)
+
+
+class AdminQueryBudgetTest(TestCase):
+    # Session and user, the count, the page, then the list filter choices.
+    QUERY_BUDGETS = {"accounts_affiliation": 5, "accounts_userprofile": 4}
+
+    def setUp(self):
+        self.user = USER_MODEL.objects.create_superuser(
+            username="admin", password="test_password"
+        )
+        self.client.force_login(self.user)
+
+    def assert_query_budgets(self, rows: int) -> None:
+        affiliations = Affiliation.objects.bulk_create(
+            Affiliation(
+                name=f"Affiliation {number}",
+                location=f"City {number % 3}",
+                description="Test description",
+                website="https://example.com",
+            )
+            for number in range(rows)
+        )
+        users = USER_MODEL.objects.bulk_create(
+            USER_MODEL(username=f"user_{number}") for number in range(rows)
+        )
+        UserProfile.objects.bulk_create(
+            UserProfile(user=user, affiliation=affiliation)
+            for user, affiliation in zip(users, affiliations)
+        )
+
+        for name, budget in self.QUERY_BUDGETS.items():
+            for params in ({}, {"q": "1"}):
+                with self.subTest(name, **params), self.assertNumQueries(budget):
+                    response = self.client.get(
+                        reverse(f"admin:{name}_changelist"), params
+                    )
+                    self.assertEqual(response.status_code, 200)
+
+    def test_query_budgets_with_5_rows(self):
+        self.assert_query_budgets(5)
+
+    def test_query_budgets_with_a_full_page(self):
+        self.assert_query_budgets(100)
@@ -4,6 +4,7 @@ from django.contrib.auth.views import LogoutView
 from drug_insights_hub.accounts.views import (
     UserDetailsView,
     UserLoginView,
+    UserLookupView,
     UserProfileUpdateView,
     UserRegistrationView,
     UserDeleteView,
@@ -14,6 +15,7 @@ urlpatterns = [
     path("login/", UserLoginView.as_view(), name="login"),
     path("logout/", LogoutView.as_view(next_page="index"), name="logout"),
     path("delete/", UserDeleteView.as_view(), name="delete_user"),
+    path("lookup/", UserLookupView.as_view(), name="user_lookup"),
     path(
         "profile/",
         include(
@@ -1,4 +1,4 @@
-from typing import Any, Dict, Type
+from typing import Any, Dict, Tuple, Type
 
 from django.contrib.auth import get_user_model
 from django.contrib.auth.mixins import LoginRequiredMixin
@@ -6,7 +6,9 @@ from django.contrib.auth.models import User
 from django.contrib.auth.views import LoginView
 from django.db.models.base import Model as Model
 from django.db.models.query import QuerySet
+from django.http import HttpRequest, JsonResponse
 from django.urls import reverse_lazy
+from django.views import View
 from django.views.generic import CreateView, DeleteView, DetailView, UpdateView
 
 from drug_insights_hub.accounts.forms import (
@@ -14,6 +16,7 @@ from drug_insights_hub.accounts.forms import (
     UserProfileUpdateForm,
 )
 from drug_insights_hub.accounts.models import UserProfile
+from drug_insights_hub.core.lookups import lookup_response
 
 USER_MODEL: Type[User] = get_user_model()
 
@@ -84,3 +87,15 @@ class UserDetailsView(DetailView, LoginRequiredMixin):
 
     def get_object(self, queryset=None) -> User:
         return self.request.user
+
+
+class UserLookupView(LoginRequiredMixin, View):
+    search_fields: Tuple[str, ...] = ("username", "first_name", "last_name")
+
+    def get(self, request: HttpRequest) -> JsonResponse:
+        return lookup_response(
+            request,
+            USER_MODEL.objects.only("username"),
+            search_fields=self.search_fields,
+            ordering=("username",),
+        )
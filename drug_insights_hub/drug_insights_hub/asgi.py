@@ -14,3 +14,9 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'drug_insights_hub.settings')
 
 application = get_asgi_application()
+
+# Imported once the apps are loaded. Builds the autocomplete index off the
+# request path.
+from drug_insights_hub.research.autocomplete import drug_name_index  # noqa: E402
+
+drug_name_index.warm_up()
@@ -1,3 +1,127 @@
-from django.contrib import admin
+import pstats
+from typing import Any, Dict, List, Optional, Tuple
 
-# Register your models here.
+from django.contrib import admin, messages
+from django.db.models import QuerySet
+from django.http import (
+    FileResponse,
+    Http404,
+    HttpRequest,
+    HttpResponse,
+    HttpResponseRedirect,
+)
+from django.shortcuts import get_object_or_404, redirect
+from django.urls import URLPattern, path, reverse
+from django.utils.html import format_html
+
+from drug_insights_hub.core import profiling
+from drug_insights_hub.core.models import ProfileReport
+
+
+@admin.register(ProfileReport)
+class ProfileReportAdmin(admin.ModelAdmin):
+    list_display: Tuple[str, ...] = (
+        "created_at",
+        "view_name",
+        "method",
+        "path",
+        "status_code",
+        "duration_ms",
+        "queries",
+        "db_ms",
+        "profiled_by",
+        "hostname",
+        "downloads",
+    )
+    list_filter: Tuple[str, str] = ("view_name", "status_code")
+    list_select_related: Tuple[str] = ("profiled_by",)
+    search_fields: Tuple[str, str] = ("view_name", "path")
+    actions: Tuple[str] = ("expire",)
+
+    def has_add_permission(self, request: HttpRequest) -> bool:
+        return False
+
+    def has_change_permission(
+        self, request: HttpRequest, obj: Optional[ProfileReport] = None
+    ) -> bool:
+        return False
+
+    def get_urls(self) -> List[URLPattern]:
+        return [
+            path(
+                "<int:pk>/download/<str:kind>/",
+                self.admin_site.admin_view(self.download),
+                name="core_profilereport_download",
+            ),
+            *super().get_urls(),
+        ]
+
+    def changelist_view(
+        self, request: HttpRequest, extra_context: Optional[Dict[str, Any]] = None
+    ) -> HttpResponse:
+        return super().changelist_view(
+            request,
+            {
+                **(extra_context or {}),
+                "profile_parameter": profiling.PROFILE_PARAMETER,
+                "profile_header": profiling.PROFILE_HEADER,
+                "profile_token": profiling.make_token(request.user),
+            },
+        )
+
+    @admin.display(description="Download")
+    def downloads(self, obj: ProfileReport) -> str:
+        return format_html(
+            '<a href="{}">pstats</a> / <a href="{}">flamegraph</a>',
+            reverse("admin:core_profilereport_download", args=(obj.pk, "pstats")),
+            reverse("admin:core_profilereport_download", args=(obj.pk, "collapsed")),
+        )
+
+    @admin.action(description="Expire selected reports", permissions=("delete",))
+    def expire(self, request: HttpRequest, queryset: QuerySet) -> None:
+        # Deleted one by one so the post_delete receiver removes the files.
+        expired: int = 0
+        for report in queryset:
+            report.delete()
+            expired += 1
+        self.message_user(request, f"Expired {expired} profile reports.")
+
+    def download(self, request: HttpRequest, pk: int, kind: str) -> HttpResponse:
+        if not self.has_view_permission(request):
+            raise Http404
+        report: ProfileReport = get_object_or_404(ProfileReport, pk=pk)
+        if kind not in ("pstats", "collapsed"):
+            raise Http404
+        stats: Optional[pstats.Stats] = profiling.read_stats(report)
+        if stats is None:
+            return self.missing_profile(request, report)
+        if kind == "pstats":
+            try:
+                return FileResponse(
+                    profiling.report_path(report).open("rb"),
+                    as_attachment=True,
+                    filename=f"profile-{report.pk}.prof",
+                )
+            except FileNotFoundError:
+                return self.missing_profile(request, report)
+        response: HttpResponse = HttpResponse(
+            profiling.collapsed_stacks(stats),
+            content_type="text/plain; charset=utf-8",
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="profile-{report.pk}.folded"'
+        )
+        return response
+
+    def missing_profile(
+        self, request: HttpRequest, report: ProfileReport
+    ) -> HttpResponseRedirect:
+        # Profiles are written to PROFILE_REPORT_DIR on the host that served
+        # the request, while the reports are listed on every host.
+        self.message_user(
+            request,
+            f"The profile of report {report.pk} is not on this server"
+            f" (written on {report.hostname or 'an unknown host'}).",
+            messages.WARNING,
+        )
+        return redirect("admin:core_profilereport_changelist")
@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class CoreConfig(AppConfig):
     default_auto_field: str = "django.db.models.BigAutoField"
     name: str = "drug_insights_hub.core"
+
+    def ready(self) -> None:
+        from drug_insights_hub.core.signals import connect_stats_counters
+
+        connect_stats_counters()
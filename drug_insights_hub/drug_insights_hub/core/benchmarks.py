@@ -0,0 +1,178 @@
+import statistics
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, NamedTuple
+
+from django.db import connection, reset_queries
+from django.http import HttpResponse
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import get_resolver, reverse
+
+from drug_insights_hub.research.seeding import SeededData
+
+# Total rows spread over the seeded tables, see research.seeding.ROW_SHARES.
+DATASETS: Dict[str, int] = {"1k": 1_000, "100k": 100_000, "1m": 1_000_000}
+# Keeps the seeded names apart from data seeded by seed_research.
+SEED_PREFIX: str = "benchmark"
+
+# Wall time and memory vary between runs and machines, so they are only
+# checked on request, and a regression also has to exceed these absolute
+# deltas. Query counts are always checked.
+MIN_WALL_DELTA_MS: float = 10.0
+MIN_MEMORY_DELTA_KIB: float = 256.0
+
+# url name -> measured values
+BenchmarkResults = Dict[str, Dict[str, float]]
+
+
+class ViewCase(NamedTuple):
+    kwargs: Callable[[SeededData], Dict[str, Any]] = lambda seeded: {}
+    data: Dict[str, str] = {}
+    method: str = "get"
+    anonymous: bool = False
+
+
+def _drug(seeded: SeededData) -> Dict[str, Any]:
+    return {"pk": seeded.drugs[0].pk}
+
+
+def _trial(seeded: SeededData) -> Dict[str, Any]:
+    return {"pk": seeded.clinical_trials[0].pk}
+
+
+def _publication(seeded: SeededData) -> Dict[str, Any]:
+    return {"pk": seeded.publications[0].pk}
+
+
+# Requests are made as the first seeded user, whose affiliation owns the first
+# drug, trial and publication.
+VIEW_CASES: Dict[str, ViewCase] = {
+    "index": ViewCase(),
+    "register": ViewCase(anonymous=True),
+    "login": ViewCase(anonymous=True),
+    "logout": ViewCase(method="post"),
+    "delete_user": ViewCase(),
+    "user_lookup": ViewCase(data={"q": "First1"}),
+    "profile": ViewCase(),
+    "profile_update": ViewCase(),
+    "error": ViewCase(),
+    "search": ViewCase(data={"q": SEED_PREFIX}),
+    "affiliation_dashboard": ViewCase(),
+    "api_list": ViewCase(
+        kwargs=lambda seeded: {"resource_name": "publications"},
+        data={"affiliation": "mine"},
+    ),
+    "api_detail": ViewCase(
+        kwargs=lambda seeded: {"resource_name": "publications", **_publication(seeded)}
+    ),
+    "drug_creation": ViewCase(),
+    "drug_autocomplete": ViewCase(data={"q": SEED_PREFIX[:5]}),
+    "affiliated_drugs_list": ViewCase(),
+    "drug_update": ViewCase(kwargs=_drug),
+    "drug_details": ViewCase(kwargs=_drug),
+    "drug_delete": ViewCase(kwargs=_drug),
+    "clinical_trial_creation": ViewCase(),
+    "clinical_trial_lookup": ViewCase(data={"q": SEED_PREFIX}),
+    "clinical_trial_timeline": ViewCase(data={"affiliation": "mine"}),
+    "affiliated_clinical_trials_list": ViewCase(),
+    "clinical_trial_update": ViewCase(kwargs=_trial),
+    "clinical_trial_delete": ViewCase(kwargs=_trial),
+    "clinical_trial_details": ViewCase(kwargs=_trial),
+    "publication_creation": ViewCase(),
+    "affiliated_publications_list": ViewCase(),
+    "publication_update": ViewCase(kwargs=_publication),
+    "publication_delete": ViewCase(kwargs=_publication),
+    "publication_details": ViewCase(kwargs=_publication),
+}
+
+
+def named_urls() -> List[str]:
+    return sorted(name for name in get_resolver().reverse_dict if isinstance(name, str))
+
+
+def run_benchmarks(
+    seeded: SeededData, names: List[str], repeat: int = 5
+) -> BenchmarkResults:
+    client: Client = Client()
+    results: BenchmarkResults = {}
+    for name in names:
+        case: ViewCase = VIEW_CASES[name]
+        path: str = reverse(name, kwargs=case.kwargs(seeded))
+
+        def prepare() -> None:
+            # Outside the measured part; logout also ends the session.
+            client.logout()
+            if not case.anonymous:
+                client.force_login(seeded.users[0])
+
+        def request() -> HttpResponse:
+            response: HttpResponse = getattr(client, case.method)(path, case.data)
+            if response.streaming:
+                b"".join(response.streaming_content)
+            return response
+
+        prepare()
+        status: int = request().status_code
+        timings: List[float] = []
+        query_count: int = 0
+        for _ in range(repeat):
+            prepare()
+            # The query log is capped, and seeding alone fills it up.
+            reset_queries()
+            with CaptureQueriesContext(connection) as queries:
+                started: float = time.perf_counter()
+                request()
+                timings.append((time.perf_counter() - started) * 1000)
+            query_count = len(queries)
+
+        # Measured on a separate request, tracing slows everything else down.
+        prepare()
+        tracemalloc.start()
+        try:
+            request()
+            memory_kib: float = tracemalloc.get_traced_memory()[1] / 1024
+        finally:
+            tracemalloc.stop()
+
+        # The median, so one fast or slow run does not move the baseline.
+        results[name] = {
+            "status": status,
+            "wall_ms": round(statistics.median(timings), 2),
+            "queries": query_count,
+            "memory_kib": round(memory_kib, 1),
+        }
+    return results
+
+
+def find_regressions(
+    results: BenchmarkResults,
+    baseline: BenchmarkResults,
+    threshold: float,
+    check_timings: bool = False,
+) -> List[str]:
+    regressions: List[str] = []
+    for name, measured in results.items():
+        expected: Dict[str, float] | None = baseline.get(name)
+        if expected is None:
+            continue
+        if measured["queries"] > expected["queries"]:
+            regressions.append(
+                f"{name}: {measured['queries']} queries, "
+                f"baseline {expected['queries']}"
+            )
+        if not check_timings:
+            continue
+        for metric, min_delta, unit in (
+            ("wall_ms", MIN_WALL_DELTA_MS, "ms"),
+            ("memory_kib", MIN_MEMORY_DELTA_KIB, "KiB"),
+        ):
+            if (
+                measured[metric] > expected[metric] * (1 + threshold)
+                and measured[metric] - expected[metric] > min_delta
+            ):
+                regressions.append(
+                    f"{name}: {measured[metric]} {unit}, "
+                    f"baseline {expected[metric]} {unit}"
+                )
+    return regressions
@@ -0,0 +1,60 @@
+import datetime
+import time
+
+from django.core.cache import caches
+
+VERSION_KEY_PREFIX: str = "version"
+# A backend shared by all workers, see CACHES in the settings.
+VERSION_CACHE_ALIAS: str = "versions"
+
+
+def version_key(namespace: str) -> str:
+    return f"{VERSION_KEY_PREFIX}:{namespace}"
+
+
+def initial_version() -> int:
+    # Start from the clock so a version evicted from the cache never comes back
+    # as a number that older entries were stored under.
+    return time.time_ns() // 1000
+
+
+def get_version(namespace: str, using: str = VERSION_CACHE_ALIAS) -> int:
+    key: str = version_key(namespace)
+    version: int | None = caches[using].get(key)
+    if version is None:
+        caches[using].add(key, initial_version(), timeout=None)
+        version = caches[using].get(key, 0)
+    return version
+
+
+def bump_version(namespace: str, using: str = VERSION_CACHE_ALIAS) -> int:
+    key: str = version_key(namespace)
+    try:
+        return caches[using].incr(key)
+    except ValueError:
+        version: int = initial_version()
+        caches[using].set(key, version, timeout=None)
+        return version
+
+
+def touch_version(namespace: str, using: str = VERSION_CACHE_ALIAS) -> int:
+    # Like bump_version(), but the new version is never behind the clock, so it
+    # also tells when the namespace last changed, see version_time().
+    key: str = version_key(namespace)
+    version: int = max(caches[using].get(key, 0) + 1, initial_version())
+    caches[using].set(key, version, timeout=None)
+    return version
+
+
+def version_time(version: int) -> datetime.datetime:
+    return datetime.datetime.fromtimestamp(
+        version / 1_000_000, tz=datetime.timezone.utc
+    )
+
+
+def versioned_key(
+    namespace: str, *parts: object, using: str = VERSION_CACHE_ALIAS
+) -> str:
+    return ":".join(
+        [namespace, str(get_version(namespace, using=using)), *map(str, parts)]
+    )
@@ -0,0 +1,55 @@
+from typing import Dict, List, Sequence, Set
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.template.loader import render_to_string
+from django.utils.safestring import SafeString, mark_safe
+
+from drug_insights_hub.research.conditional import affiliation_version
+from drug_insights_hub.research.models import Publication
+
+CARD_TEMPLATE: str = "core/publication_card.html"
+CARD_CACHE_TIMEOUT: int = 60 * 60 * 24
+
+
+def card_key(publication: Publication, affiliation_version: int) -> str:
+    # updated_at is touched by every change a card shows (see research.signals)
+    # except affiliation renames, which bump the affiliation's version.
+    return (
+        f"publication_card:{publication.pk}:{publication.updated_at.timestamp()}"
+        f":{affiliation_version}"
+    )
+
+
+def card_keys(publications: Sequence[Publication]) -> Dict[int, str]:
+    affiliation_ids: Set[int] = {
+        publication.affiliation_id for publication in publications
+    }
+    versions: Dict[int, int] = {
+        affiliation_id: affiliation_version(affiliation_id)
+        for affiliation_id in affiliation_ids
+    }
+    return {
+        publication.pk: card_key(publication, versions[publication.affiliation_id])
+        for publication in publications
+    }
+
+
+async def arender_cards(publications: Sequence[Publication]) -> List[SafeString]:
+    keys: Dict[int, str] = await sync_to_async(card_keys)(publications)
+    # BaseCache.aget_many() makes one aget() per key; get_many() is a single
+    # round trip on backends that support it.
+    cards: Dict[str, str] = await sync_to_async(cache.get_many)(list(keys.values()))
+
+    missing: List[int] = [pk for pk, key in keys.items() if key not in cards]
+    if missing:
+        rendered: Dict[str, str] = {
+            keys[publication.pk]: render_to_string(CARD_TEMPLATE, {"obj": publication})
+            async for publication in Publication.objects.with_related().filter(
+                pk__in=missing
+            )
+        }
+        await sync_to_async(cache.set_many)(rendered, CARD_CACHE_TIMEOUT)
+        cards.update(rendered)
+
+    return [mark_safe(cards[keys[pk]]) for pk in keys if keys[pk] in cards]
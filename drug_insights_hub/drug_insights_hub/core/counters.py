@@ -0,0 +1,105 @@
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import Dict, Iterable, Iterator, Optional, Type
+
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, models, transaction
+from django.db.models import F
+
+from drug_insights_hub.core.models import StatsCounter
+
+COUNTED_MODELS: Dict[str, str] = {
+    "users": get_user_model()._meta.label_lower,
+    "publications": "research.publication",
+    "clinical_trials": "research.clinicaltrial",
+    "drugs": "research.drug",
+}
+
+
+# Set inside deferred(): increments are collected instead of written.
+pending_deltas: ContextVar[Optional[Counter]] = ContextVar(
+    "pending_deltas", default=None
+)
+
+
+def counted_models() -> Iterable[Type[models.Model]]:
+    return [apps.get_model(label) for label in COUNTED_MODELS.values()]
+
+
+def is_counted(model: Type[models.Model]) -> bool:
+    return model._meta.label_lower in COUNTED_MODELS.values()
+
+
+def increment(model: Type[models.Model], delta: int = 1) -> None:
+    if not delta:
+        return
+
+    name: str = model._meta.label_lower
+    pending: Optional[Counter] = pending_deltas.get()
+    if pending is not None:
+        pending[name] += delta
+        return
+
+    updated: int = StatsCounter.objects.filter(name=name).update(
+        count=F("count") + delta
+    )
+    if updated:
+        return
+
+    try:
+        with transaction.atomic():
+            StatsCounter.objects.create(name=name, count=max(delta, 0))
+    except IntegrityError:
+        StatsCounter.objects.filter(name=name).update(count=F("count") + delta)
+
+
+@contextmanager
+def deferred() -> Iterator[Counter]:
+    # Each counter is one row, so an increment inside a long transaction
+    # locks out every other writer of that model until the commit. Bulk
+    # writers collect their deltas here and apply() them afterwards.
+    deltas: Counter = Counter()
+    token: Token = pending_deltas.set(deltas)
+    try:
+        yield deltas
+    finally:
+        pending_deltas.reset(token)
+
+
+def apply(deltas: Dict[str, int]) -> None:
+    with transaction.atomic():
+        for name, delta in sorted(deltas.items()):
+            increment(apps.get_model(name), delta)
+
+
+def rebuild() -> Dict[str, int]:
+    counts: Dict[str, int] = {}
+    with transaction.atomic():
+        for model in counted_models():
+            name: str = model._meta.label_lower
+            counts[name] = model._default_manager.count()
+            StatsCounter.objects.update_or_create(
+                name=name, defaults={"count": counts[name]}
+            )
+    return counts
+
+
+def read_counters() -> Dict[str, int]:
+    stored: Dict[str, int] = dict(
+        StatsCounter.objects.filter(name__in=COUNTED_MODELS.values()).values_list(
+            "name", "count"
+        )
+    )
+    return {key: stored.get(label, 0) for key, label in COUNTED_MODELS.items()}
+
+
+async def aread_counters() -> Dict[str, int]:
+    stored: Dict[str, int] = {
+        name: count
+        async for name, count in StatsCounter.objects.filter(
+            name__in=COUNTED_MODELS.values()
+        ).values_list("name", "count")
+    }
+    return {key: stored.get(label, 0) for key, label in COUNTED_MODELS.items()}
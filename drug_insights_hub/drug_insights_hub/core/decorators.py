@@ -0,0 +1,91 @@
+import datetime
+from functools import wraps
+from typing import Callable, Optional, Tuple
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.contrib.auth.decorators import login_required as sync_login_required
+from django.contrib.auth.views import redirect_to_login
+from django.http import HttpRequest, HttpResponse
+from django.utils.cache import get_conditional_response, quote_etag
+from django.utils.http import http_date
+
+# (ETag, Last-Modified or None), or None when the resource does not exist.
+Validators = Optional[Tuple[str, Optional[datetime.datetime]]]
+
+
+def login_required(view: Callable) -> Callable:
+    # Django 5.0's login_required wraps async views in a sync function, which
+    # would push them back onto a thread.
+    if not iscoroutinefunction(view):
+        return sync_login_required(view)
+
+    @wraps(view)
+    async def wrapper(request: HttpRequest, *args, **kwargs) -> HttpResponse:
+        # AffiliationMiddleware has already resolved request.user.
+        if request.user.is_authenticated:
+            return await view(request, *args, **kwargs)
+        return redirect_to_login(request.get_full_path())
+
+    return wrapper
+
+
+def conditional(validators_func: Callable[..., Validators]) -> Callable:
+    # Like django.views.decorators.http.condition, but computes both validators
+    # with one call and runs it off the event loop for async views.
+    def decorator(view: Callable) -> Callable:
+        def check(
+            request: HttpRequest, validators: Validators
+        ) -> Tuple[Optional[HttpResponse], Optional[str], Optional[int]]:
+            if validators is None:
+                return None, None, None
+            etag, last_modified = validators
+            etag = quote_etag(etag)
+            timestamp: Optional[int] = (
+                int(last_modified.timestamp()) if last_modified else None
+            )
+            response: Optional[HttpResponse] = get_conditional_response(
+                request, etag=etag, last_modified=timestamp
+            )
+            return response, etag, timestamp
+
+        def add_headers(
+            request: HttpRequest,
+            response: HttpResponse,
+            etag: Optional[str],
+            timestamp: Optional[int],
+        ) -> HttpResponse:
+            if request.method in ("GET", "HEAD") and response.status_code in (200, 304):
+                if etag:
+                    response.headers.setdefault("ETag", etag)
+                if timestamp and not response.has_header("Last-Modified"):
+                    response.headers["Last-Modified"] = http_date(timestamp)
+            return response
+
+        if iscoroutinefunction(view):
+
+            @wraps(view)
+            async def async_wrapper(
+                request: HttpRequest, *args, **kwargs
+            ) -> HttpResponse:
+                validators: Validators = await sync_to_async(validators_func)(
+                    request, *args, **kwargs
+                )
+                response, etag, timestamp = check(request, validators)
+                if response is None:
+                    response = await view(request, *args, **kwargs)
+                return add_headers(request, response, etag, timestamp)
+
+            return async_wrapper
+
+        @wraps(view)
+        def wrapper(request: HttpRequest, *args, **kwargs) -> HttpResponse:
+            response, etag, timestamp = check(
+                request, validators_func(request, *args, **kwargs)
+            )
+            if response is None:
+                response = view(request, *args, **kwargs)
+            return add_headers(request, response, etag, timestamp)
+
+        return wrapper
+
+    return decorator
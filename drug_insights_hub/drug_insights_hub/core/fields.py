@@ -0,0 +1,54 @@
+from typing import Any, Iterator, List, Optional, Tuple
+
+from django import forms
+from django.core.cache import cache
+from django.db.models import QuerySet
+from django.forms.models import ModelChoiceIterator
+
+from drug_insights_hub.core.cache import versioned_key
+
+CHOICES_CACHE_TIMEOUT: int = 60 * 60
+
+
+class CachedChoiceIterator(ModelChoiceIterator):
+    def __iter__(self) -> Iterator[Tuple[Any, str]]:
+        if self.field.empty_label is not None:
+            yield ("", self.field.empty_label)
+        yield from self.field.cached_choices()
+
+    def __len__(self) -> int:
+        return len(self.field.cached_choices()) + (
+            self.field.empty_label is not None
+        )
+
+    def __bool__(self) -> bool:
+        return self.field.empty_label is not None or bool(self.field.cached_choices())
+
+
+class CachedModelChoiceField(forms.ModelChoiceField):
+    # Choices are cached per ``cache_namespace:cache_scope``; callers bump that
+    # namespace's version when the underlying rows change.
+    iterator = CachedChoiceIterator
+
+    def __init__(self, queryset: QuerySet, cache_namespace: str, **kwargs) -> None:
+        self.cache_namespace: str = cache_namespace
+        self.cache_scope: str = "all"
+        self._choices_cache: Optional[List[Tuple[Any, str]]] = None
+        super().__init__(queryset, **kwargs)
+
+    def limit_choices(self, queryset: QuerySet, scope: object) -> None:
+        self.cache_scope = str(scope)
+        self._choices_cache = None
+        self.queryset = queryset
+
+    def cached_choices(self) -> List[Tuple[Any, str]]:
+        if self._choices_cache is None:
+            key: str = versioned_key(f"{self.cache_namespace}:{self.cache_scope}")
+            choices: Optional[List[Tuple[Any, str]]] = cache.get(key)
+            if choices is None:
+                choices = [
+                    (obj.pk, self.label_from_instance(obj)) for obj in self.queryset
+                ]
+                cache.set(key, choices, CHOICES_CACHE_TIMEOUT)
+            self._choices_cache = choices
+        return self._choices_cache
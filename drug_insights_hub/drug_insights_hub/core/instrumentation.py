@@ -0,0 +1,151 @@
+import time
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Type
+
+from django.core.cache.backends.base import BaseCache
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.template.backends import django as django_backend
+from django.utils.module_loading import import_string
+
+# Caps the SQL kept per request for the slow request log.
+MAX_RECORDED_QUERIES: int = 1000
+
+MISSING: object = object()
+
+
+class RequestMetrics:
+    def __init__(self) -> None:
+        self.started: float = time.perf_counter()
+        self.queries: int = 0
+        self.db_time: float = 0.0
+        self.template_time: float = 0.0
+        self.cache_hits: int = 0
+        self.cache_misses: int = 0
+        # (sql, milliseconds)
+        self.sql: List[Tuple[str, float]] = []
+
+    def total_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000
+
+    def server_timing(self, total_ms: float) -> str:
+        return ", ".join(
+            (
+                f"total;dur={total_ms:.1f}",
+                f'db;dur={self.db_time * 1000:.1f};desc="{self.queries} queries"',
+                f"template;dur={self.template_time * 1000:.1f}",
+                f'cache;desc="{self.cache_hits} hits / {self.cache_misses} misses"',
+            )
+        )
+
+
+# Set by RequestInstrumentationMiddleware for the duration of a request. The
+# metrics object is shared, so changes made in sync_to_async threads count.
+current_metrics: ContextVar[Optional[RequestMetrics]] = ContextVar(
+    "current_metrics", default=None
+)
+
+
+def record_query(
+    execute: Callable, sql: str, params: Any, many: bool, context: Dict[str, Any]
+) -> Any:
+    metrics: Optional[RequestMetrics] = current_metrics.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+
+    started: float = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        elapsed: float = time.perf_counter() - started
+        metrics.queries += 1
+        metrics.db_time += elapsed
+        if len(metrics.sql) < MAX_RECORDED_QUERIES:
+            metrics.sql.append((sql, round(elapsed * 1000, 2)))
+
+
+def install_query_recorder(connection: BaseDatabaseWrapper) -> None:
+    # Added to every connection rather than with connection.execute_wrapper()
+    # around the view: async views run their queries on other threads, which
+    # have connections of their own.
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+class TimedTemplate:
+    def __init__(self, template: django_backend.Template) -> None:
+        self.wrapped: django_backend.Template = template
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.wrapped, name)
+
+    def render(self, context: Optional[dict] = None, request: Any = None) -> str:
+        metrics: Optional[RequestMetrics] = current_metrics.get()
+        if metrics is None:
+            return self.wrapped.render(context, request)
+
+        started: float = time.perf_counter()
+        try:
+            return self.wrapped.render(context, request)
+        finally:
+            metrics.template_time += time.perf_counter() - started
+
+
+class DjangoTemplates(django_backend.DjangoTemplates):
+    # The stock backend, with render times added to the request metrics.
+
+    def from_string(self, template_code: str) -> TimedTemplate:
+        return TimedTemplate(super().from_string(template_code))
+
+    def get_template(self, template_name: str) -> TimedTemplate:
+        return TimedTemplate(super().get_template(template_name))
+
+
+class CountedCache:
+    # Wraps the backend named in OPTIONS["BACKEND"] and adds the hits and
+    # misses of get() and get_many() to the request metrics. Django has no
+    # cache signals, so each alias in CACHES is configured with this class.
+
+    def __init__(self, location: str, params: Dict[str, Any]) -> None:
+        options: Dict[str, Any] = dict(params.get("OPTIONS", {}))
+        backend: Type[BaseCache] = import_string(options.pop("BACKEND"))
+        self.wrapped: BaseCache = backend(location, {**params, "OPTIONS": options})
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.wrapped, name)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.wrapped
+
+    def get(self, key: str, default: Any = None, version: Optional[int] = None) -> Any:
+        value: Any = self.wrapped.get(key, MISSING, version=version)
+        self._count(hits=int(value is not MISSING), lookups=1)
+        return default if value is MISSING else value
+
+    def get_many(
+        self, keys: Iterable[str], version: Optional[int] = None
+    ) -> Dict[str, Any]:
+        keys = list(keys)
+        found: Dict[str, Any] = self.wrapped.get_many(keys, version=version)
+        self._count(hits=len(found), lookups=len(keys))
+        return found
+
+    async def aget(
+        self, key: str, default: Any = None, version: Optional[int] = None
+    ) -> Any:
+        value: Any = await self.wrapped.aget(key, MISSING, version=version)
+        self._count(hits=int(value is not MISSING), lookups=1)
+        return default if value is MISSING else value
+
+    async def aget_many(
+        self, keys: Iterable[str], version: Optional[int] = None
+    ) -> Dict[str, Any]:
+        keys = list(keys)
+        found: Dict[str, Any] = await self.wrapped.aget_many(keys, version=version)
+        self._count(hits=len(found), lookups=len(keys))
+        return found
+
+    def _count(self, hits: int, lookups: int) -> None:
+        metrics: Optional[RequestMetrics] = current_metrics.get()
+        if metrics is not None:
+            metrics.cache_hits += hits
+            metrics.cache_misses += lookups - hits
@@ -0,0 +1,36 @@
+from functools import reduce
+from operator import or_
+from typing import Dict, List, Sequence
+
+from django.db.models import Q, QuerySet
+from django.http import HttpRequest, JsonResponse
+
+from drug_insights_hub.core.pagination import KeysetPage, KeysetPaginator
+
+LOOKUP_PAGE_SIZE: int = 20
+# Prefix matches, so each search field can be served by an index on
+# UPPER(column) instead of a scan of the whole table.
+LOOKUP_MATCH: str = "istartswith"
+
+
+def lookup_response(
+    request: HttpRequest,
+    queryset: QuerySet,
+    search_fields: Sequence[str],
+    ordering: Sequence[str],
+) -> JsonResponse:
+    query: str = request.GET.get("q", "").strip()
+    if query:
+        conditions: Q = reduce(
+            or_,
+            (Q(**{f"{field}__{LOOKUP_MATCH}": query}) for field in search_fields),
+        )
+        queryset = queryset.filter(conditions)
+
+    page: KeysetPage = KeysetPaginator(
+        queryset, per_page=LOOKUP_PAGE_SIZE, ordering=ordering
+    ).get_page(after=request.GET.get("after"))
+    results: List[Dict[str, str | int]] = [
+        {"id": obj.pk, "text": str(obj)} for obj in page
+    ]
+    return JsonResponse({"results": results, "next": page.next_cursor})
@@ -0,0 +1,136 @@
+import statistics
+import time
+from typing import Dict, List
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import AnonymousUser, User
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import connection, transaction
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+
+from drug_insights_hub.accounts.models import Affiliation
+from drug_insights_hub.core.views import index
+from drug_insights_hub.research.models import ClinicalTrial, Drug, Publication
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help: str = (
+        "Compare homepage render times with cold and warm publication card "
+        "caches. Synthetic publications are inserted inside a transaction that "
+        "is rolled back."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--publications", type=int, default=1000)
+        parser.add_argument("--authors", type=int, default=5)
+        parser.add_argument("--trials", type=int, default=3)
+        parser.add_argument("--requests", type=int, default=200)
+
+    def handle(self, *args, **options) -> None:
+        try:
+            with transaction.atomic():
+                self._seed(
+                    options["publications"], options["authors"], options["trials"]
+                )
+                self._run(options["requests"])
+                raise Rollback
+        except Rollback:
+            pass
+        cache.clear()
+
+    def _seed(self, amount: int, authors: int, trials: int) -> None:
+        affiliation: Affiliation = Affiliation.objects.create(
+            name="Homepage benchmark",
+            location="-",
+            description="-",
+            website="https://example.com",
+        )
+        drug: Drug = Drug.objects.create(
+            proprietary_name="Homepage benchmark drug",
+            international_non_proprietary_name="-",
+            affiliated_institution=affiliation,
+            description="-",
+        )
+        users: List[User] = User.objects.bulk_create(
+            User(
+                username=f"homepage_benchmark_{number}",
+                first_name=f"First{number}",
+                last_name=f"Last{number}",
+            )
+            for number in range(authors)
+        )
+        linked_trials: List[ClinicalTrial] = ClinicalTrial.objects.bulk_create(
+            ClinicalTrial(
+                title=f"Homepage benchmark trial {number}",
+                drug=drug,
+                phase="Phase I",
+                affiliation=affiliation,
+                start_date="2024-01-01",
+                end_date="2024-12-31",
+                description="-",
+            )
+            for number in range(trials)
+        )
+        publications: List[Publication] = Publication.objects.bulk_create(
+            (
+                Publication(
+                    title=f"Homepage benchmark publication {number}",
+                    affiliation=affiliation,
+                    journal="-",
+                )
+                for number in range(amount)
+            ),
+            batch_size=5000,
+        )
+        Publication.authors.through.objects.bulk_create(
+            (
+                Publication.authors.through(publication=publication, user=user)
+                for publication in publications
+                for user in users
+            ),
+            batch_size=5000,
+        )
+        Publication.trials.through.objects.bulk_create(
+            (
+                Publication.trials.through(publication=publication, clinicaltrial=trial)
+                for publication in publications
+                for trial in linked_trials
+            ),
+            batch_size=5000,
+        )
+
+    def _run(self, amount: int) -> None:
+        factory: RequestFactory = RequestFactory()
+        render = async_to_sync(index)
+
+        def request_page() -> int:
+            request = factory.get("/")
+            request.user = AnonymousUser()
+            request.affiliation = None
+            with CaptureQueriesContext(connection) as queries:
+                render(request)
+            return len(queries)
+
+        request_page()
+        for state in ("cold", "warm"):
+            timings: List[float] = []
+            query_counts: Dict[int, int] = {}
+            for _ in range(amount):
+                if state == "cold":
+                    cache.clear()
+                started: float = time.perf_counter()
+                queries: int = request_page()
+                timings.append((time.perf_counter() - started) * 1000)
+                query_counts[queries] = query_counts.get(queries, 0) + 1
+            timings.sort()
+            self.stdout.write(
+                f"{state:<5} median {statistics.median(timings):7.2f} ms  "
+                f"p95 {timings[int(len(timings) * 0.95) - 1]:7.2f} ms  "
+                f"queries {max(query_counts, key=query_counts.get)}"
+            )
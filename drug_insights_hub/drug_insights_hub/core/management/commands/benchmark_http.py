@@ -0,0 +1,200 @@
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+SERVERS: Tuple[str, ...] = ("wsgi", "asgi")
+SERVER_START_TIMEOUT: float = 30.0
+WARMUP_REQUESTS: int = 50
+
+
+def server_command(
+    server: str, host: str, port: int, workers: int, threads: int
+) -> List[str]:
+    if server == "wsgi":
+        return [
+            sys.executable,
+            "-m",
+            "gunicorn",
+            "drug_insights_hub.wsgi:application",
+            "--bind",
+            f"{host}:{port}",
+            "--workers",
+            str(workers),
+            "--worker-class",
+            "gthread",
+            "--threads",
+            str(threads),
+            "--log-level",
+            "warning",
+        ]
+    return [
+        sys.executable,
+        "-m",
+        "uvicorn",
+        "drug_insights_hub.asgi:application",
+        "--host",
+        host,
+        "--port",
+        str(port),
+        "--workers",
+        str(workers),
+        "--log-level",
+        "warning",
+    ]
+
+
+def wait_for_port(host: str, port: int, process: subprocess.Popen) -> None:
+    deadline: float = time.monotonic() + SERVER_START_TIMEOUT
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise CommandError(f"Server exited with status {process.returncode}.")
+        try:
+            with socket.create_connection((host, port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise CommandError(f"Server did not start on {host}:{port}.")
+
+
+async def fetch(host: str, port: int, path: str, cookie: Optional[str]) -> int:
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        headers: str = f"GET {path} HTTP/1.1\r\nHost: {host}\r\nConnection: close\r\n"
+        if cookie:
+            headers += f"Cookie: {cookie}\r\n"
+        writer.write(f"{headers}\r\n".encode("latin-1"))
+        await writer.drain()
+        status_line: bytes = await reader.readline()
+        await reader.read()
+        return int(status_line.split()[1])
+    finally:
+        writer.close()
+
+
+async def run_load(
+    host: str,
+    port: int,
+    paths: List[str],
+    total: int,
+    concurrency: int,
+    cookie: Optional[str],
+) -> Tuple[List[float], int, float]:
+    latencies: List[float] = []
+    errors: int = 0
+    issued: int = 0
+
+    async def client() -> None:
+        nonlocal errors, issued
+        while issued < total:
+            path: str = paths[issued % len(paths)]
+            issued += 1
+            started: float = time.perf_counter()
+            try:
+                status: int = await fetch(host, port, path, cookie)
+            except (OSError, IndexError, ValueError):
+                errors += 1
+                continue
+            if status >= 400:
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - started)
+
+    started: float = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return latencies, errors, time.perf_counter() - started
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered: List[float] = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class Command(BaseCommand):
+    help: str = (
+        "Start the project under gunicorn (WSGI) and uvicorn (ASGI) and compare "
+        "throughput and latency at a fixed number of concurrent clients."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "paths", nargs="*", default=["/"], help="URL paths to request in turn."
+        )
+        parser.add_argument("--server", choices=SERVERS, action="append")
+        parser.add_argument("--concurrency", type=int, default=200)
+        parser.add_argument("--requests", type=int, default=5000)
+        parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+        parser.add_argument(
+            "--threads",
+            type=int,
+            default=8,
+            help="Threads per gunicorn worker.",
+        )
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=8765)
+        parser.add_argument(
+            "--session", help="Session cookie value for views that need a login."
+        )
+
+    def handle(self, *args, **options) -> None:
+        cookie: Optional[str] = (
+            f"{settings.SESSION_COOKIE_NAME}={options['session']}"
+            if options["session"]
+            else None
+        )
+        results: Dict[str, Tuple[float, float, float, int]] = {}
+        for server in options["server"] or SERVERS:
+            results[server] = self.benchmark(server, cookie, options)
+
+        self.stdout.write(
+            f"{'server':<6} {'req/s':>10} {'p50 ms':>10} {'p99 ms':>10} {'errors':>8}"
+        )
+        for server, (throughput, p50, p99, errors) in results.items():
+            self.stdout.write(
+                f"{server:<6} {throughput:>10.1f} {p50:>10.1f} {p99:>10.1f} "
+                f"{errors:>8}"
+            )
+
+    def benchmark(
+        self, server: str, cookie: Optional[str], options: Dict
+    ) -> Tuple[float, float, float, int]:
+        host: str = options["host"]
+        port: int = options["port"]
+        process: subprocess.Popen = subprocess.Popen(
+            server_command(server, host, port, options["workers"], options["threads"]),
+            cwd=settings.BASE_DIR,
+            env=os.environ.copy(),
+        )
+        try:
+            wait_for_port(host, port, process)
+            asyncio.run(
+                run_load(host, port, options["paths"], WARMUP_REQUESTS, 10, cookie)
+            )
+            latencies, errors, elapsed = asyncio.run(
+                run_load(
+                    host,
+                    port,
+                    options["paths"],
+                    options["requests"],
+                    options["concurrency"],
+                    cookie,
+                )
+            )
+        finally:
+            process.terminate()
+            process.wait()
+
+        return (
+            len(latencies) / elapsed,
+            percentile(latencies, 0.50) * 1000,
+            percentile(latencies, 0.99) * 1000,
+            errors,
+        )
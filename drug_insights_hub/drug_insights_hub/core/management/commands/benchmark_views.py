@@ -0,0 +1,121 @@
+import json
+from pathlib import Path
+from typing import List
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import transaction
+from django.test.utils import override_settings
+
+from drug_insights_hub.core.benchmarks import (
+    DATASETS,
+    SEED_PREFIX,
+    VIEW_CASES,
+    BenchmarkResults,
+    find_regressions,
+    named_urls,
+    run_benchmarks,
+)
+from drug_insights_hub.research import seeding
+
+BASELINE_DIR: Path = settings.BASE_DIR / "benchmarks"
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help: str = (
+        "Request every named URL over a seeded dataset and compare query "
+        "counts, and with --check-timings also wall time and peak memory, with "
+        "a stored baseline. The dataset is inserted inside a transaction that "
+        "is rolled back."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--dataset", choices=sorted(DATASETS), default="1k")
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--seed", type=int, default=1)
+        parser.add_argument("--threshold", type=float, default=0.25)
+        parser.add_argument("--check-timings", action="store_true")
+        parser.add_argument("--baseline", type=Path)
+        parser.add_argument("--update-baseline", action="store_true")
+        parser.add_argument("--view", action="append", dest="views")
+
+    def handle(self, *args, **options) -> None:
+        missing: List[str] = sorted(set(named_urls()) - set(VIEW_CASES))
+        if missing:
+            raise CommandError(f"No benchmark case for: {', '.join(missing)}")
+        names: List[str] = options["views"] or sorted(VIEW_CASES)
+        baseline_path: Path = options["baseline"] or (
+            BASELINE_DIR / f"views_{options['dataset']}.json"
+        )
+
+        self._clear_caches()
+        try:
+            # The test client sends requests for "testserver".
+            with transaction.atomic(), override_settings(
+                ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]
+            ):
+                seeded: seeding.SeededData = seeding.seed(
+                    DATASETS[options["dataset"]],
+                    seed=options["seed"],
+                    prefix=SEED_PREFIX,
+                )
+                results: BenchmarkResults = run_benchmarks(
+                    seeded, names, repeat=options["repeat"]
+                )
+                raise Rollback
+        except Rollback:
+            pass
+        finally:
+            # Cached pages and objects refer to the rolled back rows.
+            self._clear_caches()
+
+        for name, measured in results.items():
+            self.stdout.write(
+                f"{name:<32} {measured['status']:>3}  "
+                f"{measured['wall_ms']:8.2f} ms  {measured['queries']:3} queries  "
+                f"{measured['memory_kib']:9.1f} KiB"
+            )
+
+        errors: List[str] = [
+            name for name, measured in results.items() if measured["status"] >= 500
+        ]
+        if errors:
+            raise CommandError(f"Server errors in: {', '.join(errors)}")
+
+        if options["update_baseline"]:
+            baseline_path.parent.mkdir(parents=True, exist_ok=True)
+            stored: BenchmarkResults = self._read(baseline_path)
+            stored.update(results)
+            baseline_path.write_text(json.dumps(stored, indent=2, sort_keys=True))
+            self.stdout.write(
+                self.style.SUCCESS(f"Baseline written to {baseline_path}")
+            )
+            return
+
+        if not baseline_path.exists():
+            raise CommandError(
+                f"No baseline at {baseline_path}, run with --update-baseline first."
+            )
+        regressions: List[str] = find_regressions(
+            results,
+            self._read(baseline_path),
+            options["threshold"],
+            check_timings=options["check_timings"],
+        )
+        if regressions:
+            raise CommandError("Regressions:\n" + "\n".join(regressions))
+        self.stdout.write(self.style.SUCCESS("No regressions."))
+
+    def _read(self, path: Path) -> BenchmarkResults:
+        if not path.exists():
+            return {}
+        return json.loads(path.read_text())
+
+    def _clear_caches(self) -> None:
+        for cache in caches.all():
+            cache.clear()
@@ -0,0 +1,15 @@
+from typing import Dict
+
+from django.core.management.base import BaseCommand
+
+from drug_insights_hub.core import counters
+
+
+class Command(BaseCommand):
+    help: str = "Recount the homepage statistics counters from the source tables."
+
+    def handle(self, *args, **options) -> None:
+        counts: Dict[str, int] = counters.rebuild()
+        for name, count in counts.items():
+            self.stdout.write(f"{name}: {count}")
+        self.stdout.write(self.style.SUCCESS("Counters rebuilt."))
@@ -0,0 +1,131 @@
+import asyncio
+import cProfile
+import json
+import logging
+import time
+from contextvars import Token
+from typing import Any, Awaitable, Callable, Dict
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse
+
+from drug_insights_hub.core import profiling
+from drug_insights_hub.core.instrumentation import RequestMetrics, current_metrics
+from drug_insights_hub.core.models import ProfileReport
+
+request_logger: logging.Logger = logging.getLogger("drug_insights_hub.requests")
+slow_request_logger: logging.Logger = logging.getLogger(
+    "drug_insights_hub.requests.slow"
+)
+
+
+class RequestInstrumentationMiddleware:
+    # Goes first in MIDDLEWARE so the total covers the other middleware too.
+    sync_capable: bool = True
+    async_capable: bool = True
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        self.get_response: Callable[[HttpRequest], HttpResponse] = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> HttpResponse | Awaitable:
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        metrics: RequestMetrics = RequestMetrics()
+        token: Token = current_metrics.set(metrics)
+        try:
+            response: HttpResponse = self.get_response(request)
+        finally:
+            current_metrics.reset(token)
+        self.report(request, response, metrics)
+        return response
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        metrics: RequestMetrics = RequestMetrics()
+        token: Token = current_metrics.set(metrics)
+        try:
+            response: HttpResponse = await self.get_response(request)
+        finally:
+            current_metrics.reset(token)
+        self.report(request, response, metrics)
+        return response
+
+    def report(
+        self, request: HttpRequest, response: HttpResponse, metrics: RequestMetrics
+    ) -> None:
+        total_ms: float = metrics.total_ms()
+        response["Server-Timing"] = metrics.server_timing(total_ms)
+
+        resolver_match: Any = getattr(request, "resolver_match", None)
+        fields: Dict[str, Any] = {
+            "view": resolver_match.view_name if resolver_match else None,
+            "method": request.method,
+            "path": request.path,
+            "status": response.status_code,
+            "total_ms": round(total_ms, 2),
+            "db_ms": round(metrics.db_time * 1000, 2),
+            "queries": metrics.queries,
+            "template_ms": round(metrics.template_time * 1000, 2),
+            "cache_hits": metrics.cache_hits,
+            "cache_misses": metrics.cache_misses,
+        }
+        request_logger.info(json.dumps(fields))
+        if total_ms >= settings.SLOW_REQUEST_THRESHOLD_MS:
+            fields["sql"] = [{"sql": sql, "ms": ms} for sql, ms in metrics.sql]
+            slow_request_logger.warning(json.dumps(fields))
+
+
+class ProfilingMiddleware:
+    # Runs the rest of the request under cProfile when a staff member sends a
+    # token from the profile report admin. Goes after AffiliationMiddleware,
+    # which resolves request.user for async requests. Async requests move to
+    # a thread with an event loop of their own, so other requests on the
+    # server's loop stay out of the profile. Only that thread is profiled:
+    # queries and sync views handed to sync_to_async threads show up as time
+    # spent waiting on them.
+    sync_capable: bool = True
+    async_capable: bool = True
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        self.get_response: Callable[[HttpRequest], HttpResponse] = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> HttpResponse | Awaitable:
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not profiling.profiling_requested(request):
+            return self.get_response(request)
+
+        profile: cProfile.Profile = cProfile.Profile()
+        started: float = time.perf_counter()
+        response: HttpResponse = profile.runcall(
+            profiling.profiled_response, self.get_response, request
+        )
+        duration_ms: float = (time.perf_counter() - started) * 1000
+        report: ProfileReport = profiling.save_report(
+            request, response, profile, duration_ms, current_metrics.get()
+        )
+        response["X-Profile-Report"] = str(report.pk)
+        return response
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        if not profiling.profiling_requested(request):
+            return await self.get_response(request)
+
+        profile: cProfile.Profile = cProfile.Profile()
+        started: float = time.perf_counter()
+        response: HttpResponse = await asyncio.to_thread(
+            profile.runcall,
+            profiling.profiled_async_response,
+            self.get_response,
+            request,
+        )
+        duration_ms: float = (time.perf_counter() - started) * 1000
+        report: ProfileReport = await sync_to_async(profiling.save_report)(
+            request, response, profile, duration_ms, current_metrics.get()
+        )
+        response["X-Profile-Report"] = str(report.pk)
+        return response
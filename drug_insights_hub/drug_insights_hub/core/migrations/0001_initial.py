@@ -0,0 +1,41 @@
+# Generated by Django 5.0.3 on 2026-10-18 10:36
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def populate_counters(apps, schema_editor):
+    StatsCounter = apps.get_model("core", "StatsCounter")
+    for label in (
+        settings.AUTH_USER_MODEL,
+        "research.Publication",
+        "research.ClinicalTrial",
+        "research.Drug",
+    ):
+        model = apps.get_model(label)
+        StatsCounter.objects.update_or_create(
+            name=model._meta.label_lower,
+            defaults={"count": model._default_manager.count()},
+        )
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('research', '0003_alter_publication_title'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StatsCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('count', models.BigIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(populate_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.3 on 2026-10-18 12:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_profile_report'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profilereport',
+            name='hostname',
+            field=models.CharField(blank=True, max_length=255),
+        ),
+    ]
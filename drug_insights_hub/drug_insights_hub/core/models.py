@@ -1,3 +1,45 @@
+from django.conf import settings
 from django.db import models
 
-# Create your models here.
\ No newline at end of file
+
+class StatsCounter(models.Model):
+    MAX_NAME_LENGTH: int = 100
+
+    name: models.CharField = models.CharField(max_length=MAX_NAME_LENGTH, unique=True)
+    count: models.BigIntegerField = models.BigIntegerField(default=0)
+
+    def __str__(self) -> str:
+        return f"{self.name}: {self.count}"
+
+
+class ProfileReport(models.Model):
+    MAX_VIEW_NAME_LENGTH: int = 200
+    MAX_METHOD_LENGTH: int = 10
+    MAX_PATH_LENGTH: int = 2000
+    MAX_HOSTNAME_LENGTH: int = 255
+
+    view_name: models.CharField = models.CharField(
+        max_length=MAX_VIEW_NAME_LENGTH, blank=True
+    )
+    method: models.CharField = models.CharField(max_length=MAX_METHOD_LENGTH)
+    path: models.CharField = models.CharField(max_length=MAX_PATH_LENGTH)
+    status_code: models.PositiveSmallIntegerField = models.PositiveSmallIntegerField()
+    duration_ms: models.FloatField = models.FloatField()
+    queries: models.PositiveIntegerField = models.PositiveIntegerField(default=0)
+    db_ms: models.FloatField = models.FloatField(default=0)
+    profiled_by: models.ForeignKey = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True
+    )
+    created_at: models.DateTimeField = models.DateTimeField(
+        auto_now_add=True, db_index=True
+    )
+    # The profile file is only on this host.
+    hostname: models.CharField = models.CharField(
+        max_length=MAX_HOSTNAME_LENGTH, blank=True
+    )
+
+    class Meta:
+        ordering: tuple = ("-created_at",)
+
+    def __str__(self) -> str:
+        return f"{self.view_name or self.path} ({self.duration_ms:.0f} ms)"
@@ -0,0 +1,301 @@
+from typing import Any, List, Optional, Sequence, Tuple
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core import signing
+from django.core.exceptions import ValidationError
+from django.core.paginator import Page, Paginator
+from django.db import connections, models
+from django.db.models import Q, QuerySet
+from django.http import HttpRequest
+from django.utils.functional import cached_property
+
+from drug_insights_hub.core import counters
+from drug_insights_hub.core.models import StatsCounter
+
+CURSOR_SALT: str = "drug_insights_hub.core.pagination"
+# Below this many rows the planner's estimate is not worth trading exact
+# counts for.
+ESTIMATE_FROM_ROWS: int = 10_000
+
+
+class CountedPaginator(Paginator):
+    def __init__(self, object_list: Any, per_page: int, count: int, **kwargs) -> None:
+        super().__init__(object_list, per_page, **kwargs)
+        self._known_count: int = count
+
+    @property
+    def count(self) -> int:
+        return self._known_count
+
+
+class EstimatedCountPaginator(Paginator):
+    # For admin change lists. Unfiltered lists take their count from the stats
+    # counters or, on PostgreSQL, the planner's row estimate, instead of a
+    # COUNT(*) that reads the whole table. Filtered lists are counted exactly.
+    @cached_property
+    def count(self) -> int:
+        estimate: Optional[int] = estimated_count(self.object_list)
+        return super().count if estimate is None else estimate
+
+
+def estimated_count(queryset: QuerySet) -> Optional[int]:
+    if queryset.query.where or queryset.query.is_sliced:
+        return None
+
+    model: type = queryset.model
+    if counters.is_counted(model):
+        return (
+            StatsCounter.objects.using(queryset.db)
+            .filter(name=model._meta.label_lower)
+            .values_list("count", flat=True)
+            .first()
+        )
+
+    connection: Any = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT reltuples FROM pg_class WHERE oid = %s::regclass",
+            [model._meta.db_table],
+        )
+        reltuples: float = cursor.fetchone()[0]
+    # -1 until the table is first analyzed.
+    return int(reltuples) if reltuples >= ESTIMATE_FROM_ROWS else None
+
+
+class KeysetPage:
+    is_keyset: bool = True
+
+    def __init__(
+        self,
+        object_list: List[models.Model],
+        next_cursor: Optional[str],
+        previous_cursor: Optional[str],
+    ) -> None:
+        self.object_list: List[models.Model] = object_list
+        self.next_cursor: Optional[str] = next_cursor
+        self.previous_cursor: Optional[str] = previous_cursor
+
+    @property
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self) -> bool:
+        return self.previous_cursor is not None
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self) -> int:
+        return len(self.object_list)
+
+    def __getitem__(self, index: int) -> models.Model:
+        return self.object_list[index]
+
+
+class KeysetPaginator:
+    def __init__(
+        self, queryset: QuerySet, per_page: int, ordering: Sequence[str]
+    ) -> None:
+        self.queryset: QuerySet = queryset
+        self.per_page: int = per_page
+        self.keys: Tuple[str, ...] = tuple(ordering) + ("pk",)
+        self.fields: Tuple[models.Field, ...] = tuple(
+            queryset.model._meta.pk
+            if key == "pk"
+            else queryset.model._meta.get_field(key)
+            for key in self.keys
+        )
+
+    def get_page(
+        self, after: Optional[str] = None, before: Optional[str] = None
+    ) -> KeysetPage:
+        if before:
+            values = self._decode(before)
+            if values is not None:
+                return self._page_before(values)
+
+        values = self._decode(after) if after else None
+        return self._page_after(values)
+
+    async def aget_page(
+        self, after: Optional[str] = None, before: Optional[str] = None
+    ) -> KeysetPage:
+        if before:
+            values = self._decode(before)
+            if values is not None:
+                rows: List[models.Model] = [
+                    row async for row in self._query_before(values)
+                ]
+                return self._build_page_before(rows)
+
+        values = self._decode(after) if after else None
+        rows = [row async for row in self._query_after(values)]
+        return self._build_page_after(rows, values)
+
+    def _query_after(self, values: Optional[List[Any]]) -> QuerySet:
+        queryset: QuerySet = self.queryset.order_by(*self.keys)
+        if values is not None:
+            queryset = queryset.filter(self._seek(values, forward=True))
+        return queryset[: self.per_page + 1]
+
+    def _query_before(self, values: List[Any]) -> QuerySet:
+        return self.queryset.order_by(*(f"-{key}" for key in self.keys)).filter(
+            self._seek(values, forward=False)
+        )[: self.per_page + 1]
+
+    def _page_after(self, values: Optional[List[Any]]) -> KeysetPage:
+        return self._build_page_after(list(self._query_after(values)), values)
+
+    def _page_before(self, values: List[Any]) -> KeysetPage:
+        return self._build_page_before(list(self._query_before(values)))
+
+    def _build_page_after(
+        self, rows: List[models.Model], values: Optional[List[Any]]
+    ) -> KeysetPage:
+        has_next: bool = len(rows) > self.per_page
+        rows = rows[: self.per_page]
+
+        return KeysetPage(
+            object_list=rows,
+            next_cursor=self._encode(rows[-1]) if has_next else None,
+            previous_cursor=(
+                self._encode(rows[0]) if values is not None and rows else None
+            ),
+        )
+
+    def _build_page_before(self, rows: List[models.Model]) -> KeysetPage:
+        has_previous: bool = len(rows) > self.per_page
+        rows = rows[: self.per_page]
+        rows.reverse()
+
+        return KeysetPage(
+            object_list=rows,
+            next_cursor=self._encode(rows[-1]) if rows else None,
+            previous_cursor=self._encode(rows[0]) if has_previous else None,
+        )
+
+    def _seek(self, values: List[Any], forward: bool) -> Q:
+        condition: Q = Q(pk__in=[])
+        for position in range(len(self.keys)):
+            term: Optional[Q] = self._compare(position, values[position], forward)
+            if term is None:
+                continue
+            for previous in range(position):
+                term &= self._equal(previous, values[previous])
+            condition |= term
+        bound: Optional[Q] = self._bound(values[0], forward)
+        return condition if bound is None else bound & condition
+
+    def _bound(self, value: Any, forward: bool) -> Optional[Q]:
+        # Implied by the seek, but without it the database can't tell where to
+        # start in the index and walks every row before the cursor.
+        key: str = self.keys[0]
+        nulls_after: bool = self._nulls_largest() == forward
+        if value is None:
+            return Q(**{f"{key}__isnull": True}) if nulls_after else None
+
+        term: Q = Q(**{f"{key}__{'gte' if forward else 'lte'}": value})
+        if self.fields[0].null and nulls_after:
+            term |= Q(**{f"{key}__isnull": True})
+        return term
+
+    def _nulls_largest(self) -> bool:
+        return connections[self.queryset.db].features.nulls_order_largest
+
+    def _compare(self, position: int, value: Any, forward: bool) -> Optional[Q]:
+        key: str = self.keys[position]
+        nullable: bool = self.fields[position].null
+        lookup: str = "gt" if forward else "lt"
+        # NULL keys lie beyond the cursor when walking forward on backends that
+        # sort NULL as the largest value, or walking backward on the others.
+        nulls_after: bool = self._nulls_largest() == forward
+
+        if value is None:
+            return Q(**{f"{key}__isnull": False}) if not nulls_after else None
+
+        term: Q = Q(**{f"{key}__{lookup}": value})
+        if nullable and nulls_after:
+            term |= Q(**{f"{key}__isnull": True})
+        return term
+
+    def _equal(self, position: int, value: Any) -> Q:
+        key: str = self.keys[position]
+        if value is None:
+            return Q(**{f"{key}__isnull": True})
+        return Q(**{key: value})
+
+    def _encode(self, obj: models.Model) -> str:
+        values: List[Any] = [
+            None if field.value_from_object(obj) is None else field.value_to_string(obj)
+            for field in self.fields
+        ]
+        return signing.dumps(values, salt=CURSOR_SALT, compress=True)
+
+    def _decode(self, cursor: str) -> Optional[List[Any]]:
+        try:
+            values: List[Any] = signing.loads(cursor, salt=CURSOR_SALT)
+            if len(values) != len(self.fields):
+                return None
+            return [
+                None if value is None else field.to_python(value)
+                for field, value in zip(self.fields, values)
+            ]
+        except (signing.BadSignature, ValidationError, TypeError, ValueError):
+            return None
+
+
+def paginate(
+    request: HttpRequest,
+    queryset: QuerySet,
+    per_page: int,
+    ordering: Sequence[str],
+    count: Optional[int] = None,
+) -> KeysetPage | Page:
+    if settings.PAGINATION_MODE == "offset":
+        paginator: Paginator
+        if count is None:
+            paginator = Paginator(queryset.order_by(*ordering, "pk"), per_page=per_page)
+        else:
+            paginator = CountedPaginator(
+                queryset.order_by(*ordering, "pk"), per_page=per_page, count=count
+            )
+        return paginator.get_page(request.GET.get("page"))
+
+    return KeysetPaginator(queryset, per_page=per_page, ordering=ordering).get_page(
+        after=request.GET.get("after"), before=request.GET.get("before")
+    )
+
+
+async def apaginate(
+    request: HttpRequest,
+    queryset: QuerySet,
+    per_page: int,
+    ordering: Sequence[str],
+    count: Optional[int] = None,
+) -> KeysetPage | Page:
+    if settings.PAGINATION_MODE == "offset":
+        return await sync_to_async(_evaluated_page)(
+            request, queryset, per_page, ordering, count
+        )
+
+    return await KeysetPaginator(
+        queryset, per_page=per_page, ordering=ordering
+    ).aget_page(after=request.GET.get("after"), before=request.GET.get("before"))
+
+
+def _evaluated_page(
+    request: HttpRequest,
+    queryset: QuerySet,
+    per_page: int,
+    ordering: Sequence[str],
+    count: Optional[int],
+) -> Page:
+    # Paginator has no async API; load the rows here so the template does not
+    # query from the event loop.
+    page: Page = paginate(request, queryset, per_page, ordering, count)
+    page.object_list = list(page.object_list)
+    return page
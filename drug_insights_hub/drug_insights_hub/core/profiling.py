@@ -0,0 +1,174 @@
+import asyncio
+import cProfile
+import io
+import pstats
+import socket
+from collections import defaultdict
+from pathlib import Path
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    DefaultDict,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+)
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core import signing
+from django.http import HttpRequest, HttpResponse
+
+from drug_insights_hub.core.instrumentation import RequestMetrics
+from drug_insights_hub.core.models import ProfileReport
+
+PROFILE_PARAMETER: str = "_profile"
+PROFILE_HEADER: str = "X-Profile"
+PROFILE_TOKEN_SALT: str = "drug_insights_hub.core.profiling"
+# Call paths with less time than this are left out of the collapsed stacks;
+# without a cutoff the number of paths explodes on Django's call graph.
+MIN_STACK_SECONDS: float = 1e-5
+
+# (file, line, function name) as used by pstats
+FunctionKey = Tuple[str, int, str]
+
+
+def make_token(user: User) -> str:
+    return signing.TimestampSigner(salt=PROFILE_TOKEN_SALT).sign(str(user.pk))
+
+
+def profiling_requested(request: HttpRequest) -> bool:
+    # The token only works for the staff member it was made for.
+    token: Optional[str] = request.GET.get(PROFILE_PARAMETER) or request.headers.get(
+        PROFILE_HEADER
+    )
+    if not token or not request.user.is_staff:
+        return False
+    try:
+        user_pk: str = signing.TimestampSigner(salt=PROFILE_TOKEN_SALT).unsign(
+            token, max_age=settings.PROFILE_TOKEN_MAX_AGE
+        )
+    except signing.BadSignature:
+        return False
+    return user_pk == str(request.user.pk)
+
+
+def report_path(report: ProfileReport) -> Path:
+    return Path(settings.PROFILE_REPORT_DIR) / f"{report.pk}.prof"
+
+
+def profiled_response(
+    get_response: Callable[[HttpRequest], HttpResponse], request: HttpRequest
+) -> HttpResponse:
+    # The root of every profile. get_response itself can't be: Django's
+    # handler recurses through the middleware chain, so it has callers.
+    return get_response(request)
+
+
+async def aprofiled_response(
+    get_response: Callable[[HttpRequest], Awaitable[HttpResponse]],
+    request: HttpRequest,
+) -> HttpResponse:
+    return await get_response(request)
+
+
+def profiled_async_response(
+    get_response: Callable[[HttpRequest], Awaitable[HttpResponse]],
+    request: HttpRequest,
+) -> HttpResponse:
+    # Runs an async request in an event loop of its own, in the calling
+    # thread. Profiling the server's loop would also record the steps of every
+    # other request it runs meanwhile.
+    return asyncio.run(aprofiled_response(get_response, request))
+
+
+def save_report(
+    request: HttpRequest,
+    response: HttpResponse,
+    profile: cProfile.Profile,
+    duration_ms: float,
+    metrics: Optional[RequestMetrics],
+) -> ProfileReport:
+    resolver_match: Any = getattr(request, "resolver_match", None)
+    report: ProfileReport = ProfileReport.objects.create(
+        view_name=resolver_match.view_name if resolver_match else "",
+        method=request.method,
+        path=request.get_full_path()[: ProfileReport.MAX_PATH_LENGTH],
+        status_code=response.status_code,
+        duration_ms=round(duration_ms, 2),
+        queries=metrics.queries if metrics is not None else 0,
+        db_ms=round(metrics.db_time * 1000, 2) if metrics is not None else 0,
+        profiled_by=request.user,
+        hostname=socket.gethostname()[: ProfileReport.MAX_HOSTNAME_LENGTH],
+    )
+    path: Path = report_path(report)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    profile.dump_stats(path)
+    prune()
+    return report
+
+
+def prune() -> None:
+    # Keeps the newest PROFILE_REPORT_LIMIT reports; files go with the rows.
+    stale: List[int] = list(
+        ProfileReport.objects.order_by("-created_at", "-pk").values_list(
+            "pk", flat=True
+        )[settings.PROFILE_REPORT_LIMIT :]
+    )
+    for report in ProfileReport.objects.filter(pk__in=stale):
+        report.delete()
+
+
+def read_stats(report: ProfileReport) -> Optional[pstats.Stats]:
+    # None when the file is gone: expired, or written on another host, since
+    # PROFILE_REPORT_DIR is local while the reports table is shared.
+    try:
+        return pstats.Stats(str(report_path(report)), stream=io.StringIO())
+    except FileNotFoundError:
+        return None
+
+
+def collapsed_stacks(stats: pstats.Stats) -> str:
+    # cProfile keeps callers, not whole stacks, so each function's time is
+    # split between its call paths in proportion to the time spent under each
+    # caller. cProfile merges recursive calls, so a function appears once per
+    # stack and the middleware chain comes out flat. The result is
+    # flamegraph.pl / speedscope input.
+    raw: Dict[FunctionKey, Tuple] = stats.stats
+    callees: DefaultDict[FunctionKey, Dict[FunctionKey, float]] = defaultdict(dict)
+    for function, (_, _, _, _, callers) in raw.items():
+        for caller, (_, _, _, cumulative) in callers.items():
+            callees[caller][function] = cumulative
+
+    totals: DefaultDict[str, float] = defaultdict(float)
+
+    def walk(function: FunctionKey, stack: Tuple[str, ...], share: float) -> None:
+        _, _, own_time, cumulative, _ = raw[function]
+        if cumulative <= 0 or share < MIN_STACK_SECONDS:
+            return
+        stack = (*stack, _frame_name(function))
+        ratio: float = min(share / cumulative, 1.0)
+        totals[";".join(stack)] += own_time * ratio
+        for callee, callee_time in callees[function].items():
+            if _frame_name(callee) not in stack and callee in raw:
+                walk(callee, stack, callee_time * ratio)
+
+    for function, (_, _, _, cumulative, callers) in raw.items():
+        if not callers:
+            walk(function, (), cumulative)
+
+    # Collapsed stacks carry integer sample counts; use microseconds.
+    return "".join(
+        f"{stack} {round(seconds * 1_000_000)}\n"
+        for stack, seconds in sorted(totals.items())
+        if round(seconds * 1_000_000) > 0
+    )
+
+
+def _frame_name(function: FunctionKey) -> str:
+    filename, line, name = function
+    if filename == "~":
+        return name
+    return f"{name} ({Path(filename).name}:{line})"
@@ -0,0 +1,51 @@
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal, receiver
+
+from drug_insights_hub.core import counters, instrumentation, profiling
+from drug_insights_hub.core.models import ProfileReport
+
+# Sent by code paths that insert rows with ``bulk_create`` and therefore skip
+# ``post_save``. Receivers get ``sender`` (the model) and ``instances``.
+bulk_created: Signal = Signal()
+
+
+def increment_stats_counter(sender, instance, created, raw=False, **kwargs) -> None:
+    if created and not raw:
+        counters.increment(sender, 1)
+
+
+def decrement_stats_counter(sender, instance, **kwargs) -> None:
+    counters.increment(sender, -1)
+
+
+def connect_stats_counters() -> None:
+    # Connected per model: a post_delete receiver without a sender would stop
+    # Django from fast-deleting rows of every other model.
+    for model in counters.counted_models():
+        post_save.connect(
+            increment_stats_counter,
+            sender=model,
+            dispatch_uid=f"increment_stats_counter:{model._meta.label_lower}",
+        )
+        post_delete.connect(
+            decrement_stats_counter,
+            sender=model,
+            dispatch_uid=f"decrement_stats_counter:{model._meta.label_lower}",
+        )
+
+
+@receiver(bulk_created)
+def increment_stats_counter_in_bulk(sender, instances, **kwargs) -> None:
+    if counters.is_counted(sender):
+        counters.increment(sender, len(instances))
+
+
+@receiver(connection_created)
+def record_request_queries(sender, connection, **kwargs) -> None:
+    instrumentation.install_query_recorder(connection)
+
+
+@receiver(post_delete, sender=ProfileReport)
+def delete_profile_file(sender, instance, **kwargs) -> None:
+    profiling.report_path(instance).unlink(missing_ok=True)
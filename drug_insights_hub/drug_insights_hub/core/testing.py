@@ -0,0 +1,63 @@
+import json
+from typing import Any, Callable, Dict, Iterator, List, Sequence
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+
+def query_plan(sql: str, params: Sequence[Any] = ()) -> List[str]:
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            # Test tables are tiny, so the planner would happily scan them; make
+            # it show the plan it would pick for production-sized tables.
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+            plan: Any = cursor.fetchone()[0]
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            return [
+                f"{node['Node Type']} {node.get('Relation Name', '')}".strip()
+                for node in _plan_nodes(plan[0]["Plan"])
+            ]
+
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+        return [row[-1] for row in cursor.fetchall()]
+
+
+def scans_and_sorts(plan: List[str]) -> bool:
+    if connection.vendor == "postgresql":
+        sorts: bool = any(step.startswith("Sort") for step in plan)
+        scans: bool = any(step.startswith("Seq Scan") for step in plan)
+    else:
+        sorts = any("USE TEMP B-TREE FOR" in step for step in plan)
+        scans = any(
+            step.startswith("SCAN ") and " USING " not in step for step in plan
+        )
+    return sorts and scans
+
+
+class QueryPlanTestMixin:
+    def assert_no_scan_and_sort(self: TestCase, request: Callable[[], Any]) -> Any:
+        with CaptureQueriesContext(connection) as context:
+            result: Any = request()
+
+        statements: List[str] = [
+            query["sql"]
+            for query in context.captured_queries
+            if query["sql"].lstrip().upper().startswith("SELECT")
+        ]
+        self.assertTrue(statements, "No SELECT statements were captured.")
+        for sql in statements:
+            plan: List[str] = query_plan(sql)
+            self.assertFalse(
+                scans_and_sorts(plan),
+                "Full scan plus sort in:\n%s\n%s" % (sql, "\n".join(plan)),
+            )
+        return result
+
+
+def _plan_nodes(node: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    yield node
+    for child in node.get("Plans", ()):
+        yield from _plan_nodes(child)
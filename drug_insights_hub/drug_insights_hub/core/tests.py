@@ -1,3 +1,487 @@
-from django.test import TestCase
+import json
+import logging
+import re
+import tempfile
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.management import call_command
+from django.db import connection
+from django.db.models.deletion import Collector
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from drug_insights_hub.accounts.models import Affiliation
+from drug_insights_hub.core.benchmarks import (
+    SEED_PREFIX,
+    VIEW_CASES,
+    find_regressions,
+    named_urls,
+    run_benchmarks,
+)
+from drug_insights_hub.core.counters import read_counters
+from drug_insights_hub.core import profiling
+from drug_insights_hub.core.instrumentation import (
+    CountedCache,
+    RequestMetrics,
+    current_metrics,
+)
+from drug_insights_hub.core.models import ProfileReport, StatsCounter
+from drug_insights_hub.core.pagination import KeysetPaginator, paginate
+from drug_insights_hub.core.testing import query_plan
+from drug_insights_hub.research import seeding
+from drug_insights_hub.research.models import ClinicalTrial, Drug, Publication
+
+USER_MODEL = get_user_model()
+
+
+class StatsCounterTest(TestCase):
+    def setUp(self):
+        self.affiliation = Affiliation.objects.create(
+            name="Test Affiliation",
+            location="Sofia",
+            description="Test description",
+            website="https://example.com",
+        )
+
+    def test_counters_follow_create_and_delete(self):
+        USER_MODEL.objects.create_user(username="test_user", password="test_password")
+        drug = Drug.objects.create(
+            proprietary_name="Testamol",
+            international_non_proprietary_name="testamol",
+            affiliated_institution=self.affiliation,
+            description="Test description",
+        )
+        counts = read_counters()
+        self.assertEqual(counts["users"], 1)
+        self.assertEqual(counts["drugs"], 1)
+
+        drug.delete()
+        self.assertEqual(read_counters()["drugs"], 0)
+
+    def test_uncounted_models_keep_fast_deletes(self):
+        self.assertTrue(
+            Collector(using="default").can_fast_delete(StatsCounter.objects.all())
+        )
+        self.assertFalse(Collector(using="default").can_fast_delete(Drug.objects.all()))
+
+    def test_rebuild_counters_command(self):
+        Drug.objects.create(
+            proprietary_name="Testamol",
+            international_non_proprietary_name="testamol",
+            affiliated_institution=self.affiliation,
+            description="Test description",
+        )
+        StatsCounter.objects.all().delete()
+
+        call_command("rebuild_counters", stdout=StringIO())
+        self.assertEqual(read_counters()["drugs"], 1)
+
+    def test_index_runs_no_count_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("index"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(
+            [query for query in queries if "COUNT(" in query["sql"].upper()]
+        )
+
+
+class KeysetPaginationTest(TestCase):
+    def setUp(self):
+        self.affiliation = Affiliation.objects.create(
+            name="Test Affiliation",
+            location="Sofia",
+            description="Test description",
+            website="https://example.com",
+        )
+        names = [None, None, "Alpha", "Beta", "Beta2", "Gamma", "Delta", None]
+        for number, name in enumerate(names):
+            Drug.objects.create(
+                proprietary_name=name,
+                international_non_proprietary_name=f"inn_{number}",
+                affiliated_institution=self.affiliation,
+                description="Test description",
+            )
+        self.expected = list(
+            Drug.objects.order_by("proprietary_name", "pk").values_list("pk", flat=True)
+        )
+
+    def test_walks_forward_and_backward_over_null_keys(self):
+        paginator = KeysetPaginator(
+            Drug.objects.all(), per_page=3, ordering=("proprietary_name",)
+        )
+        pages = [paginator.get_page()]
+        while pages[-1].has_next:
+            pages.append(paginator.get_page(after=pages[-1].next_cursor))
+
+        forward = [drug.pk for page in pages for drug in page]
+        self.assertEqual(forward, self.expected)
+
+        backward = [paginator.get_page(before=pages[-1].previous_cursor)]
+        while backward[-1].has_previous:
+            backward.append(paginator.get_page(before=backward[-1].previous_cursor))
+        self.assertEqual(
+            [drug.pk for page in reversed(backward) for drug in page],
+            self.expected[: len(self.expected) - len(pages[-1])],
+        )
+
+    def test_invalid_cursor_falls_back_to_first_page(self):
+        paginator = KeysetPaginator(
+            Drug.objects.all(), per_page=3, ordering=("proprietary_name",)
+        )
+        page = paginator.get_page(after="forged")
+        self.assertEqual([drug.pk for drug in page], self.expected[:3])
+
+    def test_pages_do_not_count_or_offset(self):
+        paginator = KeysetPaginator(
+            Drug.objects.all(), per_page=3, ordering=("proprietary_name",)
+        )
+        cursor = paginator.get_page().next_cursor
+        with CaptureQueriesContext(connection) as queries:
+            paginator.get_page(after=cursor)
+
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn("OFFSET", queries[0]["sql"].upper())
+
+    def test_deep_pages_start_from_an_index_range(self):
+        Publication.objects.bulk_create(
+            Publication(
+                title=f"Publication {number}",
+                affiliation=self.affiliation,
+                journal="Test journal",
+            )
+            for number in range(10)
+        )
+        paginator = KeysetPaginator(
+            Publication.objects.all(), per_page=3, ordering=("publication_date",)
+        )
+        values = paginator._decode(paginator.get_page().next_cursor)
+
+        # Explained with bound parameters, as the page query runs; the inlined
+        # SQL that the query log shows can get a different plan.
+        for queryset in (
+            paginator._query_after(values),
+            paginator._query_before(values),
+        ):
+            plan = query_plan(*queryset.query.sql_with_params())
+            with self.subTest(plan=plan):
+                if connection.vendor == "sqlite":
+                    self.assertEqual(len(plan), 1)
+                    self.assertTrue(plan[0].startswith("SEARCH"))
+                else:
+                    self.assertFalse(
+                        any(step.startswith(("Seq Scan", "Sort")) for step in plan)
+                    )
+
+    @override_settings(PAGINATION_MODE="offset")
+    def test_offset_mode_remains_available(self):
+        request = RequestFactory().get("/", {"page": 2})
+        page = paginate(
+            request, Drug.objects.all(), per_page=3, ordering=("proprietary_name",)
+        )
+        self.assertEqual(page.number, 2)
+        self.assertEqual([drug.pk for drug in page], self.expected[3:6])
+
+
+class PublicationCardCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.affiliation = Affiliation.objects.create(
+            name="Test Affiliation",
+            location="Sofia",
+            description="Test description",
+            website="https://example.com",
+        )
+        drug = Drug.objects.create(
+            proprietary_name="Testamol",
+            international_non_proprietary_name="testamol",
+            affiliated_institution=self.affiliation,
+            description="Test description",
+        )
+        self.author = USER_MODEL.objects.create_user(
+            username="author", first_name="Ada", last_name="Author"
+        )
+        self.trial = ClinicalTrial.objects.create(
+            title="Card trial",
+            drug=drug,
+            phase="Phase I",
+            affiliation=self.affiliation,
+            start_date="2024-01-01",
+            end_date="2024-02-01",
+            description="Test description",
+        )
+        self.publications = []
+        for number in range(3):
+            publication = Publication.objects.create(
+                title=f"Card publication {number}",
+                affiliation=self.affiliation,
+                journal="Test journal",
+            )
+            publication.authors.add(self.author)
+            publication.trials.add(self.trial)
+            self.publications.append(publication)
+
+    def test_warm_cards_are_fetched_in_one_multi_get(self):
+        self.client.get(reverse("index"))
+
+        with mock.patch.object(
+            cache, "get_many", wraps=cache.get_many
+        ) as get_many, self.assertNumQueries(2):
+            response = self.client.get(reverse("index"))
+        get_many.assert_called_once()
+        self.assertContains(response, "Ada Author", count=3)
+        self.assertContains(response, "Card trial", count=3)
+
+    def test_only_changed_cards_are_rendered_again(self):
+        self.client.get(reverse("index"))
+
+        self.publications[0].title = "Retitled publication"
+        self.publications[0].save()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("index"))
+        card_load = [
+            query["sql"]
+            for query in queries
+            if 'FROM "research_publication"' in query["sql"] and "IN (" in query["sql"]
+        ]
+        self.assertEqual(len(card_load), 1)
+        self.assertIn(str(self.publications[0].pk), card_load[0])
+        self.assertContains(response, "Retitled publication")
+
+        self.author.first_name = "Renamed"
+        self.author.save()
+        response = self.client.get(reverse("index"))
+        self.assertContains(response, "Renamed Author", count=3)
+
+
+class ViewBenchmarkTest(TestCase):
+    def test_every_named_url_has_a_case(self):
+        self.assertEqual(sorted(VIEW_CASES), named_urls())
+
+    def test_views_run_over_a_seeded_dataset(self):
+        seeded = seeding.seed(200, prefix=SEED_PREFIX)
+        profile = seeded.users[0].userprofile
+        self.assertEqual(profile.affiliation, seeded.affiliations[0])
+        self.assertEqual(read_counters()["publications"], len(seeded.publications))
+
+        results = run_benchmarks(seeded, sorted(VIEW_CASES), repeat=1)
+        self.assertEqual(set(results), set(VIEW_CASES))
+        for name, measured in results.items():
+            self.assertLess(measured["status"], 500, name)
+        self.assertGreater(results["affiliated_publications_list"]["queries"], 0)
+
+    def test_regressions_need_more_queries_or_a_large_slowdown(self):
+        baseline = {"index": {"wall_ms": 10.0, "queries": 4, "memory_kib": 100.0}}
+
+        unchanged = {"index": {"wall_ms": 18.0, "queries": 4, "memory_kib": 300.0}}
+        self.assertEqual(
+            find_regressions(unchanged, baseline, threshold=0.25, check_timings=True),
+            [],
+        )
+
+        slower = {"index": {"wall_ms": 25.0, "queries": 5, "memory_kib": 100.0}}
+        self.assertEqual(
+            find_regressions(slower, baseline, threshold=0.25),
+            ["index: 5 queries, baseline 4"],
+        )
+        self.assertEqual(
+            find_regressions(slower, baseline, threshold=0.25, check_timings=True),
+            ["index: 5 queries, baseline 4", "index: 25.0 ms, baseline 10.0 ms"],
+        )
+
+
+class RequestInstrumentationTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        affiliation = Affiliation.objects.create(
+            name="Test Affiliation",
+            location="Sofia",
+            description="Test description",
+            website="https://example.com",
+        )
+        for number in range(3):
+            Publication.objects.create(
+                title=f"Timed publication {number}",
+                affiliation=affiliation,
+                journal="Test journal",
+            )
+
+    def timings(self, response):
+        return dict(
+            re.match(r"(\w+);(.*)", part.strip()).groups()
+            for part in response["Server-Timing"].split(",")
+        )
+
+    def test_server_timing_matches_the_queries_run(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("index"))
+
+        timings = self.timings(response)
+        self.assertIn(f'desc="{len(queries)} queries"', timings["db"])
+        self.assertNotEqual(timings["template"], "dur=0.0")
+        self.assertNotIn('/ 0 misses"', timings["cache"])
+
+        response = self.client.get(reverse("index"))
+        self.assertIn('/ 0 misses"', self.timings(response)["cache"])
+
+    def test_cache_backends_are_counted_through_their_wrapper(self):
+        self.assertIsInstance(caches["default"], CountedCache)
+        caches["default"].set("counted", 1)
+        token = current_metrics.set(RequestMetrics())
+        try:
+            caches["default"].get("counted")
+            caches["default"].get_many(["counted", "missing"])
+            metrics = current_metrics.get()
+        finally:
+            current_metrics.reset(token)
+        self.assertEqual((metrics.cache_hits, metrics.cache_misses), (2, 1))
+
+    def test_every_request_is_logged_without_debug(self):
+        record = logging.LogRecord(
+            "drug_insights_hub.requests", logging.INFO, "", 0, "{}", None, None
+        )
+        self.assertFalse(settings.DEBUG)
+        handlers = logging.getLogger("drug_insights_hub.requests").handlers
+        self.assertTrue(all(handler.filter(record) for handler in handlers))
+
+    @override_settings(SLOW_REQUEST_THRESHOLD_MS=0)
+    def test_slow_requests_log_their_sql(self):
+        with self.assertLogs("drug_insights_hub.requests.slow", "WARNING") as logs:
+            with CaptureQueriesContext(connection) as queries:
+                self.client.get(reverse("index"))
+
+        logged = json.loads(logs.records[0].getMessage())
+        self.assertEqual(logged["view"], "index")
+        self.assertEqual(logged["queries"], len(queries))
+        self.assertEqual(len(logged["sql"]), len(queries))
+        self.assertIn("research_publication", logged["sql"][-1]["sql"])
+
+
+class ProfilingTest(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        overridden = override_settings(PROFILE_REPORT_DIR=directory.name)
+        overridden.enable()
+        self.addCleanup(overridden.disable)
+
+        self.staff = USER_MODEL.objects.create_user(
+            username="staff", password="testpass123", is_staff=True
+        )
+        self.client.force_login(self.staff)
+
+    def profile(self, user, **extra):
+        return self.client.get(
+            reverse("index"),
+            {profiling.PROFILE_PARAMETER: profiling.make_token(user)},
+            **extra,
+        )
+
+    def test_staff_token_saves_a_report(self):
+        response = self.profile(self.staff)
+
+        report = ProfileReport.objects.get(pk=response["X-Profile-Report"])
+        self.assertEqual(report.view_name, "index")
+        self.assertEqual(report.status_code, 200)
+        self.assertEqual(report.profiled_by, self.staff)
+        self.assertGreater(report.queries, 0)
+        self.assertTrue(profiling.report_path(report).exists())
+
+        response = self.client.get(
+            reverse("index"),
+            headers={profiling.PROFILE_HEADER: profiling.make_token(self.staff)},
+        )
+        self.assertIn("X-Profile-Report", response)
+
+    def test_requests_without_a_valid_token_are_not_profiled(self):
+        other = USER_MODEL.objects.create_user(
+            username="other", password="testpass123", is_staff=True
+        )
+        self.profile(other)
+        self.client.get(reverse("index"), {profiling.PROFILE_PARAMETER: "forged"})
+        self.staff.is_staff = False
+        self.staff.save()
+        self.profile(self.staff)
+
+        self.assertFalse(ProfileReport.objects.exists())
+
+    def test_admin_downloads_reports(self):
+        self.staff.is_superuser = True
+        self.staff.save()
+        report = ProfileReport.objects.get(
+            pk=self.profile(self.staff)["X-Profile-Report"]
+        )
+        url = "admin:core_profilereport_download"
+
+        response = self.client.get(reverse(url, args=(report.pk, "pstats")))
+        self.assertEqual(
+            b"".join(response.streaming_content),
+            profiling.report_path(report).read_bytes(),
+        )
+
+        response = self.client.get(reverse(url, args=(report.pk, "collapsed")))
+        stacks = response.content.decode().splitlines()
+        self.assertTrue(all(line.startswith("profiled_response") for line in stacks))
+        self.assertTrue(any("_get_response (base.py" in line for line in stacks))
+
+        response = self.client.get(reverse("admin:core_profilereport_changelist"))
+        self.assertContains(
+            response, f"?{profiling.PROFILE_PARAMETER}={self.staff.pk}:"
+        )
+
+    async def test_async_requests_are_profiled_in_their_own_loop(self):
+        await self.async_client.aforce_login(self.staff)
+        token = await sync_to_async(profiling.make_token)(self.staff)
+        response = await self.async_client.get(
+            reverse("index"), {profiling.PROFILE_PARAMETER: token}
+        )
+
+        report = await ProfileReport.objects.aget(pk=response["X-Profile-Report"])
+        self.assertEqual(report.view_name, "index")
+        self.assertNotEqual(report.hostname, "")
+        stats = profiling.read_stats(report)
+        stacks = profiling.collapsed_stacks(stats).splitlines()
+        self.assertTrue(
+            all(line.startswith("profiled_async_response") for line in stacks)
+        )
+
+    def test_profiles_missing_on_this_host_are_reported(self):
+        self.staff.is_superuser = True
+        self.staff.save()
+        report = ProfileReport.objects.get(
+            pk=self.profile(self.staff)["X-Profile-Report"]
+        )
+        report.hostname = "web-2"
+        report.save()
+        profiling.report_path(report).unlink()
+
+        for kind in ("pstats", "collapsed"):
+            response = self.client.get(
+                reverse("admin:core_profilereport_download", args=(report.pk, kind)),
+                follow=True,
+            )
+            self.assertRedirects(
+                response, reverse("admin:core_profilereport_changelist")
+            )
+            self.assertContains(response, "written on web-2")
+
+    @override_settings(PROFILE_REPORT_LIMIT=2)
+    def test_old_reports_are_pruned_with_their_files(self):
+        reports = [
+            ProfileReport.objects.get(pk=self.profile(self.staff)["X-Profile-Report"])
+            for _ in range(3)
+        ]
+
+        self.assertQuerySetEqual(
+            ProfileReport.objects.order_by("pk"), reports[1:], ordered=True
+        )
+        self.assertFalse(profiling.report_path(reports[0]).exists())
+        self.assertEqual(
+            len(list(profiling.report_path(reports[0]).parent.iterdir())), 2
+        )
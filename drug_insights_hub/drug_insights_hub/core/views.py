@@ -1,32 +1,35 @@
-from typing import Type
+from typing import Dict, List
 
-from django.contrib.auth import get_user_model
-from django.contrib.auth.models import User
-from django.core.paginator import Page, Paginator
+from django.core.paginator import Page
 from django.db.models import QuerySet
 from django.http import HttpRequest, HttpResponse
 from django.shortcuts import render
+from django.utils.safestring import SafeString
 
-from drug_insights_hub.research.models import ClinicalTrial, Drug, Publication
+from drug_insights_hub.core.cards import arender_cards
+from drug_insights_hub.core.counters import aread_counters
+from drug_insights_hub.core.pagination import KeysetPage, apaginate
+from drug_insights_hub.research.models import Publication
 
 
-def index(request: HttpRequest) -> HttpResponse:
-    user_type: Type[User] = get_user_model()
-    users_count: int = user_type.objects.count()
+async def index(request: HttpRequest) -> HttpResponse:
+    counts: Dict[str, int] = await aread_counters()
 
-    publications: QuerySet[Publication] = Publication.objects.order_by(
-        "publication_date"
-    ).all()
-    publications_count: int = publications.count()
-
-    clinical_trial_count: int = ClinicalTrial.objects.count()
-
-    drugs_count: int = Drug.objects.count()
+    # Only what pagination and the card keys need; cards that are not cached
+    # load their relations in arender_cards.
+    publications: QuerySet[Publication] = Publication.objects.only(
+        "publication_date", "updated_at", "affiliation"
+    )
 
     per_page: int = 10
-    paginator: Paginator = Paginator(publications, per_page=per_page)
-    page_number: int = request.GET.get("page")
-    page_obj: Page = paginator.get_page(page_number)
+    page_obj: KeysetPage | Page = await apaginate(
+        request,
+        publications,
+        per_page=per_page,
+        ordering=("publication_date",),
+        count=counts["publications"],
+    )
+    cards: List[SafeString] = await arender_cards(page_obj)
 
     if request.user.is_authenticated:
         logged = True
@@ -38,10 +41,11 @@ def index(request: HttpRequest) -> HttpResponse:
         template_name="core/index.html",
         context={
             "page_obj": page_obj,
+            "cards": cards,
             "logged": logged,
-            "users_count": users_count,
-            "publications_count": publications_count,
-            "clinical_trials_count": clinical_trial_count,
-            "drugs_count": drugs_count,
+            "users_count": counts["users"],
+            "publications_count": counts["publications"],
+            "clinical_trials_count": counts["clinical_trials"],
+            "drugs_count": counts["drugs"],
         },
     )
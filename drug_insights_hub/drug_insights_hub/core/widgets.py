@@ -0,0 +1,49 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+from django import forms
+from django.db import models
+from django.urls import reverse
+
+
+class AsyncSelectMultiple(forms.SelectMultiple):
+    # Renders only the selected options; the rest are fetched page by page
+    # from the lookup endpoint as the user types.
+
+    class Media:
+        js: Tuple[str, ...] = ("js/async_select.js",)
+
+    def __init__(self, lookup_url_name: str, attrs: Optional[Dict] = None) -> None:
+        super().__init__(attrs)
+        self.lookup_url_name: str = lookup_url_name
+
+    def get_context(self, name: str, value: Any, attrs: Optional[Dict]) -> Dict:
+        context: Dict = super().get_context(name, value, attrs)
+        context["widget"]["attrs"]["data-async-select"] = True
+        context["widget"]["attrs"]["data-lookup-url"] = reverse(self.lookup_url_name)
+        return context
+
+    def optgroups(self, name: str, value: List[str], attrs: Optional[Dict] = None):
+        selected: List[str] = [str(pk) for pk in value if pk not in (None, "")]
+        groups: List = []
+        for index, obj in enumerate(self._selected_objects(selected)):
+            option_value, label = self.choices.choice(obj)
+            groups.append(
+                (
+                    None,
+                    [
+                        self.create_option(
+                            name, option_value, label, True, index, attrs=attrs
+                        )
+                    ],
+                    index,
+                )
+            )
+        return groups
+
+    def _selected_objects(self, selected: List[str]) -> List[models.Model]:
+        if not selected:
+            return []
+        try:
+            return list(self.choices.queryset.filter(pk__in=selected))
+        except (ValueError, TypeError):
+            return []
@@ -0,0 +1,27 @@
+from typing import Optional
+
+from django.core.exceptions import PermissionDenied
+from django.http import Http404
+
+
+class DisplayedError(Exception):
+    status: int = 400
+    default_message: str = "Bad request."
+
+    def __init__(self, message: Optional[str] = None) -> None:
+        super().__init__(message or self.default_message)
+
+
+class ObjectNotFound(DisplayedError, Http404):
+    status: int = 404
+    default_message: str = "Not found."
+
+
+class NoAffiliation(DisplayedError, PermissionDenied):
+    status: int = 403
+    default_message: str = "You do not have affiliation!"
+
+
+class WrongAffiliation(DisplayedError, PermissionDenied):
+    status: int = 403
+    default_message: str = "Permission denied."
@@ -0,0 +1,23 @@
+from typing import Optional
+
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse
+from django.shortcuts import redirect
+from django.utils.deprecation import MiddlewareMixin
+
+from drug_insights_hub.errors.exceptions import DisplayedError
+from drug_insights_hub.errors.views import render_error
+
+
+class ErrorPageMiddleware(MiddlewareMixin):
+    def process_exception(
+        self, request: HttpRequest, exception: Exception
+    ) -> Optional[HttpResponse]:
+        if not isinstance(exception, DisplayedError):
+            return None
+
+        if settings.ERROR_RENDERING == "redirect":
+            request.session["error_message"] = str(exception)
+            request.session["status_code"] = exception.status
+            return redirect("error")
+        return render_error(request, str(exception), exception.status)
@@ -1,3 +1,64 @@
-from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
 
-# Create your tests here.
+from drug_insights_hub.accounts.models import Affiliation
+from drug_insights_hub.research.models import Drug
+
+USER_MODEL = get_user_model()
+
+
+class ErrorPageMiddlewareTest(TestCase):
+    def setUp(self):
+        self.affiliation = Affiliation.objects.create(
+            name="Test Affiliation",
+            location="Sofia",
+            description="Test description",
+            website="https://example.com",
+        )
+        self.drug = Drug.objects.create(
+            proprietary_name="Testamol",
+            international_non_proprietary_name="testamol",
+            affiliated_institution=self.affiliation,
+            description="Test description",
+        )
+        self.user = USER_MODEL.objects.create_user(
+            username="test_user", password="test_password"
+        )
+        self.client.force_login(self.user)
+
+    def test_errors_render_in_the_original_request(self):
+        response = self.client.get(reverse("drug_update", kwargs={"pk": 0}))
+        self.assertContains(response, "Drug not found!", status_code=404)
+
+        response = self.client.get(reverse("affiliated_drugs_list"))
+        self.assertContains(response, "You do not have affiliation!", status_code=403)
+        self.assertNotIn("error_message", self.client.session)
+
+        self.user.userprofile.affiliation = Affiliation.objects.create(
+            name="Other Affiliation",
+            location="Plovdiv",
+            description="Test description",
+            website="https://example.org",
+        )
+        self.user.userprofile.save()
+        response = self.client.get(reverse("drug_update", kwargs={"pk": self.drug.pk}))
+        self.assertEqual(response.status_code, 403)
+        self.assertTemplateUsed(response, "errors/error.html")
+
+    def test_error_page_does_not_write_the_session(self):
+        url = reverse("drug_update", kwargs={"pk": 0})
+        self.client.get(url)
+        session_key = self.client.session.session_key
+
+        with self.assertNumQueries(3):
+            self.client.get(url)
+        self.assertEqual(self.client.session.session_key, session_key)
+
+    @override_settings(ERROR_RENDERING="redirect")
+    def test_redirect_fallback(self):
+        response = self.client.get(reverse("drug_update", kwargs={"pk": 0}))
+        self.assertRedirects(response, reverse("error"), fetch_redirect_response=False)
+
+        response = self.client.get(reverse("error"))
+        self.assertContains(response, "Drug not found!", status_code=404)
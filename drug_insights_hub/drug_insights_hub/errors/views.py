@@ -2,15 +2,7 @@ from django.http import HttpRequest, HttpResponse
 from django.shortcuts import render
 
 
-def error(request: HttpRequest) -> HttpResponse:
-    error_message = request.session.pop("error_message", None)
-    if error_message is None:
-        error_message = "Permission denied."
-    
-    status = request.session.pop("status_code", None)
-    if status is None:
-        status = 404
-
+def render_error(request: HttpRequest, error_message: str, status: int) -> HttpResponse:
     if request.user.is_authenticated:
         logged: bool = True
     else:
@@ -25,3 +17,15 @@ def error(request: HttpRequest) -> HttpResponse:
         },
         status=status,
     )
+
+
+def error(request: HttpRequest) -> HttpResponse:
+    error_message = request.session.pop("error_message", None)
+    if error_message is None:
+        error_message = "Permission denied."
+
+    status = request.session.pop("status_code", None)
+    if status is None:
+        status = 404
+
+    return render_error(request, error_message, status)
@@ -1,7 +1,8 @@
-from typing import Tuple
+from typing import Tuple, Type
 
 from django.contrib import admin
 
+from drug_insights_hub.core.pagination import EstimatedCountPaginator
 from drug_insights_hub.research.models import ClinicalTrial, Drug, Publication
 
 
@@ -19,11 +20,14 @@ class DrugAdmin(admin.ModelAdmin):
         "drug_type",
         "development_status",
     )
-    search_fields: Tuple[str, str, str] = (
+    list_select_related: Tuple[str] = ("affiliated_institution",)
+    # Both have trigram indexes on PostgreSQL, see research migration 0009.
+    search_fields: Tuple[str, str] = (
         "proprietary_name",
         "international_non_proprietary_name",
-        "description",
     )
+    paginator: Type[EstimatedCountPaginator] = EstimatedCountPaginator
+    show_full_result_count: bool = False
 
 
 @admin.register(ClinicalTrial)
@@ -37,8 +41,11 @@ class ClinicalTrialAdmin(admin.ModelAdmin):
         "end_date",
     )
     list_filter: Tuple[str, str] = ("phase", "affiliation")
-    search_fields: Tuple[str, str, str] = ("title", "drug", "affiliation")
+    list_select_related: Tuple[str, str] = ("drug", "affiliation")
+    search_fields: Tuple[str] = ("title",)
     date_hierarchy: str = "start_date"
+    paginator: Type[EstimatedCountPaginator] = EstimatedCountPaginator
+    show_full_result_count: bool = False
 
 
 @admin.register(Publication)
@@ -51,4 +58,7 @@ class PublicationAdmin(admin.ModelAdmin):
         "journal",
     )
     list_filter: Tuple[str] = ("affiliation",)
+    list_select_related: Tuple[str] = ("affiliation",)
     search_fields: Tuple[str, str] = ("title", "journal")
+    paginator: Type[EstimatedCountPaginator] = EstimatedCountPaginator
+    show_full_result_count: bool = False
@@ -0,0 +1,206 @@
+import json
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+from django.core.handlers.asgi import ASGIRequest
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import QuerySet
+from django.http import HttpRequest, JsonResponse, StreamingHttpResponse
+from django.views.decorators.http import require_GET
+
+from drug_insights_hub.research.records import (
+    RESOURCES,
+    Resource,
+    aiter_records,
+    iter_records,
+)
+
+API_CHUNK_SIZE: int = 2000
+
+STREAM_BATCH_SIZE: int = 500
+
+FORMATS: Dict[str, str] = {
+    "json": "application/json",
+    "ndjson": "application/x-ndjson",
+}
+
+
+class ApiError(Exception):
+    def __init__(self, message: str, status: int) -> None:
+        super().__init__(message)
+        self.message: str = message
+        self.status: int = status
+
+
+@require_GET
+def api_list(
+    request: HttpRequest, resource_name: str
+) -> StreamingHttpResponse | JsonResponse:
+    try:
+        resource, fields, queryset = _prepare(request, resource_name)
+        output_format: str = _output_format(request)
+    except ApiError as error:
+        return JsonResponse({"error": error.message}, status=error.status)
+
+    # Under ASGI, Django would read a synchronous iterator into a list before
+    # sending any of it, so the records are streamed from aiterator() there.
+    encoded: Iterator[str] | AsyncIterator[str]
+    if isinstance(request, ASGIRequest):
+        arecords: AsyncIterator[Dict[str, Any]] = aiter_records(
+            resource, queryset, fields, chunk_size=API_CHUNK_SIZE
+        )
+        encoded = (
+            _aencode_ndjson(arecords)
+            if output_format == "ndjson"
+            else _aencode_json_array(arecords)
+        )
+    else:
+        records: Iterator[Dict[str, Any]] = iter_records(
+            resource, queryset, fields, chunk_size=API_CHUNK_SIZE
+        )
+        encoded = (
+            _encode_ndjson(records)
+            if output_format == "ndjson"
+            else _encode_json_array(records)
+        )
+    return StreamingHttpResponse(encoded, content_type=FORMATS[output_format])
+
+
+@require_GET
+def api_detail(request: HttpRequest, resource_name: str, pk: int) -> JsonResponse:
+    try:
+        resource, fields, queryset = _prepare(request, resource_name)
+    except ApiError as error:
+        return JsonResponse({"error": error.message}, status=error.status)
+
+    records: List[Dict[str, Any]] = list(
+        iter_records(resource, queryset.filter(pk=pk), fields)
+    )
+    if not records:
+        return JsonResponse({"error": "Object not found."}, status=404)
+    return JsonResponse(records[0])
+
+
+def _prepare(
+    request: HttpRequest, resource_name: str
+) -> Tuple[Resource, List[str], QuerySet]:
+    resource: Optional[Resource] = RESOURCES.get(resource_name)
+    if resource is None:
+        raise ApiError("Unknown resource.", 404)
+    if not request.user.is_authenticated:
+        raise ApiError("Authentication required.", 401)
+
+    return resource, _selected_fields(request, resource), _filtered(request, resource)
+
+
+def _selected_fields(request: HttpRequest, resource: Resource) -> List[str]:
+    requested: str = request.GET.get("fields", "")
+    if not requested:
+        return list(resource.fields)
+
+    fields: List[str] = [name.strip() for name in requested.split(",") if name.strip()]
+    unknown: List[str] = [name for name in fields if name not in resource.fields]
+    if unknown:
+        raise ApiError(
+            f"Unknown fields: {', '.join(unknown)}. "
+            f"Available fields: {', '.join(resource.fields)}.",
+            400,
+        )
+    return fields
+
+
+def _filtered(request: HttpRequest, resource: Resource) -> QuerySet:
+    queryset: QuerySet = resource.model._default_manager.all()
+    affiliation: str = request.GET.get("affiliation", "")
+    if not affiliation:
+        return queryset
+
+    if affiliation == "mine":
+        if request.affiliation is None:
+            raise ApiError("You do not have affiliation!", 403)
+        affiliation_id: int = request.affiliation.pk
+    else:
+        try:
+            affiliation_id = int(affiliation)
+        except ValueError:
+            raise ApiError("Affiliation must be an id or 'mine'.", 400)
+
+    return queryset.filter(**{f"{resource.affiliation_field}_id": affiliation_id})
+
+
+def _output_format(request: HttpRequest) -> str:
+    output_format: str = request.GET.get("format", "")
+    if not output_format:
+        accept: str = request.headers.get("Accept", "")
+        output_format = "ndjson" if FORMATS["ndjson"] in accept else "json"
+    if output_format not in FORMATS:
+        raise ApiError(f"Format must be one of: {', '.join(FORMATS)}.", 400)
+    return output_format
+
+
+def _dumps(record: Dict[str, Any]) -> str:
+    return json.dumps(record, cls=DjangoJSONEncoder)
+
+
+def _batched(lines: Iterable[str]) -> Iterator[str]:
+    batch: List[str] = []
+    for line in lines:
+        batch.append(line)
+        if len(batch) == STREAM_BATCH_SIZE:
+            yield "".join(batch)
+            batch = []
+    if batch:
+        yield "".join(batch)
+
+
+def _encode_ndjson(records: Iterator[Dict[str, Any]]) -> Iterator[str]:
+    return _batched(_dumps(record) + "\n" for record in records)
+
+
+def _encode_json_array(records: Iterator[Dict[str, Any]]) -> Iterator[str]:
+    yield "["
+    yield from _batched(
+        ("," if index else "") + _dumps(record)
+        for index, record in enumerate(records)
+    )
+    yield "]"
+
+
+async def _abatched(lines: AsyncIterable[str]) -> AsyncIterator[str]:
+    batch: List[str] = []
+    async for line in lines:
+        batch.append(line)
+        if len(batch) == STREAM_BATCH_SIZE:
+            yield "".join(batch)
+            batch = []
+    if batch:
+        yield "".join(batch)
+
+
+def _aencode_ndjson(records: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[str]:
+    return _abatched(_dumps(record) + "\n" async for record in records)
+
+
+async def _aencode_json_array(
+    records: AsyncIterator[Dict[str, Any]]
+) -> AsyncIterator[str]:
+    yield "["
+    async for batch in _abatched(_ajson_items(records)):
+        yield batch
+    yield "]"
+
+
+async def _ajson_items(records: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[str]:
+    separator: str = ""
+    async for record in records:
+        yield separator + _dumps(record)
+        separator = ","
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class ResearchConfig(AppConfig):
     default_auto_field: str = 'django.db.models.BigAutoField'
     name: str = 'drug_insights_hub.research'
+
+    def ready(self) -> None:
+        import drug_insights_hub.research.signals
@@ -0,0 +1,281 @@
+import math
+import threading
+import unicodedata
+from bisect import bisect_left, insort
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from django.core.cache import caches
+from django.db import connections
+
+from drug_insights_hub.core.cache import VERSION_CACHE_ALIAS, bump_version, get_version
+from drug_insights_hub.research.models import Drug
+
+# Bumped after every committed change to drug names, in any worker. Each
+# version's change is logged under change_key() for the other workers.
+DRUG_NAMES_NAMESPACE: str = "drug_names"
+CHANGE_LOG_TIMEOUT: int = 24 * 60 * 60
+# Further behind than this, a worker builds the index again instead.
+MAX_REPLAYED_CHANGES: int = 1000
+
+INDEX_ATTRIBUTES: Tuple[str, ...] = (
+    "_names",
+    "_sorted",
+    "_next_name_id",
+    "_name_ids",
+    "_name_grams",
+    "_name_pks",
+    "_postings",
+)
+
+# (pk, proprietary name, international non-proprietary name)
+DrugNames = Tuple[int, Optional[str], str]
+
+MIN_SIMILARITY: float = 0.3
+
+MIN_FUZZY_QUERY_LENGTH: int = 5
+
+
+def normalize(name: str) -> str:
+    decomposed: str = unicodedata.normalize("NFKD", name)
+    stripped: str = "".join(
+        char for char in decomposed if not unicodedata.combining(char)
+    )
+    return stripped.lower().strip()
+
+
+def change_key(version: int) -> str:
+    return f"{DRUG_NAMES_NAMESPACE}:change:{version}"
+
+
+def trigrams(name: str) -> Set[str]:
+    padded: str = f"  {name} "
+    return {padded[index : index + 3] for index in range(len(padded) - 2)}
+
+
+class DrugNameIndex:
+    def __init__(self) -> None:
+        self._lock: threading.RLock = threading.RLock()
+        self._built: bool = False
+        self._version: Optional[int] = None
+        self._rebuild: Optional[threading.Thread] = None
+        self._reset()
+
+    @property
+    def built(self) -> bool:
+        return self._built
+
+    def build(self, drugs: Optional[Iterable[DrugNames]] = None) -> None:
+        version: Optional[int] = None
+        if drugs is None:
+            # Read before the rows: changes committed meanwhile are replayed
+            # from the change log afterwards.
+            version = get_version(DRUG_NAMES_NAMESPACE)
+            drugs = self._rows()
+
+        # Filled aside, so searches keep using the current index meanwhile.
+        fresh: DrugNameIndex = DrugNameIndex()
+        for pk, proprietary_name, inn in drugs:
+            fresh._insert(pk, proprietary_name, inn, keep_sorted=False)
+        fresh._sorted.sort()
+
+        with self._lock:
+            for attribute in INDEX_ATTRIBUTES:
+                setattr(self, attribute, getattr(fresh, attribute))
+            self._built = True
+            self._version = version
+
+    def warm_up(self) -> None:
+        # Called from the WSGI and ASGI entry points, so the first
+        # autocomplete request doesn't wait for the index.
+        if not self._built:
+            self._build_in_background()
+
+    def ensure_current(self) -> None:
+        version: int = get_version(DRUG_NAMES_NAMESPACE)
+        if self._built and self._version == version:
+            return
+        if not self._built:
+            rebuild: Optional[threading.Thread] = self._rebuild
+            if rebuild is not None:
+                rebuild.join()
+            with self._lock:
+                if not self._built:
+                    self.build()
+        self._replay(version)
+
+    def publish(self, added: List[DrugNames], removed: List[int]) -> None:
+        # Called after commit. The change is logged under its version for the
+        # other workers to replay; this one applies it right away unless it
+        # is behind.
+        version: int = bump_version(DRUG_NAMES_NAMESPACE)
+        caches[VERSION_CACHE_ALIAS].set(
+            change_key(version), (added, removed), timeout=CHANGE_LOG_TIMEOUT
+        )
+        with self._lock:
+            if self._built and self._version == version - 1:
+                self._apply(added, removed)
+                self._version = version
+
+    def _replay(self, version: int) -> None:
+        start: Optional[int] = self._version
+        if start is None or version - start > MAX_REPLAYED_CHANGES:
+            self._build_in_background()
+            return
+        if start >= version:
+            return
+
+        keys: Dict[int, str] = {
+            number: change_key(number) for number in range(start + 1, version + 1)
+        }
+        logged: Dict[str, Any] = caches[VERSION_CACHE_ALIAS].get_many(keys.values())
+        with self._lock:
+            for number, key in keys.items():
+                if number <= self._version:
+                    continue
+                if key not in logged:
+                    # Evicted, or not logged yet by the worker that bumped.
+                    self._build_in_background()
+                    return
+                self._apply(*logged[key])
+                self._version = number
+
+    def _build_in_background(self) -> None:
+        with self._lock:
+            if self._rebuild is not None and self._rebuild.is_alive():
+                return
+            self._rebuild = threading.Thread(
+                target=self._build_and_close, name="drug-name-index", daemon=True
+            )
+            self._rebuild.start()
+
+    def _build_and_close(self) -> None:
+        try:
+            self.build()
+        finally:
+            connections.close_all()
+
+    def _rows(self) -> Iterable[DrugNames]:
+        return Drug.objects.values_list(
+            "pk", "proprietary_name", "international_non_proprietary_name"
+        ).iterator(chunk_size=5000)
+
+    def _apply(self, added: List[DrugNames], removed: List[int]) -> None:
+        for pk in removed:
+            self._delete(pk)
+        for pk, proprietary_name, inn in added:
+            self._delete(pk)
+            self._insert(pk, proprietary_name, inn, keep_sorted=True)
+
+    def search(self, query: str, limit: int = 10) -> List[Tuple[int, str, str]]:
+        normalized: str = normalize(query)
+        if not normalized:
+            return []
+
+        with self._lock:
+            matches: List[int] = self._prefix_matches(normalized, limit)
+            if len(matches) < limit and len(normalized) >= MIN_FUZZY_QUERY_LENGTH:
+                for pk in self._fuzzy_matches(normalized, limit):
+                    if pk not in matches:
+                        matches.append(pk)
+                    if len(matches) == limit:
+                        break
+            return [(pk, *self._names[pk]) for pk in matches]
+
+    def _reset(self) -> None:
+        self._names: Dict[int, Tuple[str, str]] = {}
+        self._sorted: List[Tuple[str, int]] = []
+        self._next_name_id: int = 0
+        self._name_ids: Dict[str, int] = {}
+        self._name_grams: Dict[int, FrozenSet[str]] = {}
+        self._name_pks: Dict[int, Set[int]] = {}
+        self._postings: Dict[str, Set[int]] = {}
+
+    def _insert(
+        self, pk: int, proprietary_name: Optional[str], inn: str, keep_sorted: bool
+    ) -> None:
+        self._names[pk] = (proprietary_name or "", inn or "")
+        for name in {normalize(value) for value in self._names[pk] if value}:
+            if keep_sorted:
+                insort(self._sorted, (name, pk))
+            else:
+                self._sorted.append((name, pk))
+
+            name_id: Optional[int] = self._name_ids.get(name)
+            if name_id is None:
+                name_id = self._next_name_id
+                self._next_name_id += 1
+                self._name_ids[name] = name_id
+                self._name_grams[name_id] = frozenset(trigrams(name))
+                self._name_pks[name_id] = set()
+                for gram in self._name_grams[name_id]:
+                    self._postings.setdefault(gram, set()).add(name_id)
+            self._name_pks[name_id].add(pk)
+
+    def _delete(self, pk: int) -> None:
+        names: Optional[Tuple[str, str]] = self._names.pop(pk, None)
+        if names is None:
+            return
+
+        for name in {normalize(value) for value in names if value}:
+            position: int = bisect_left(self._sorted, (name, pk))
+            if position < len(self._sorted) and self._sorted[position] == (name, pk):
+                del self._sorted[position]
+
+            name_id: int = self._name_ids[name]
+            self._name_pks[name_id].discard(pk)
+            if self._name_pks[name_id]:
+                continue
+
+            for gram in self._name_grams[name_id]:
+                self._postings[gram].discard(name_id)
+                if not self._postings[gram]:
+                    del self._postings[gram]
+            del self._name_ids[name]
+            del self._name_grams[name_id]
+            del self._name_pks[name_id]
+
+    def _prefix_matches(self, prefix: str, limit: int) -> List[int]:
+        matches: List[int] = []
+        position: int = bisect_left(self._sorted, (prefix, 0))
+        while position < len(self._sorted) and len(matches) < limit:
+            name, pk = self._sorted[position]
+            if not name.startswith(prefix):
+                break
+            if pk not in matches:
+                matches.append(pk)
+            position += 1
+        return matches
+
+    def _fuzzy_matches(self, query: str, limit: int) -> List[int]:
+        query_grams: Set[str] = trigrams(query)
+        # A name reaching MIN_SIMILARITY shares at least ``minimum_overlap``
+        # trigrams with the query, so it appears in the posting of at least one
+        # of the rarest ``len(query_grams) - minimum_overlap + 1`` trigrams.
+        # Only those postings are scanned; candidates are then scored exactly.
+        minimum_overlap: int = max(math.ceil(MIN_SIMILARITY * len(query_grams)), 1)
+        rarest: List[str] = sorted(
+            query_grams, key=lambda gram: len(self._postings.get(gram, ()))
+        )[: len(query_grams) - minimum_overlap + 1]
+
+        candidates: Set[int] = set()
+        for gram in rarest:
+            candidates.update(self._postings.get(gram, ()))
+
+        best: Dict[int, float] = {}
+        for name_id in candidates:
+            grams: FrozenSet[str] = self._name_grams[name_id]
+            overlap: int = len(query_grams & grams)
+            similarity: float = overlap / (len(query_grams) + len(grams) - overlap)
+            if similarity < MIN_SIMILARITY:
+                continue
+            for pk in self._name_pks[name_id]:
+                if similarity > best.get(pk, 0.0):
+                    best[pk] = similarity
+
+        ranked: List[Tuple[float, int]] = sorted(
+            (-similarity, pk) for pk, similarity in best.items()
+        )
+        return [pk for _, pk in ranked[:limit]]
+
+
+drug_name_index: DrugNameIndex = DrugNameIndex()
@@ -0,0 +1,127 @@
+import datetime
+import hashlib
+from typing import Callable, Iterable, List, Optional, Tuple, Type
+
+from django.db import models, transaction
+from django.http import HttpRequest
+
+from drug_insights_hub.core.cache import (
+    bump_version,
+    get_version,
+    touch_version,
+    version_time,
+)
+from drug_insights_hub.core.decorators import Validators
+from drug_insights_hub.research.summary import affiliation_attname
+
+LIST_NAMESPACE: str = "list"
+# Bumped when something every page of the affiliation's objects shows, like
+# its name, changes. The version is a time, see core.cache.touch_version().
+AFFILIATION_NAMESPACE: str = "affiliation"
+
+
+def list_namespace(model: Type[models.Model], affiliation_id: int) -> str:
+    return f"{LIST_NAMESPACE}:{model._meta.label_lower}:{affiliation_id}"
+
+
+def invalidate_lists(
+    model: Type[models.Model], affiliation_ids: Iterable[Optional[int]]
+) -> None:
+    # Bumped after commit so a list rendered from the old rows can't be tagged
+    # with the new version.
+    namespaces: List[str] = [
+        list_namespace(model, affiliation_id)
+        for affiliation_id in set(affiliation_ids)
+        if affiliation_id is not None
+    ]
+    if namespaces:
+        transaction.on_commit(
+            lambda: [bump_version(namespace) for namespace in namespaces]
+        )
+
+
+def affiliation_namespace(affiliation_id: int) -> str:
+    return f"{AFFILIATION_NAMESPACE}:{affiliation_id}"
+
+
+def affiliation_version(affiliation_id: int) -> int:
+    return get_version(affiliation_namespace(affiliation_id))
+
+
+def invalidate_affiliation(affiliation_id: int) -> None:
+    namespace: str = affiliation_namespace(affiliation_id)
+    transaction.on_commit(lambda: touch_version(namespace))
+
+
+def page_state(
+    model: Type[models.Model], pk: int
+) -> Optional[Tuple[datetime.datetime, int]]:
+    # A detail page changes with the row's updated_at, which the research
+    # signals touch for everything else the page shows, or with the version of
+    # its affiliation.
+    row: Optional[Tuple[datetime.datetime, int]] = (
+        model._default_manager.filter(pk=pk)
+        .values_list("updated_at", affiliation_attname(model))
+        .first()
+    )
+    if row is None:
+        return None
+    updated_at, affiliation_id = row
+    return updated_at, affiliation_version(affiliation_id)
+
+
+def page_stamp(updated_at: datetime.datetime, version: int) -> str:
+    return f"{updated_at.timestamp()}:{version}"
+
+
+def viewer_etag(request: HttpRequest, *parts: object) -> str:
+    # Pages differ by login state and by whether the viewer shares the object's
+    # affiliation, so both go into the tag.
+    affiliation_id: int = request.affiliation.pk if request.affiliation else 0
+    viewer: str = f"{request.user.pk or 0}:{affiliation_id}"
+    return hashlib.md5(
+        ":".join([viewer, *map(str, parts)]).encode(), usedforsecurity=False
+    ).hexdigest()
+
+
+def viewer_last_modified(
+    request: HttpRequest, updated_at: datetime.datetime
+) -> Optional[datetime.datetime]:
+    # If-Modified-Since cannot tell viewers apart, so only anonymous pages,
+    # which are the same for everyone, get a Last-Modified.
+    return None if request.user.is_authenticated else updated_at
+
+
+def detail_validators(model: Type[models.Model]) -> Callable[..., Validators]:
+    def validators(request: HttpRequest, pk: int, *args, **kwargs) -> Validators:
+        state: Optional[Tuple[datetime.datetime, int]] = page_state(model, pk)
+        if state is None:
+            return None
+        updated_at, version = state
+        # Keys the object cache, see object_cache.get_object().
+        request.page_stamp = page_stamp(updated_at, version)
+        return (
+            viewer_etag(request, model._meta.label_lower, pk, request.page_stamp),
+            viewer_last_modified(request, max(updated_at, version_time(version))),
+        )
+
+    return validators
+
+
+def list_validators(model: Type[models.Model]) -> Callable[..., Validators]:
+    # The list's version is bumped by the research signals whenever a row of
+    # the affiliation's list changes or is deleted, so checking it costs one
+    # shared cache read and no query. List pages are only shown to logged in
+    # users, so there is no Last-Modified.
+    def validators(request: HttpRequest, *args, **kwargs) -> Validators:
+        if request.affiliation is None:
+            return None
+        version: int = get_version(list_namespace(model, request.affiliation.pk))
+        return (
+            viewer_etag(
+                request, model._meta.label_lower, request.get_full_path(), version
+            ),
+            None,
+        )
+
+    return validators
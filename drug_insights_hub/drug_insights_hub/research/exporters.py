@@ -0,0 +1,125 @@
+import csv
+import gzip
+import json
+import os
+from typing import IO, Any, Dict, List, NamedTuple, Optional, Tuple
+
+import django
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections
+from django.db.models import QuerySet
+
+from drug_insights_hub.research.records import (
+    DEFAULT_CHUNK_SIZE,
+    RESOURCES,
+    Resource,
+    iter_records,
+)
+
+FORMATS: Tuple[str, ...] = ("csv", "jsonl")
+
+MANY_SEPARATOR: str = ";"
+
+
+class ExportTask(NamedTuple):
+    affiliation_id: int
+    directory: str
+    file_format: str
+    compress: bool
+    chunk_size: int
+
+
+def export_path(
+    directory: str, resource_name: str, file_format: str, compress: bool
+) -> str:
+    return os.path.join(
+        directory, f"{resource_name}.{file_format}" + (".gz" if compress else "")
+    )
+
+
+def export_resource(
+    resource_name: str,
+    path: str,
+    file_format: str,
+    compress: bool = False,
+    affiliation_id: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> int:
+    resource: Resource = RESOURCES[resource_name]
+    queryset: QuerySet = resource.model._default_manager.all()
+    if affiliation_id is not None:
+        queryset = queryset.filter(
+            **{f"{resource.affiliation_field}_id": affiliation_id}
+        )
+
+    exported: int = 0
+    partial_path: str = f"{path}.partial"
+    with _open(partial_path, compress) as stream:
+        if file_format == "csv":
+            writer: csv.writer = csv.writer(stream)
+            writer.writerow(resource.fields)
+        for record in iter_records(
+            resource, queryset, resource.fields, chunk_size=chunk_size
+        ):
+            if file_format == "csv":
+                writer.writerow(_csv_row(resource, record))
+            else:
+                stream.write(json.dumps(record, cls=DjangoJSONEncoder) + "\n")
+            exported += 1
+    os.replace(partial_path, path)
+    return exported
+
+
+def export_all(
+    directory: str,
+    file_format: str,
+    compress: bool = False,
+    affiliation_id: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Dict[str, int]:
+    os.makedirs(directory, exist_ok=True)
+    return {
+        resource_name: export_resource(
+            resource_name,
+            export_path(directory, resource_name, file_format, compress),
+            file_format,
+            compress=compress,
+            affiliation_id=affiliation_id,
+            chunk_size=chunk_size,
+        )
+        for resource_name in RESOURCES
+    }
+
+
+def export_affiliation(task: ExportTask) -> Tuple[int, Dict[str, int]]:
+    return task.affiliation_id, export_all(
+        task.directory,
+        task.file_format,
+        compress=task.compress,
+        affiliation_id=task.affiliation_id,
+        chunk_size=task.chunk_size,
+    )
+
+
+def export_affiliation_in_worker(task: ExportTask) -> Tuple[int, Dict[str, int]]:
+    # Worker processes need their own app registry and database connections.
+    django.setup()
+    try:
+        return export_affiliation(task)
+    finally:
+        connections.close_all()
+
+
+def _open(path: str, compress: bool) -> IO[str]:
+    if compress:
+        return gzip.open(path, "wt", encoding="utf-8", newline="")
+    return open(path, "w", encoding="utf-8", newline="")
+
+
+def _csv_row(resource: Resource, record: Dict[str, Any]) -> List[Any]:
+    return [
+        MANY_SEPARATOR.join(str(pk) for pk in record[name])
+        if name in resource.many_to_many_fields
+        else record[name]
+        for name in resource.fields
+    ]
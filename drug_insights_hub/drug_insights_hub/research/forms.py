@@ -1,13 +1,45 @@
-from typing import Tuple, Type
+from typing import Optional, Tuple, Type
 
 from django import forms
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import User
 
+from drug_insights_hub.accounts.models import Affiliation
+from drug_insights_hub.core.fields import CachedModelChoiceField
+from drug_insights_hub.core.widgets import AsyncSelectMultiple
 from drug_insights_hub.research.models import ClinicalTrial, Drug, Publication
 
 USER_MODEL: Type[User] = get_user_model()
 
+AFFILIATION_CHOICES_NAMESPACE: str = "affiliation_choices"
+DRUG_CHOICES_NAMESPACE: str = "drug_choices"
+
+
+def user_affiliation(user: Optional[User]) -> Optional[Affiliation]:
+    return user.userprofile.affiliation if user else None
+
+
+def affiliation_choice_field() -> CachedModelChoiceField:
+    return CachedModelChoiceField(
+        queryset=Affiliation.objects.none(),
+        cache_namespace=AFFILIATION_CHOICES_NAMESPACE,
+    )
+
+
+def limit_affiliation_choices(
+    field: CachedModelChoiceField, affiliation: Optional[Affiliation]
+) -> None:
+    if affiliation is None:
+        field.limit_choices(Affiliation.objects.none(), scope="none")
+        return
+    field.limit_choices(
+        Affiliation.objects.filter(pk=affiliation.pk), scope=affiliation.pk
+    )
+    field.initial = affiliation
+    field.widget.attrs["readonly"] = True
+    field.widget.attrs["disabled"] = True
+    field.required = False
+
 
 class DrugBaseForm(forms.ModelForm):
     class Meta:
@@ -21,14 +53,14 @@ class DrugBaseForm(forms.ModelForm):
 
 
 class DrugCreationForm(DrugBaseForm):
+    affiliated_institution: CachedModelChoiceField = affiliation_choice_field()
+
     def __init__(self, *args, **kwargs) -> None:
         user: Type[User] = kwargs.pop("user", None)
         super(DrugCreationForm, self).__init__(*args, **kwargs)
-        if user and user.userprofile.affiliation:
-            self.fields["affiliated_institution"].initial = user.userprofile.affiliation
-            self.fields["affiliated_institution"].widget.attrs["readonly"] = True
-            self.fields["affiliated_institution"].widget.attrs["disabled"] = True
-            self.fields["affiliated_institution"].required = False
+        limit_affiliation_choices(
+            self.fields["affiliated_institution"], user_affiliation(user)
+        )
 
         for field in self.fields.keys():
             self.fields[field].widget.attrs.update({"class": "form-control"})
@@ -69,19 +101,31 @@ class ClinicalTrialBaseForm(forms.ModelForm):
         )
     )
     participants: forms.MultipleChoiceField = forms.ModelMultipleChoiceField(
-        queryset=USER_MODEL.objects.all(), widget=forms.SelectMultiple
+        queryset=USER_MODEL.objects.only("username"),
+        widget=AsyncSelectMultiple("user_lookup"),
     )
 
 
 class ClinicalTrialCreationForm(ClinicalTrialBaseForm):
+    drug: CachedModelChoiceField = CachedModelChoiceField(
+        queryset=Drug.objects.none(), cache_namespace=DRUG_CHOICES_NAMESPACE
+    )
+    affiliation: CachedModelChoiceField = affiliation_choice_field()
+
     def __init__(self, *args, **kwargs) -> None:
         user: Type[User] = kwargs.pop("user", None)
         super(ClinicalTrialCreationForm, self).__init__(*args, **kwargs)
-        if user and user.userprofile.affiliation:
-            self.fields["affiliation"].initial = user.userprofile.affiliation
-            self.fields["affiliation"].widget.attrs["readonly"] = True
-            self.fields["affiliation"].widget.attrs["disabled"] = True
-            self.fields["affiliation"].required = False
+        affiliation: Optional[Affiliation] = user_affiliation(user)
+        limit_affiliation_choices(self.fields["affiliation"], affiliation)
+        if affiliation is not None:
+            self.fields["drug"].limit_choices(
+                Drug.objects.filter(affiliated_institution=affiliation)
+                .only("proprietary_name")
+                .order_by("proprietary_name", "id"),
+                scope=affiliation.pk,
+            )
+        else:
+            self.fields["drug"].limit_choices(Drug.objects.none(), scope="none")
 
         for field in self.fields.keys():
             self.fields[field].widget.attrs.update({"class": "form-control"})
@@ -113,22 +157,39 @@ class PublicationBaseForm(forms.ModelForm):
             "modification_date",
         )
 
+    authors: forms.MultipleChoiceField = forms.ModelMultipleChoiceField(
+        queryset=USER_MODEL.objects.only("username"),
+        widget=AsyncSelectMultiple("user_lookup"),
+    )
+    trials: forms.MultipleChoiceField = forms.ModelMultipleChoiceField(
+        queryset=ClinicalTrial.objects.only("title"),
+        widget=AsyncSelectMultiple("clinical_trial_lookup"),
+    )
+
 
 class PublicationCreationForm(PublicationBaseForm):
+    affiliation: CachedModelChoiceField = affiliation_choice_field()
+
     def __init__(self, *args, **kwargs):
         user: Type[User] = kwargs.pop("user", None)
         super(PublicationCreationForm, self).__init__(*args, **kwargs)
-        if user and user.userprofile.affiliation:
-            self.fields["affiliation"].initial = user.userprofile.affiliation
-            self.fields["affiliation"].widget.attrs["readonly"] = True
-            self.fields["affiliation"].widget.attrs["disabled"] = True
-            self.fields["affiliation"].required = False
+        affiliation: Optional[Affiliation] = user_affiliation(user)
+        limit_affiliation_choices(self.fields["affiliation"], affiliation)
+        self.fields["trials"].queryset = ClinicalTrial.objects.filter(
+            affiliation=affiliation
+        ).only("title")
 
         for field in self.fields.keys():
             self.fields[field].widget.attrs.update({"class": "form-control"})
 
 
 class PublicationUpdateForm(PublicationBaseForm):
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.fields["trials"].queryset = ClinicalTrial.objects.filter(
+            affiliation_id=self.instance.affiliation_id
+        ).only("title")
+
     class Meta:
         model: Type[Publication] = Publication
         exclude: Tuple[str, str, str] = (
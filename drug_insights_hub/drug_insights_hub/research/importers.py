@@ -0,0 +1,308 @@
+import csv
+import datetime
+import io
+import json
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Type,
+)
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.db import connection, models
+
+from drug_insights_hub.accounts.models import Affiliation
+from drug_insights_hub.core.signals import bulk_created
+from drug_insights_hub.research.models import ClinicalTrial, Drug, Publication
+
+USER_MODEL: Type[User] = get_user_model()
+
+IMPORT_BATCH_SIZE: int = 5000
+
+MANY_SEPARATOR: str = ";"
+
+# lookup name -> (model, natural key field)
+LOOKUPS: Dict[str, Tuple[Type[models.Model], str]] = {
+    "affiliation": (Affiliation, "name"),
+    "drug": (Drug, "proprietary_name"),
+    "user": (USER_MODEL, "username"),
+    "trial": (ClinicalTrial, "title"),
+}
+
+
+class ImportRowError(ValueError):
+    def __init__(self, line: int, message: str) -> None:
+        super().__init__(f"line {line}: {message}")
+        self.line: int = line
+
+
+class LookupMaps:
+    def __init__(self) -> None:
+        self._maps: Dict[str, Dict[str, int]] = {}
+
+    def resolve(self, name: str, value: str) -> int:
+        pk: Optional[int] = self._map(name).get(value)
+        if pk is None:
+            raise ValueError(f"unknown {name} {value!r}")
+        return pk
+
+    def register(self, name: str, instances: Iterable[models.Model]) -> None:
+        if name not in self._maps:
+            return
+        _, key = LOOKUPS[name]
+        self._maps[name].update(
+            (getattr(instance, key), instance.pk) for instance in instances
+        )
+
+    def _map(self, name: str) -> Dict[str, int]:
+        if name not in self._maps:
+            model, key = LOOKUPS[name]
+            self._maps[name] = dict(
+                model._default_manager.exclude(**{f"{key}__isnull": True})
+                .values_list(key, "pk")
+                .iterator(chunk_size=IMPORT_BATCH_SIZE)
+            )
+        return self._maps[name]
+
+
+class ImportSpec(NamedTuple):
+    model: Type[models.Model]
+    build: Callable[[Dict[str, Any], LookupMaps], models.Model]
+    # (many-to-many field, lookup name, input column)
+    many_to_many: Tuple[Tuple[str, str, str], ...]
+    lookup: str
+
+
+def build_drug(row: Dict[str, Any], lookups: LookupMaps) -> Drug:
+    return Drug(
+        proprietary_name=row.get("proprietary_name") or None,
+        international_non_proprietary_name=_required(
+            row, "international_non_proprietary_name"
+        ),
+        affiliated_institution_id=lookups.resolve(
+            "affiliation", _required(row, "affiliation")
+        ),
+        drug_type=_choice(row.get("drug_type") or None, Drug.CHOICES_TYPES),
+        development_status=_choice(
+            row.get("development_status") or "Preclinical",
+            Drug.CHOICES_DEVELOPMENT_STATUS,
+        ),
+        description=row.get("description") or "",
+    )
+
+
+def build_clinical_trial(row: Dict[str, Any], lookups: LookupMaps) -> ClinicalTrial:
+    trial: ClinicalTrial = ClinicalTrial(
+        title=_required(row, "title"),
+        drug_id=lookups.resolve("drug", _required(row, "drug")),
+        phase=_choice(_required(row, "phase"), ClinicalTrial.CHOICES_PHASE_STATUS),
+        affiliation_id=lookups.resolve("affiliation", _required(row, "affiliation")),
+        start_date=_date(_required(row, "start_date")),
+        end_date=_date(_required(row, "end_date")),
+        description=row.get("description") or "",
+    )
+    trial.clean()
+    return trial
+
+
+def build_publication(row: Dict[str, Any], lookups: LookupMaps) -> Publication:
+    return Publication(
+        title=_required(row, "title"),
+        affiliation_id=lookups.resolve("affiliation", _required(row, "affiliation")),
+        journal=_required(row, "journal"),
+    )
+
+
+IMPORT_SPECS: Dict[str, ImportSpec] = {
+    "drugs": ImportSpec(Drug, build_drug, many_to_many=(), lookup="drug"),
+    "clinical_trials": ImportSpec(
+        ClinicalTrial,
+        build_clinical_trial,
+        many_to_many=(("participants", "user", "participants"),),
+        lookup="trial",
+    ),
+    "publications": ImportSpec(
+        Publication,
+        build_publication,
+        many_to_many=(
+            ("authors", "user", "authors"),
+            ("trials", "trial", "trials"),
+        ),
+        lookup="",
+    ),
+}
+
+
+def read_rows(stream: io.TextIOBase, file_format: str) -> Iterator[Tuple[int, Dict]]:
+    if file_format == "csv":
+        reader: csv.DictReader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, row
+        return
+
+    for line, text in enumerate(stream, start=1):
+        if not text.strip():
+            continue
+        try:
+            row: Any = json.loads(text)
+        except ValueError as error:
+            raise ImportRowError(line, f"invalid JSON ({error})")
+        if not isinstance(row, dict):
+            raise ImportRowError(line, "expected a JSON object")
+        yield line, row
+
+
+def import_rows(
+    kind: str,
+    rows: Iterable[Tuple[int, Dict[str, Any]]],
+    batch_size: int = IMPORT_BATCH_SIZE,
+    lookups: Optional[LookupMaps] = None,
+    progress: Optional[Callable[[int], None]] = None,
+) -> int:
+    spec: ImportSpec = IMPORT_SPECS[kind]
+    lookups = lookups or LookupMaps()
+    imported: int = 0
+
+    instances: List[models.Model] = []
+    related: List[Dict[str, List[int]]] = []
+    for line, row in rows:
+        try:
+            instance: models.Model = spec.build(row, lookups)
+            _check_lengths(instance)
+            instances.append(instance)
+            related.append(_resolve_many(spec, row, lookups))
+        except ValidationError as error:
+            raise ImportRowError(line, " ".join(error.messages))
+        except (ValueError, TypeError) as error:
+            raise ImportRowError(line, str(error))
+
+        if len(instances) == batch_size:
+            imported += _flush(spec, instances, related, lookups)
+            instances, related = [], []
+            if progress is not None:
+                progress(imported)
+
+    imported += _flush(spec, instances, related, lookups)
+    return imported
+
+
+def insert_through_rows(
+    model: Type[models.Model], field_name: str, pairs: List[Tuple[int, int]]
+) -> None:
+    if not pairs:
+        return
+
+    field: models.ManyToManyField = model._meta.get_field(field_name)
+    through: Type[models.Model] = field.remote_field.through
+    source: str = through._meta.get_field(field.m2m_field_name()).attname
+    target: str = through._meta.get_field(field.m2m_reverse_field_name()).attname
+    pairs = list(dict.fromkeys(pairs))
+
+    if connection.vendor == "postgresql":
+        _copy_rows(through._meta.db_table, (source, target), pairs)
+    else:
+        through._default_manager.bulk_create(
+            (through(**{source: left, target: right}) for left, right in pairs),
+            batch_size=IMPORT_BATCH_SIZE,
+        )
+
+
+def _flush(
+    spec: ImportSpec,
+    instances: List[models.Model],
+    related: List[Dict[str, List[int]]],
+    lookups: LookupMaps,
+) -> int:
+    if not instances:
+        return 0
+
+    created: List[models.Model] = spec.model._default_manager.bulk_create(instances)
+    for field, _, _ in spec.many_to_many:
+        insert_through_rows(
+            spec.model,
+            field,
+            [
+                (instance.pk, target)
+                for instance, targets in zip(created, related)
+                for target in targets[field]
+            ],
+        )
+    if spec.lookup:
+        lookups.register(spec.lookup, created)
+    bulk_created.send(sender=spec.model, instances=created)
+    return len(created)
+
+
+def _copy_rows(
+    table: str, columns: Tuple[str, ...], rows: List[Tuple[int, int]]
+) -> None:
+    data: str = "".join("\t".join(str(value) for value in row) + "\n" for row in rows)
+    sql: str = "COPY %s (%s) FROM STDIN" % (
+        connection.ops.quote_name(table),
+        ", ".join(connection.ops.quote_name(column) for column in columns),
+    )
+    with connection.cursor() as cursor:
+        raw_cursor: Any = cursor.cursor
+        if hasattr(raw_cursor, "copy_expert"):
+            raw_cursor.copy_expert(sql, io.StringIO(data))
+        else:
+            with raw_cursor.copy(sql) as copy:
+                copy.write(data)
+
+
+def _resolve_many(
+    spec: ImportSpec, row: Dict[str, Any], lookups: LookupMaps
+) -> Dict[str, List[int]]:
+    return {
+        field: [lookups.resolve(lookup, name) for name in _many(row, column)]
+        for field, lookup, column in spec.many_to_many
+    }
+
+
+def _check_lengths(instance: models.Model) -> None:
+    # Checked per row: the database would reject the whole batch with a
+    # DataError that names no line, and SQLite does not check at all.
+    for field in instance._meta.concrete_fields:
+        value: Any = getattr(instance, field.attname)
+        if field.max_length is not None and isinstance(value, str):
+            if len(value) > field.max_length:
+                raise ValueError(
+                    f"{field.name} is longer than {field.max_length} characters"
+                )
+
+
+def _required(row: Dict[str, Any], column: str) -> str:
+    value: Any = row.get(column)
+    if value in (None, ""):
+        raise ValueError(f"missing {column}")
+    return value
+
+
+def _choice(value: Optional[str], choices: tuple) -> Optional[str]:
+    if value is not None and value not in dict(choices):
+        raise ValueError(f"invalid choice {value!r}")
+    return value
+
+
+def _date(value: Any) -> datetime.date:
+    if isinstance(value, datetime.date):
+        return value
+    return datetime.date.fromisoformat(value)
+
+
+def _many(row: Dict[str, Any], column: str) -> List[str]:
+    value: Any = row.get(column)
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = value.split(MANY_SEPARATOR)
+    return [str(item).strip() for item in value if str(item).strip()]
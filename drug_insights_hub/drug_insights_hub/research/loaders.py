@@ -0,0 +1,110 @@
+from functools import wraps
+from typing import Callable, Optional, Type
+
+from asgiref.sync import iscoroutinefunction
+from django.db import models
+from django.db.models import BooleanField, ExpressionWrapper, Q, QuerySet, Value
+from django.http import HttpRequest, HttpResponse
+
+from drug_insights_hub.accounts.models import Affiliation
+from drug_insights_hub.errors.exceptions import (
+    NoAffiliation,
+    ObjectNotFound,
+    WrongAffiliation,
+)
+from drug_insights_hub.research import object_cache
+
+
+def affiliated_object(
+    queryset: QuerySet | Type[models.Model],
+    affiliation_field: str,
+    not_found_message: str,
+    forbidden_message: str = "",
+    require_affiliation: bool = True,
+    cached: bool = False,
+) -> Callable:
+    # With ``cached`` the object comes from the object cache, which is shared
+    # between users, so is_affiliated is worked out in Python instead.
+    def lookup(request: HttpRequest, pk: int) -> QuerySet:
+        user_affiliation: Optional[Affiliation] = request.affiliation
+        is_affiliated: ExpressionWrapper | Value = (
+            Value(False)
+            if user_affiliation is None
+            else ExpressionWrapper(
+                Q(**{affiliation_field: user_affiliation}),
+                output_field=BooleanField(),
+            )
+        )
+        return (
+            _get_queryset(queryset)
+            .filter(pk=pk)
+            .annotate(is_affiliated=is_affiliated)
+        )
+
+    def mark_affiliated(
+        request: HttpRequest, obj: Optional[models.Model]
+    ) -> Optional[models.Model]:
+        if obj is not None:
+            attname: str = obj._meta.get_field(affiliation_field).attname
+            obj.is_affiliated = (
+                request.affiliation is not None
+                and getattr(obj, attname) == request.affiliation.pk
+            )
+        return obj
+
+    def load(request: HttpRequest, pk: int) -> Optional[models.Model]:
+        if cached:
+            return mark_affiliated(
+                request,
+                object_cache.get_object(
+                    _get_queryset(queryset), pk, getattr(request, "page_stamp", None)
+                ),
+            )
+        return lookup(request, pk).first()
+
+    async def aload(request: HttpRequest, pk: int) -> Optional[models.Model]:
+        if cached:
+            return mark_affiliated(
+                request,
+                await object_cache.aget_object(
+                    _get_queryset(queryset), pk, getattr(request, "page_stamp", None)
+                ),
+            )
+        return await lookup(request, pk).afirst()
+
+    def check(request: HttpRequest, obj: Optional[models.Model]) -> models.Model:
+        if obj is None:
+            raise ObjectNotFound(not_found_message)
+        if require_affiliation:
+            if request.affiliation is None:
+                raise NoAffiliation()
+            if not obj.is_affiliated:
+                raise WrongAffiliation(forbidden_message)
+        return obj
+
+    def decorator(view: Callable[..., HttpResponse]) -> Callable[..., HttpResponse]:
+        if iscoroutinefunction(view):
+
+            @wraps(view)
+            async def async_wrapper(
+                request: HttpRequest, pk: int, *args, **kwargs
+            ) -> HttpResponse:
+                obj: models.Model = check(request, await aload(request, pk))
+                return await view(request, obj, *args, **kwargs)
+
+            return async_wrapper
+
+        @wraps(view)
+        def wrapper(request: HttpRequest, pk: int, *args, **kwargs) -> HttpResponse:
+            obj: models.Model = check(request, load(request, pk))
+            return view(request, obj, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def _get_queryset(queryset: QuerySet | Type[models.Model]) -> QuerySet:
+    if isinstance(queryset, QuerySet):
+        return queryset.all()
+    return queryset._default_manager.all()
@@ -0,0 +1,122 @@
+import random
+import statistics
+import time
+from typing import Callable, Dict, List, Set
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import transaction
+from django.db.models import Q
+
+from drug_insights_hub.accounts.models import Affiliation
+from drug_insights_hub.research.autocomplete import DrugNameIndex
+from drug_insights_hub.research.models import Drug
+
+ONSETS: tuple = (
+    "b", "c", "d", "f", "g", "h", "k", "l", "m", "n", "p", "r", "s", "t", "v",
+    "z", "br", "cl", "pr", "st", "tr",
+)
+NUCLEI: tuple = ("a", "e", "i", "o", "u", "y")
+CODAS: tuple = ("", "n", "l", "x", "r", "m")
+SYLLABLES: tuple = tuple(
+    onset + nucleus + coda for onset in ONSETS for nucleus in NUCLEI for coda in CODAS
+)
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help: str = (
+        "Compare the in-process drug name index with an icontains query. "
+        "Synthetic drugs are inserted inside a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--drugs", type=int, default=100_000)
+        parser.add_argument("--queries", type=int, default=200)
+        parser.add_argument("--limit", type=int, default=10)
+        parser.add_argument("--seed", type=int, default=1)
+
+    def handle(self, *args, **options) -> None:
+        generator: random.Random = random.Random(options["seed"])
+        try:
+            with transaction.atomic():
+                names: List[str] = self._seed(generator, options["drugs"])
+                self._run(generator, names, options["queries"], options["limit"])
+                raise Rollback
+        except Rollback:
+            pass
+
+    def _seed(self, generator: random.Random, amount: int) -> List[str]:
+        affiliation: Affiliation = Affiliation.objects.create(
+            name="Autocomplete benchmark",
+            location="-",
+            description="-",
+            website="https://example.com",
+        )
+        names: Set[str] = set()
+        while len(names) < amount:
+            names.add("".join(generator.choices(SYLLABLES, k=generator.randint(2, 4))))
+        Drug.objects.bulk_create(
+            (
+                Drug(
+                    proprietary_name=name.capitalize(),
+                    international_non_proprietary_name=name[::-1],
+                    affiliated_institution=affiliation,
+                    description="-",
+                )
+                for name in sorted(names)
+            ),
+            batch_size=5000,
+        )
+        return sorted(names)
+
+    def _run(
+        self, generator: random.Random, names: List[str], amount: int, limit: int
+    ) -> None:
+        index: DrugNameIndex = DrugNameIndex()
+        started: float = time.perf_counter()
+        index.build()
+        self.stdout.write(
+            f"Index built over {len(names)} drugs in "
+            f"{(time.perf_counter() - started) * 1000:.0f} ms"
+        )
+
+        queries: Dict[str, List[str]] = {
+            "prefix": [generator.choice(names)[:4] for _ in range(amount)],
+            "misspelled": [
+                self._misspell(generator, generator.choice(names))
+                for _ in range(amount)
+            ],
+        }
+        approaches: Dict[str, Callable[[str], list]] = {
+            "index": lambda query: index.search(query, limit=limit),
+            "icontains": lambda query: list(
+                Drug.objects.filter(
+                    Q(proprietary_name__icontains=query)
+                    | Q(international_non_proprietary_name__icontains=query)
+                ).values_list("pk", "proprietary_name")[:limit]
+            ),
+        }
+
+        for kind, terms in queries.items():
+            for approach, run in approaches.items():
+                timings: List[float] = []
+                found: int = 0
+                for term in terms:
+                    started = time.perf_counter()
+                    found += bool(run(term))
+                    timings.append((time.perf_counter() - started) * 1000)
+                timings.sort()
+                self.stdout.write(
+                    f"{kind:<10} {approach:<10} "
+                    f"median {statistics.median(timings):7.2f} ms  "
+                    f"p95 {timings[int(len(timings) * 0.95) - 1]:7.2f} ms  "
+                    f"hit rate {found / len(terms):.0%}"
+                )
+
+    def _misspell(self, generator: random.Random, name: str) -> str:
+        position: int = generator.randrange(1, len(name) - 1)
+        swapped: str = name[position + 1] + name[position]
+        return name[:position] + swapped + name[position + 2 :]
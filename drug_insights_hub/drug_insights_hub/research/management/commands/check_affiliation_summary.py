@@ -0,0 +1,37 @@
+from typing import Dict, Tuple
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from drug_insights_hub.research import summary
+
+
+class Command(BaseCommand):
+    help: str = (
+        "Compare the per-affiliation dashboard summary with the source tables "
+        "and report every count that differs."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--fix", action="store_true", help="Rebuild the summary if it differs."
+        )
+
+    def handle(self, *args, **options) -> None:
+        differences: Dict[summary.SummaryKey, Tuple[int, int]] = (
+            summary.find_inconsistencies()
+        )
+        if not differences:
+            self.stdout.write(self.style.SUCCESS("Affiliation summary is consistent."))
+            return
+
+        for (affiliation_id, dimension, key), (stored, expected) in differences.items():
+            self.stdout.write(
+                f"affiliation {affiliation_id} {dimension} {key!r}: "
+                f"stored {stored}, expected {expected}"
+            )
+
+        if options["fix"]:
+            summary.rebuild()
+            self.stdout.write(self.style.SUCCESS("Affiliation summary rebuilt."))
+            return
+        raise CommandError(f"{len(differences)} summary counts are inconsistent.")
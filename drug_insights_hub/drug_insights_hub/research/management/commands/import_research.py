@@ -0,0 +1,65 @@
+import os
+import time
+from typing import Optional
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import DataError, IntegrityError, transaction
+
+from drug_insights_hub.research import importers
+
+
+class Command(BaseCommand):
+    help: str = (
+        "Import drugs, clinical trials or publications from a CSV or JSONL file. "
+        "Many-to-many columns hold usernames or trial titles separated by ';' "
+        "in CSV, or lists in JSONL."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("kind", choices=sorted(importers.IMPORT_SPECS))
+        parser.add_argument("path")
+        parser.add_argument("--format", choices=("csv", "jsonl"))
+        parser.add_argument(
+            "--batch-size", type=int, default=importers.IMPORT_BATCH_SIZE
+        )
+
+    def handle(self, *args, **options) -> None:
+        self.verbosity: int = options["verbosity"]
+        file_format: Optional[str] = options["format"] or self._guess_format(
+            options["path"]
+        )
+
+        started: float = time.perf_counter()
+        try:
+            with open(options["path"], newline="", encoding="utf-8") as stream:
+                with transaction.atomic():
+                    imported: int = importers.import_rows(
+                        options["kind"],
+                        importers.read_rows(stream, file_format),
+                        batch_size=options["batch_size"],
+                        progress=self._report_progress,
+                    )
+        except OSError as error:
+            raise CommandError(str(error))
+        except (importers.ImportRowError, IntegrityError, DataError) as error:
+            raise CommandError(f"Import aborted, nothing was saved: {error}")
+        elapsed: float = time.perf_counter() - started
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {imported} {options['kind']} in {elapsed:.2f}s "
+                f"({imported / max(elapsed, 1e-9):.0f} rows/sec)."
+            )
+        )
+
+    def _guess_format(self, path: str) -> str:
+        extension: str = os.path.splitext(path)[1].lower()
+        if extension == ".csv":
+            return "csv"
+        if extension in (".jsonl", ".ndjson"):
+            return "jsonl"
+        raise CommandError("Cannot infer the file format, pass --format.")
+
+    def _report_progress(self, imported: int) -> None:
+        if self.verbosity > 1:
+            self.stdout.write(f"{imported} rows imported...")
@@ -0,0 +1,33 @@
+from typing import Dict, Tuple
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from drug_insights_hub.research.object_cache import object_cache_stats
+
+
+class Command(BaseCommand):
+    help: str = "Report hit and miss counts of the detail-page object cache."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--reset", action="store_true", help="Clear the counters after reporting."
+        )
+
+    def handle(self, *args, **options) -> None:
+        stats: Dict[str, Tuple[int, int]] = object_cache_stats.read()
+        total_hits: int = sum(hits for hits, _ in stats.values())
+        total_lookups: int = sum(hits + misses for hits, misses in stats.values())
+
+        for label, (hits, misses) in stats.items():
+            self.stdout.write(
+                f"{label}: {hits} hits, {misses} misses, "
+                f"hit ratio {self.ratio(hits, hits + misses)}"
+            )
+        self.stdout.write(f"total: hit ratio {self.ratio(total_hits, total_lookups)}")
+
+        if options["reset"]:
+            object_cache_stats.reset()
+            self.stdout.write(self.style.SUCCESS("Object cache counters reset."))
+
+    def ratio(self, hits: int, lookups: int) -> str:
+        return f"{hits / lookups:.1%}" if lookups else "n/a"
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from drug_insights_hub.research import summary
+
+
+class Command(BaseCommand):
+    help: str = "Recompute the per-affiliation dashboard summary from source tables."
+
+    def handle(self, *args, **options) -> None:
+        rows: int = summary.rebuild()
+        self.stdout.write(
+            self.style.SUCCESS(f"Affiliation summary rebuilt ({rows} rows).")
+        )
@@ -0,0 +1,15 @@
+from typing import Dict
+
+from django.core.management.base import BaseCommand
+
+from drug_insights_hub.research import search
+
+
+class Command(BaseCommand):
+    help: str = "Rebuild the full-text search entries for all research models."
+
+    def handle(self, *args, **options) -> None:
+        indexed: Dict[str, int] = search.rebuild()
+        for kind, count in indexed.items():
+            self.stdout.write(f"{kind}: {count}")
+        self.stdout.write(self.style.SUCCESS("Search index rebuilt."))
@@ -0,0 +1,111 @@
+import multiprocessing
+import time
+from collections import Counter
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from typing import Dict, List
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import IntegrityError, connection, connections
+
+from drug_insights_hub.accounts.models import Affiliation
+from drug_insights_hub.core import counters
+from drug_insights_hub.research import seeding
+
+
+class Command(BaseCommand):
+    help: str = (
+        "Generate deterministic synthetic affiliations, users with profiles, "
+        "drugs, clinical trials and publications. Sizes are per affiliation, "
+        "and affiliations are split between --workers processes."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--affiliations", type=int, default=10)
+        parser.add_argument("--users", type=int, default=1000)
+        parser.add_argument("--drugs", type=int, default=50)
+        parser.add_argument("--trials", type=int, default=20)
+        parser.add_argument("--publications", type=int, default=40)
+        for name, default in (
+            ("--participants", (20, 300)),
+            ("--authors", (1, 8)),
+            ("--publication-trials", (0, 3)),
+        ):
+            parser.add_argument(
+                name, type=int, nargs=2, default=default, metavar=("MIN", "MAX")
+            )
+        parser.add_argument("--seed", type=int, default=1)
+        parser.add_argument("--prefix", default="seed")
+        parser.add_argument("--workers", type=int, default=1)
+
+    def handle(self, *args, **options) -> None:
+        workers: int = max(1, options["workers"])
+        if workers > 1 and connection.vendor == "sqlite":
+            raise CommandError("SQLite takes one writer at a time, use --workers 1.")
+        sizes: seeding.SeedSizes = seeding.SeedSizes(
+            users=options["users"],
+            drugs=options["drugs"],
+            clinical_trials=options["trials"],
+            publications=options["publications"],
+            participants=tuple(options["participants"]),
+            authors=tuple(options["authors"]),
+            publication_trials=tuple(options["publication_trials"]),
+        )
+
+        started: float = time.perf_counter()
+        try:
+            affiliations: List[Affiliation] = seeding.create_affiliations(
+                options["affiliations"], prefix=options["prefix"]
+            )
+        except IntegrityError:
+            raise CommandError(
+                f"Affiliations prefixed {options['prefix']!r} exist, pick another "
+                "--prefix."
+            )
+        chunks: List[Dict[int, int]] = [{} for _ in range(workers)]
+        for number, affiliation in enumerate(affiliations):
+            chunks[number % workers][affiliation.pk] = number
+
+        if workers == 1:
+            deltas: Counter = seeding.seed_affiliations(
+                chunks[0], sizes, seed=options["seed"], prefix=options["prefix"]
+            )
+        else:
+            deltas = self._run_in_processes(chunks, sizes, options)
+        counters.apply(deltas)
+
+        elapsed: float = time.perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Seeded {len(affiliations)} affiliations with "
+                f"{len(affiliations) * sizes.users} users in {elapsed:.2f}s."
+            )
+        )
+
+    def _run_in_processes(
+        self, chunks: List[Dict[int, int]], sizes: seeding.SeedSizes, options: dict
+    ) -> Counter:
+        # Forked children inherit the configured Django; they must not inherit
+        # an open connection.
+        connections.close_all()
+        deltas: Counter = Counter()
+        with ProcessPoolExecutor(
+            max_workers=len(chunks), mp_context=multiprocessing.get_context("fork")
+        ) as executor:
+            futures: Dict[Future, int] = {
+                executor.submit(
+                    seeding.seed_affiliations,
+                    chunk,
+                    sizes,
+                    seed=options["seed"],
+                    prefix=options["prefix"],
+                ): len(chunk)
+                for chunk in chunks
+                if chunk
+            }
+            done: int = 0
+            for future in as_completed(futures):
+                deltas.update(future.result())
+                done += futures[future]
+                if options["verbosity"] > 1:
+                    self.stdout.write(f"{done} affiliations seeded")
+        return deltas
@@ -0,0 +1,74 @@
+# Generated by Django 5.0.3 on 2026-10-18 10:40
+
+import django.contrib.postgres.search
+from django.db import migrations, models
+
+FTS_TABLE = "research_searchentry_fts"
+
+
+def create_search_structures(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        schema_editor.execute(
+            "CREATE INDEX research_searchentry_vector_gin "
+            "ON research_searchentry USING gin (vector)"
+        )
+    elif vendor == "sqlite":
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5("
+            "title, body, content='research_searchentry', content_rowid='id', "
+            "tokenize='porter unicode61')"
+        )
+        schema_editor.execute(
+            f"CREATE TRIGGER {FTS_TABLE}_ai AFTER INSERT ON research_searchentry "
+            f"BEGIN INSERT INTO {FTS_TABLE}(rowid, title, body) "
+            "VALUES (new.id, new.title, new.body); END"
+        )
+        schema_editor.execute(
+            f"CREATE TRIGGER {FTS_TABLE}_ad AFTER DELETE ON research_searchentry "
+            f"BEGIN INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, body) "
+            "VALUES ('delete', old.id, old.title, old.body); END"
+        )
+        schema_editor.execute(
+            f"CREATE TRIGGER {FTS_TABLE}_au AFTER UPDATE ON research_searchentry "
+            f"BEGIN INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, body) "
+            "VALUES ('delete', old.id, old.title, old.body); "
+            f"INSERT INTO {FTS_TABLE}(rowid, title, body) "
+            "VALUES (new.id, new.title, new.body); END"
+        )
+
+
+def drop_search_structures(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        schema_editor.execute("DROP INDEX IF EXISTS research_searchentry_vector_gin")
+    elif vendor == "sqlite":
+        for suffix in ("ai", "ad", "au"):
+            schema_editor.execute(f"DROP TRIGGER IF EXISTS {FTS_TABLE}_{suffix}")
+        schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('research', '0003_alter_publication_title'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('drug', 'Drug'), ('clinical_trial', 'Clinical trial'), ('publication', 'Publication')], max_length=20)),
+                ('object_id', models.BigIntegerField()),
+                ('title', models.CharField(max_length=255)),
+                ('body', models.TextField(blank=True)),
+                ('vector', django.contrib.postgres.search.SearchVectorField(editable=False, null=True)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='searchentry',
+            constraint=models.UniqueConstraint(fields=('kind', 'object_id'), name='research_searchentry_object'),
+        ),
+        migrations.RunPython(create_search_structures, drop_search_structures),
+    ]
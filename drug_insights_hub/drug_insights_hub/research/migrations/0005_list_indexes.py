@@ -0,0 +1,32 @@
+# Generated by Django 5.0.3 on 2026-10-18 10:55
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+        ('research', '0004_searchentry'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='clinicaltrial',
+            index=models.Index(fields=['affiliation', 'title', 'id'], name='trial_affiliation_title_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='drug',
+            index=models.Index(fields=['affiliated_institution', 'proprietary_name', 'id'], name='drug_affiliation_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='publication',
+            index=models.Index(fields=['affiliation', 'title', 'id'], name='publication_affil_title_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='publication',
+            index=models.Index(fields=['publication_date', 'id'], name='publication_date_idx'),
+        ),
+    ]
@@ -0,0 +1,70 @@
+# Generated by Django 5.0.3 on 2026-10-18 10:56
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+
+SUMMARIZED_FIELDS = (
+    (
+        "research.Drug",
+        "affiliated_institution_id",
+        (
+            ("drug_development_status", "development_status"),
+            ("drug_type", "drug_type"),
+        ),
+    ),
+    (
+        "research.ClinicalTrial",
+        "affiliation_id",
+        (("trial_phase", "phase"), ("trial_end_date", "end_date")),
+    ),
+    ("research.Publication", "affiliation_id", (("publication_journal", "journal"),)),
+)
+
+
+def populate_summary(apps, schema_editor):
+    AffiliationSummary = apps.get_model("research", "AffiliationSummary")
+    rows = []
+    for label, affiliation_field, dimensions in SUMMARIZED_FIELDS:
+        model = apps.get_model(label)
+        for dimension, field in dimensions:
+            for affiliation_id, value, count in (
+                model._default_manager.order_by()
+                .values_list(affiliation_field, field)
+                .annotate(count=Count("pk"))
+            ):
+                rows.append(
+                    AffiliationSummary(
+                        affiliation_id=affiliation_id,
+                        dimension=dimension,
+                        key="" if value is None else str(value),
+                        count=count,
+                    )
+                )
+    AffiliationSummary.objects.bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+        ('research', '0005_list_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AffiliationSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('dimension', models.CharField(choices=[('drug_development_status', 'Drugs by development status'), ('drug_type', 'Drugs by type'), ('trial_phase', 'Clinical trials by phase'), ('trial_end_date', 'Clinical trials by end date'), ('publication_journal', 'Publications by journal')], max_length=30)),
+                ('key', models.CharField(blank=True, max_length=100)),
+                ('count', models.BigIntegerField(default=0)),
+                ('affiliation', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='accounts.affiliation')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='affiliationsummary',
+            constraint=models.UniqueConstraint(fields=('affiliation', 'dimension', 'key'), name='research_affiliationsummary_key'),
+        ),
+        migrations.RunPython(populate_summary, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.0.3 on 2026-10-18 10:58
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def create_period_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(
+            "CREATE INDEX research_clinicaltrial_period_gist ON research_clinicaltrial "
+            "USING gist (daterange(start_date, end_date, '[]'))"
+        )
+
+
+def drop_period_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute("DROP INDEX IF EXISTS research_clinicaltrial_period_gist")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+        ('research', '0006_affiliationsummary'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='clinicaltrial',
+            index=models.Index(fields=['start_date', 'end_date'], name='trial_start_end_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='clinicaltrial',
+            index=models.Index(fields=['end_date', 'start_date'], name='trial_end_start_idx'),
+        ),
+        migrations.RunPython(create_period_index, drop_period_index),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.0.3 on 2026-10-18 11:17
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+        ('research', '0007_trial_interval_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='clinicaltrial',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='drug',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='publication',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddIndex(
+            model_name='clinicaltrial',
+            index=models.Index(fields=['affiliation', 'updated_at'], name='trial_affiliation_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='drug',
+            index=models.Index(fields=['affiliated_institution', 'updated_at'], name='drug_affiliation_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='publication',
+            index=models.Index(fields=['affiliation', 'updated_at'], name='publication_affil_updated_idx'),
+        ),
+    ]
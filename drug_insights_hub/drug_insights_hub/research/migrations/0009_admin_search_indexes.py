@@ -0,0 +1,43 @@
+# Generated by Django 5.0.3 on 2026-10-18 11:52
+
+from django.db import migrations
+
+# index -> (table, column) searched with icontains, which PostgreSQL runs as
+# UPPER(column::text) LIKE UPPER('%term%'). pg_trgm comes from accounts 0002.
+SEARCH_INDEXES = {
+    "research_drug_name_trgm": ("research_drug", "proprietary_name"),
+    "research_drug_inn_trgm": (
+        "research_drug",
+        "international_non_proprietary_name",
+    ),
+    "research_clinicaltrial_title_trgm": ("research_clinicaltrial", "title"),
+    "research_publication_title_trgm": ("research_publication", "title"),
+    "research_publication_journal_trgm": ("research_publication", "journal"),
+}
+
+
+def create_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        for name, (table, column) in SEARCH_INDEXES.items():
+            schema_editor.execute(
+                f"CREATE INDEX {name} ON {table} "
+                f"USING gin (UPPER({column}::text) gin_trgm_ops)"
+            )
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        for name in SEARCH_INDEXES:
+            schema_editor.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_admin_search_indexes'),
+        ('research', '0008_updated_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
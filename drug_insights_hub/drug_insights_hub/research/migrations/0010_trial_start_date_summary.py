@@ -0,0 +1,46 @@
+# Generated by Django 5.0.3 on 2026-10-18 12:04
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def populate_start_dates(apps, schema_editor):
+    AffiliationSummary = apps.get_model("research", "AffiliationSummary")
+    ClinicalTrial = apps.get_model("research", "ClinicalTrial")
+    AffiliationSummary.objects.bulk_create(
+        (
+            AffiliationSummary(
+                affiliation_id=affiliation_id,
+                dimension="trial_start_date",
+                key=start_date.isoformat(),
+                count=count,
+            )
+            for affiliation_id, start_date, count in (
+                ClinicalTrial.objects.order_by()
+                .values_list("affiliation_id", "start_date")
+                .annotate(count=Count("pk"))
+            )
+        ),
+        batch_size=1000,
+    )
+
+
+def remove_start_dates(apps, schema_editor):
+    AffiliationSummary = apps.get_model("research", "AffiliationSummary")
+    AffiliationSummary.objects.filter(dimension="trial_start_date").delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('research', '0009_admin_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='affiliationsummary',
+            name='dimension',
+            field=models.CharField(choices=[('drug_development_status', 'Drugs by development status'), ('drug_type', 'Drugs by type'), ('trial_phase', 'Clinical trials by phase'), ('trial_start_date', 'Clinical trials by start date'), ('trial_end_date', 'Clinical trials by end date'), ('publication_journal', 'Publications by journal')], max_length=30),
+        ),
+        migrations.RunPython(populate_start_dates, remove_start_dates),
+    ]
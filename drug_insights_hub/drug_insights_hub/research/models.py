@@ -1,15 +1,83 @@
-from typing import Type
+import datetime
+from typing import Dict, Tuple, Type
 
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import User
+from django.contrib.postgres.fields import DateRangeField
+from django.contrib.postgres.search import SearchVectorField
 from django.core.exceptions import ValidationError
-from django.db import models
+from django.db import connections, models
+from django.db.backends.postgresql.psycopg_any import DateRange
 
 from drug_insights_hub.accounts.models import Affiliation
 
 USER_MODEL: Type[User] = get_user_model()
 
 
+def participant_names() -> models.QuerySet:
+    return USER_MODEL.objects.only("first_name", "last_name")
+
+
+class DrugQuerySet(models.QuerySet):
+    def with_related(self) -> "DrugQuerySet":
+        return self.select_related("affiliated_institution").defer(
+            "affiliated_institution__location",
+            "affiliated_institution__description",
+            "affiliated_institution__website",
+        )
+
+
+class TrialPeriod(models.Func):
+    # Matches the expression of the research_clinicaltrial_period_gist index.
+    function: str = "daterange"
+    template: str = "%(function)s(%(expressions)s, '[]')"
+    output_field: DateRangeField = DateRangeField()
+
+
+class ClinicalTrialQuerySet(models.QuerySet):
+    def active_on(self, day: datetime.date) -> "ClinicalTrialQuerySet":
+        return self.active_between(day, day)
+
+    def active_between(
+        self, start: datetime.date, end: datetime.date
+    ) -> "ClinicalTrialQuerySet":
+        if connections[self.db].vendor == "postgresql":
+            return self.alias(period=TrialPeriod("start_date", "end_date")).filter(
+                period__overlap=DateRange(start, end, "[]")
+            )
+        return self.filter(start_date__lte=end, end_date__gte=start)
+
+    def with_related(self) -> "ClinicalTrialQuerySet":
+        return (
+            self.select_related("drug", "affiliation")
+            .only(
+                *(field.name for field in ClinicalTrial._meta.concrete_fields),
+                "drug__proprietary_name",
+                "affiliation__name",
+            )
+            .prefetch_related(
+                models.Prefetch("participants", queryset=participant_names())
+            )
+        )
+
+
+class PublicationQuerySet(models.QuerySet):
+    def with_related(self) -> "PublicationQuerySet":
+        return (
+            self.select_related("affiliation")
+            .only(
+                *(field.name for field in Publication._meta.concrete_fields),
+                "affiliation__name",
+            )
+            .prefetch_related(
+                models.Prefetch("authors", queryset=participant_names()),
+                models.Prefetch(
+                    "trials", queryset=ClinicalTrial.objects.only("title")
+                ),
+            )
+        )
+
+
 class Drug(models.Model):
     MAX_PROPRIETARY_NAME_LENGTH: int = 50
 
@@ -58,6 +126,22 @@ class Drug(models.Model):
         default="Preclinical",
     )
     description: models.TextField = models.TextField()
+    # Also touched when anything shown on the drug's pages changes.
+    updated_at: models.DateTimeField = models.DateTimeField(auto_now=True)
+
+    objects: DrugQuerySet = DrugQuerySet.as_manager()
+
+    class Meta:
+        indexes: list = [
+            models.Index(
+                fields=("affiliated_institution", "proprietary_name", "id"),
+                name="drug_affiliation_name_idx",
+            ),
+            models.Index(
+                fields=("affiliated_institution", "updated_at"),
+                name="drug_affiliation_updated_idx",
+            ),
+        ]
 
     def __str__(self) -> str:
         return self.proprietary_name
@@ -87,6 +171,25 @@ class ClinicalTrial(models.Model):
     start_date: models.DateField = models.DateField()
     end_date: models.DateField = models.DateField()
     description: models.TextField = models.TextField()
+    # Also touched on participant changes and when the drug or a participant's
+    # name changes.
+    updated_at: models.DateTimeField = models.DateTimeField(auto_now=True)
+
+    objects: ClinicalTrialQuerySet = ClinicalTrialQuerySet.as_manager()
+
+    class Meta:
+        indexes: list = [
+            models.Index(
+                fields=("affiliation", "title", "id"),
+                name="trial_affiliation_title_idx",
+            ),
+            models.Index(fields=("start_date", "end_date"), name="trial_start_end_idx"),
+            models.Index(fields=("end_date", "start_date"), name="trial_end_start_idx"),
+            models.Index(
+                fields=("affiliation", "updated_at"),
+                name="trial_affiliation_updated_idx",
+            ),
+        ]
 
     def clean(self) -> None:
         super().clean()
@@ -116,6 +219,109 @@ class Publication(models.Model):
     publication_date: models.DateField = models.DateField(auto_now_add=True)
     modification_date: models.DateField = models.DateField(auto_now=True)
     journal: models.CharField = models.CharField(max_length=MAX_JOURNAL_LENGTH)
+    # Also touched on author and trial changes and when their names change.
+    updated_at: models.DateTimeField = models.DateTimeField(auto_now=True)
+
+    objects: PublicationQuerySet = PublicationQuerySet.as_manager()
+
+    class Meta:
+        indexes: list = [
+            models.Index(
+                fields=("affiliation", "title", "id"),
+                name="publication_affil_title_idx",
+            ),
+            models.Index(
+                fields=("publication_date", "id"), name="publication_date_idx"
+            ),
+            models.Index(
+                fields=("affiliation", "updated_at"),
+                name="publication_affil_updated_idx",
+            ),
+        ]
 
     def __str__(self) -> str:
         return self.title
+
+
+# Pages of the dependent objects show fields of the changed model:
+# changed model -> ((dependent model, field pointing at the changed model), ...)
+PageDependents = Dict[Type[models.Model], Tuple[Tuple[Type[models.Model], str], ...]]
+
+PAGE_DEPENDENTS: PageDependents = {
+    Drug: ((ClinicalTrial, "drug"),),
+    ClinicalTrial: ((Publication, "trials"),),
+    USER_MODEL: ((ClinicalTrial, "participants"), (Publication, "authors")),
+}
+
+# The fields of the changed model those pages show; changes to other fields
+# leave the dependents alone. The affiliation's name is on the pages of all its
+# objects, which are invalidated through the affiliation's version instead.
+PAGE_DEPENDENT_FIELDS: Dict[Type[models.Model], Tuple[str, ...]] = {
+    Drug: ("proprietary_name",),
+    ClinicalTrial: ("title",),
+    USER_MODEL: ("first_name", "last_name"),
+    Affiliation: ("name",),
+}
+
+
+class SearchEntry(models.Model):
+    MAX_KIND_LENGTH: int = 20
+    CHOICES_KINDS: tuple = (
+        ("drug", "Drug"),
+        ("clinical_trial", "Clinical trial"),
+        ("publication", "Publication"),
+    )
+
+    MAX_TITLE_LENGTH: int = 255
+
+    kind: models.CharField = models.CharField(
+        max_length=MAX_KIND_LENGTH, choices=CHOICES_KINDS
+    )
+    object_id: models.BigIntegerField = models.BigIntegerField()
+    title: models.CharField = models.CharField(max_length=MAX_TITLE_LENGTH)
+    body: models.TextField = models.TextField(blank=True)
+    vector: SearchVectorField = SearchVectorField(null=True, editable=False)
+
+    class Meta:
+        constraints: list = [
+            models.UniqueConstraint(
+                fields=("kind", "object_id"), name="research_searchentry_object"
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.kind}: {self.title}"
+
+
+class AffiliationSummary(models.Model):
+    MAX_DIMENSION_LENGTH: int = 30
+    CHOICES_DIMENSIONS: tuple = (
+        ("drug_development_status", "Drugs by development status"),
+        ("drug_type", "Drugs by type"),
+        ("trial_phase", "Clinical trials by phase"),
+        ("trial_start_date", "Clinical trials by start date"),
+        ("trial_end_date", "Clinical trials by end date"),
+        ("publication_journal", "Publications by journal"),
+    )
+
+    MAX_KEY_LENGTH: int = 100
+
+    affiliation: Type[Affiliation] = models.ForeignKey(
+        Affiliation, on_delete=models.CASCADE
+    )
+    dimension: models.CharField = models.CharField(
+        max_length=MAX_DIMENSION_LENGTH, choices=CHOICES_DIMENSIONS
+    )
+    key: models.CharField = models.CharField(max_length=MAX_KEY_LENGTH, blank=True)
+    count: models.BigIntegerField = models.BigIntegerField(default=0)
+
+    class Meta:
+        constraints: list = [
+            models.UniqueConstraint(
+                fields=("affiliation", "dimension", "key"),
+                name="research_affiliationsummary_key",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.affiliation_id} {self.dimension} {self.key}: {self.count}"
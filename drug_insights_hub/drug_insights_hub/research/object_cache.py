@@ -0,0 +1,147 @@
+import datetime
+import threading
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple, Type
+
+from asgiref.sync import sync_to_async
+from django.core.cache import caches
+from django.db import models, transaction
+from django.db.models import QuerySet
+
+from drug_insights_hub.core.cache import VERSION_CACHE_ALIAS, bump_version, get_version
+from drug_insights_hub.research import conditional
+from drug_insights_hub.research.models import (
+    PAGE_DEPENDENTS,
+    ClinicalTrial,
+    Drug,
+    Publication,
+)
+
+OBJECT_CACHE_ALIAS: str = "objects"
+OBJECT_CACHE_TIMEOUT: int = 60 * 60 * 24
+CACHED_MODELS: Tuple[Type[models.Model], ...] = (Drug, ClinicalTrial, Publication)
+STATS_KINDS: Tuple[str, str] = ("hits", "misses")
+OBJECT_NAMESPACE: str = "object"
+
+
+def object_namespace(model: Type[models.Model], pk: object) -> str:
+    return f"{OBJECT_NAMESPACE}:{model._meta.label_lower}:{pk}"
+
+
+class ObjectCacheStats:
+    # Counts are kept per process and added to the versions cache, which every
+    # worker and the object_cache_stats command share, when a request ends.
+
+    def __init__(self) -> None:
+        self.pending: Counter = Counter()
+        self.lock: threading.Lock = threading.Lock()
+
+    def record(self, model: Type[models.Model], hit: bool) -> None:
+        with self.lock:
+            self.pending[(model._meta.label_lower, "hits" if hit else "misses")] += 1
+
+    def flush(self) -> None:
+        with self.lock:
+            pending, self.pending = self.pending, Counter()
+        self._store(pending)
+
+    def read(self) -> Dict[str, Tuple[int, int]]:
+        cache = caches[VERSION_CACHE_ALIAS]
+        labels: List[str] = [model._meta.label_lower for model in CACHED_MODELS]
+        stored: Dict[str, int] = cache.get_many(
+            [self._key(label, kind) for label in labels for kind in STATS_KINDS]
+        )
+        return {
+            label: (
+                stored.get(self._key(label, "hits"), 0),
+                stored.get(self._key(label, "misses"), 0),
+            )
+            for label in labels
+        }
+
+    def reset(self) -> None:
+        with self.lock:
+            self.pending.clear()
+        caches[VERSION_CACHE_ALIAS].delete_many(
+            [
+                self._key(model._meta.label_lower, kind)
+                for model in CACHED_MODELS
+                for kind in STATS_KINDS
+            ]
+        )
+
+    def _store(self, pending: Counter) -> None:
+        cache = caches[VERSION_CACHE_ALIAS]
+        for (label, kind), count in pending.items():
+            key: str = self._key(label, kind)
+            if not cache.add(key, count, timeout=None):
+                try:
+                    cache.incr(key, count)
+                except ValueError:
+                    cache.set(key, count, timeout=None)
+
+    def _key(self, label: str, kind: str) -> str:
+        return f"object_stats:{label}:{kind}"
+
+
+object_cache_stats: ObjectCacheStats = ObjectCacheStats()
+
+
+def get_object(
+    queryset: QuerySet, pk: int, stamp: Optional[str] = None
+) -> Optional[models.Model]:
+    # The page stamp, the row's updated_at and its affiliation's version, goes
+    # into the key. Object versions are bumped only in the process that saved
+    # the change, but updated_at is touched in the same transaction and the
+    # affiliation's version is shared, so other processes miss the stale entry
+    # too. Detail views pass the stamp they read for their validators.
+    model: Type[models.Model] = queryset.model
+    if stamp is None:
+        state: Optional[Tuple[datetime.datetime, int]] = conditional.page_state(
+            model, pk
+        )
+        if state is None:
+            return None
+        stamp = conditional.page_stamp(*state)
+
+    cache = caches[OBJECT_CACHE_ALIAS]
+    namespace: str = object_namespace(model, pk)
+    version: int = get_version(namespace, using=OBJECT_CACHE_ALIAS)
+    key: str = f"{namespace}:{version}:{stamp}"
+
+    obj: Optional[models.Model] = cache.get(key)
+    object_cache_stats.record(model, hit=obj is not None)
+    if obj is None:
+        obj = queryset.filter(pk=pk).first()
+        if obj is not None:
+            cache.set(key, obj, OBJECT_CACHE_TIMEOUT)
+    return obj
+
+
+async def aget_object(
+    queryset: QuerySet, pk: int, stamp: Optional[str] = None
+) -> Optional[models.Model]:
+    return await sync_to_async(get_object)(queryset, pk, stamp)
+
+
+def invalidate(model: Type[models.Model], pks: Iterable[object]) -> None:
+    # Bump after commit; bumping earlier would let a concurrent reader cache the
+    # pre-commit row under the new version.
+    namespaces: List[str] = [object_namespace(model, pk) for pk in pks]
+    if namespaces:
+        transaction.on_commit(lambda: _bump(namespaces))
+
+
+def invalidate_dependents(model: Type[models.Model], pk: object) -> None:
+    for dependent, field in PAGE_DEPENDENTS.get(model, ()):
+        invalidate(
+            dependent,
+            dependent._default_manager.filter(**{field: pk}).values_list(
+                "pk", flat=True
+            ),
+        )
+
+
+def _bump(namespaces: List[str]) -> None:
+    for namespace in namespaces:
+        bump_version(namespace, using=OBJECT_CACHE_ALIAS)
@@ -0,0 +1,135 @@
+from itertools import islice
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Sequence,
+    Tuple,
+    Type,
+)
+
+from asgiref.sync import sync_to_async
+from django.db import models
+from django.db.models import QuerySet
+
+from drug_insights_hub.research.models import ClinicalTrial, Drug, Publication
+
+DEFAULT_CHUNK_SIZE: int = 2000
+
+
+class Resource(NamedTuple):
+    model: Type[models.Model]
+    affiliation_field: str
+
+    @property
+    def concrete_fields(self) -> Tuple[str, ...]:
+        return tuple(field.name for field in self.model._meta.concrete_fields)
+
+    @property
+    def many_to_many_fields(self) -> Tuple[str, ...]:
+        return tuple(field.name for field in self.model._meta.many_to_many)
+
+    @property
+    def fields(self) -> Tuple[str, ...]:
+        return self.concrete_fields + self.many_to_many_fields
+
+
+RESOURCES: Dict[str, Resource] = {
+    "drugs": Resource(Drug, affiliation_field="affiliated_institution"),
+    "clinical_trials": Resource(ClinicalTrial, affiliation_field="affiliation"),
+    "publications": Resource(Publication, affiliation_field="affiliation"),
+}
+
+
+def iter_records(
+    resource: Resource,
+    queryset: QuerySet,
+    fields: Sequence[str],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[Dict[str, Any]]:
+    rows: Iterator[Tuple[Any, ...]] = _rows(resource, queryset, fields).iterator(
+        chunk_size=chunk_size
+    )
+    while records := next_records(resource, rows, fields, chunk_size):
+        yield from records
+
+
+async def aiter_records(
+    resource: Resource,
+    queryset: QuerySet,
+    fields: Sequence[str],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> AsyncIterator[Dict[str, Any]]:
+    # Not QuerySet.aiterator(): for values_list() it opens the cursor in the
+    # event loop. Each chunk is read with its related ids in one thread call.
+    rows: Iterator[Tuple[Any, ...]] = _rows(resource, queryset, fields).iterator(
+        chunk_size=chunk_size
+    )
+    while records := await sync_to_async(next_records)(
+        resource, rows, fields, chunk_size
+    ):
+        for record in records:
+            yield record
+
+
+def next_records(
+    resource: Resource,
+    rows: Iterator[Tuple[Any, ...]],
+    fields: Sequence[str],
+    chunk_size: int,
+) -> List[Dict[str, Any]]:
+    chunk: List[Tuple[Any, ...]] = list(islice(rows, chunk_size))
+    return chunk_records(resource, chunk, fields) if chunk else []
+
+
+def chunk_records(
+    resource: Resource, chunk: List[Tuple[Any, ...]], fields: Sequence[str]
+) -> List[Dict[str, Any]]:
+    # Rows come from _rows(): the pk, then the selected concrete fields.
+    concrete: List[str] = [
+        name for name in fields if name in resource.concrete_fields
+    ]
+    many_to_many: List[str] = [
+        name for name in fields if name in resource.many_to_many_fields
+    ]
+    pks: List[int] = [row[0] for row in chunk]
+    related: Dict[str, Dict[int, List[int]]] = {
+        name: related_ids(resource.model, name, pks) for name in many_to_many
+    }
+    records: List[Dict[str, Any]] = []
+    for row in chunk:
+        values: Dict[str, Any] = dict(zip(concrete, row[1:]))
+        for name in many_to_many:
+            values[name] = related[name].get(row[0], [])
+        records.append({name: values[name] for name in fields})
+    return records
+
+
+def _rows(resource: Resource, queryset: QuerySet, fields: Sequence[str]) -> QuerySet:
+    columns: List[str] = [
+        resource.model._meta.get_field(name).attname
+        for name in fields
+        if name in resource.concrete_fields
+    ]
+    return queryset.order_by("pk").values_list("pk", *columns)
+
+
+def related_ids(
+    model: Type[models.Model], field_name: str, pks: List[int]
+) -> Dict[int, List[int]]:
+    field: models.ManyToManyField = model._meta.get_field(field_name)
+    through: Type[models.Model] = field.remote_field.through
+    source: str = through._meta.get_field(field.m2m_field_name()).attname
+    target: str = through._meta.get_field(field.m2m_reverse_field_name()).attname
+
+    related: Dict[int, List[int]] = {}
+    for source_id, target_id in (
+        through._default_manager.filter(**{f"{source}__in": pks})
+        .order_by(source, target)
+        .values_list(source, target)
+    ):
+        related.setdefault(source_id, []).append(target_id)
+    return related
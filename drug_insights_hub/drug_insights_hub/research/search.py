@@ -0,0 +1,187 @@
+import re
+from typing import Dict, Iterable, List, NamedTuple, Tuple, Type
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connection, models
+from django.db.models import F, Q
+
+from drug_insights_hub.research.models import (
+    ClinicalTrial,
+    Drug,
+    Publication,
+    SearchEntry,
+)
+
+SEARCH_CONFIG: str = "english"
+
+FTS_TABLE: str = "research_searchentry_fts"
+
+# kind -> (model, title fields, body fields)
+SearchableModel = Tuple[Type[models.Model], Tuple[str, ...], Tuple[str, ...]]
+
+SEARCHABLE_MODELS: Dict[str, SearchableModel] = {
+    "drug": (
+        Drug,
+        ("proprietary_name", "international_non_proprietary_name"),
+        ("description",),
+    ),
+    "clinical_trial": (ClinicalTrial, ("title",), ("description",)),
+    "publication": (Publication, ("title",), ("journal",)),
+}
+
+
+class SearchHit(NamedTuple):
+    kind: str
+    object: models.Model
+    rank: float
+
+
+def kind_for(model: Type[models.Model]) -> str | None:
+    for kind, (searchable_model, _, _) in SEARCHABLE_MODELS.items():
+        if searchable_model is model:
+            return kind
+    return None
+
+
+def build_entry(kind: str, instance: models.Model) -> SearchEntry:
+    _, title_fields, body_fields = SEARCHABLE_MODELS[kind]
+    title: str = _join_fields(instance, title_fields)
+    body: str = _join_fields(instance, body_fields)
+    return SearchEntry(
+        kind=kind,
+        object_id=instance.pk,
+        title=title[: SearchEntry.MAX_TITLE_LENGTH],
+        body=body,
+    )
+
+
+def index_objects(
+    model: Type[models.Model], instances: Iterable[models.Model]
+) -> None:
+    kind: str | None = kind_for(model)
+    if kind is None:
+        return
+
+    entries: List[SearchEntry] = [
+        build_entry(kind, instance) for instance in instances
+    ]
+    if not entries:
+        return
+
+    SearchEntry.objects.filter(
+        kind=kind, object_id__in=[entry.object_id for entry in entries]
+    ).delete()
+    SearchEntry.objects.bulk_create(entries)
+    _refresh_vectors(kind, [entry.object_id for entry in entries])
+
+
+def remove_object(model: Type[models.Model], pk: int) -> None:
+    kind: str | None = kind_for(model)
+    if kind is not None:
+        SearchEntry.objects.filter(kind=kind, object_id=pk).delete()
+
+
+def rebuild(chunk_size: int = 2000) -> Dict[str, int]:
+    indexed: Dict[str, int] = {}
+    SearchEntry.objects.all().delete()
+    for kind, (model, title_fields, body_fields) in SEARCHABLE_MODELS.items():
+        indexed[kind] = 0
+        batch: List[models.Model] = []
+        for instance in model._default_manager.only(
+            *title_fields, *body_fields
+        ).iterator(chunk_size=chunk_size):
+            batch.append(instance)
+            if len(batch) == chunk_size:
+                index_objects(model, batch)
+                indexed[kind] += len(batch)
+                batch = []
+        index_objects(model, batch)
+        indexed[kind] += len(batch)
+    return indexed
+
+
+def search_objects(text: str, limit: int = 20) -> List[SearchHit]:
+    text = text.strip()
+    if not text:
+        return []
+
+    if connection.vendor == "postgresql":
+        ranked: List[Tuple[str, int, float]] = _search_postgresql(text, limit)
+    elif connection.vendor == "sqlite":
+        ranked = _search_sqlite(text, limit)
+    else:
+        ranked = _search_fallback(text, limit)
+
+    return _load_hits(ranked)
+
+
+def _join_fields(instance: models.Model, fields: Tuple[str, ...]) -> str:
+    values = (getattr(instance, field) for field in fields)
+    return " ".join(str(value) for value in values if value)
+
+
+def _refresh_vectors(kind: str, object_ids: List[int]) -> None:
+    if connection.vendor != "postgresql":
+        return
+    SearchEntry.objects.filter(kind=kind, object_id__in=object_ids).update(
+        vector=SearchVector("title", weight="A", config=SEARCH_CONFIG)
+        + SearchVector("body", weight="B", config=SEARCH_CONFIG)
+    )
+
+
+def _search_postgresql(text: str, limit: int) -> List[Tuple[str, int, float]]:
+    query: SearchQuery = SearchQuery(
+        text, config=SEARCH_CONFIG, search_type="websearch"
+    )
+    return list(
+        SearchEntry.objects.filter(vector=query)
+        .annotate(rank=SearchRank(F("vector"), query))
+        .order_by("-rank")
+        .values_list("kind", "object_id", "rank")[:limit]
+    )
+
+
+def _search_sqlite(text: str, limit: int) -> List[Tuple[str, int, float]]:
+    terms: List[str] = re.findall(r"\w+", text)
+    if not terms:
+        return []
+
+    match: str = " ".join('"%s"*' % term for term in terms)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            SELECT entry.kind, entry.object_id, -bm25({FTS_TABLE}, 10.0, 1.0)
+            FROM {FTS_TABLE}
+            JOIN research_searchentry AS entry ON entry.id = {FTS_TABLE}.rowid
+            WHERE {FTS_TABLE} MATCH %s
+            ORDER BY bm25({FTS_TABLE}, 10.0, 1.0)
+            LIMIT %s
+            """,
+            [match, limit],
+        )
+        return list(cursor.fetchall())
+
+
+def _search_fallback(text: str, limit: int) -> List[Tuple[str, int, float]]:
+    return [
+        (kind, object_id, 1.0)
+        for kind, object_id in SearchEntry.objects.filter(
+            Q(title__icontains=text) | Q(body__icontains=text)
+        ).values_list("kind", "object_id")[:limit]
+    ]
+
+
+def _load_hits(ranked: List[Tuple[str, int, float]]) -> List[SearchHit]:
+    ids_by_kind: Dict[str, List[int]] = {}
+    for kind, object_id, _ in ranked:
+        ids_by_kind.setdefault(kind, []).append(object_id)
+
+    objects: Dict[str, Dict[int, models.Model]] = {
+        kind: SEARCHABLE_MODELS[kind][0]._default_manager.in_bulk(object_ids)
+        for kind, object_ids in ids_by_kind.items()
+    }
+    return [
+        SearchHit(kind=kind, object=objects[kind][object_id], rank=rank)
+        for kind, object_id, rank in ranked
+        if object_id in objects[kind]
+    ]
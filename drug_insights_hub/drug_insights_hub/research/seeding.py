@@ -0,0 +1,335 @@
+import datetime
+import random
+from collections import Counter
+from typing import Dict, Iterable, List, NamedTuple, Sequence, Tuple, Type
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import UNUSABLE_PASSWORD_PREFIX
+from django.contrib.auth.models import User
+from django.db import connections, models, transaction
+
+from drug_insights_hub.accounts.models import Affiliation, UserProfile
+from drug_insights_hub.core import counters
+from drug_insights_hub.core.signals import bulk_created
+from drug_insights_hub.research.importers import (
+    IMPORT_BATCH_SIZE,
+    insert_through_rows,
+)
+from drug_insights_hub.research.models import ClinicalTrial, Drug, Publication
+
+USER_MODEL: Type[User] = get_user_model()
+
+# Share of the requested row count that goes to each table in seed(); the
+# rest of the rows are affiliations and user profiles.
+ROW_SHARES: Dict[str, float] = {
+    "users": 0.2,
+    "drugs": 0.1,
+    "clinical_trials": 0.1,
+    "publications": 0.1,
+    "participants": 0.2,
+    "authors": 0.1,
+    "publication_trials": 0.1,
+}
+ROWS_PER_AFFILIATION: int = 500
+
+# Relative weights, in the order of the model choices.
+DRUG_TYPE_WEIGHTS: Tuple[int, ...] = (30, 10, 6, 4, 3, 6, 10, 15, 10, 3, 2, 1)
+DEVELOPMENT_STATUS_WEIGHTS: Tuple[int, ...] = (40, 25, 18, 10, 7)
+SPECIALIZATION_WEIGHTS: Tuple[int, ...] = (50, 12, 8, 8, 4, 4, 8, 4, 2)
+# Trials run for a phase the drug has reached, mostly the latest one.
+LATEST_PHASE_WEIGHT: int = 4
+
+# phase -> (shortest, longest) duration in days
+TRIAL_DURATIONS: Dict[str, Tuple[int, int]] = {
+    "Preclinical": (90, 720),
+    "Phase I": (180, 540),
+    "Phase II": (365, 1095),
+    "Phase III": (730, 1460),
+    "Approved": (365, 1825),
+}
+FIRST_DAY: datetime.date = datetime.date(2015, 1, 1)
+START_DAYS: int = 3650
+
+# Most publications go to a few journals.
+JOURNALS: Tuple[str, ...] = (
+    "The Lancet",
+    "New England J. of Medicine",
+    "JAMA",
+    "BMJ",
+    "Nature Medicine",
+    "Clinical Pharmacology",
+    "Drug Safety",
+    "Trials",
+    "Pharmacotherapy",
+    "J. of Clinical Oncology",
+)
+JOURNAL_WEIGHTS: Tuple[int, ...] = tuple(range(len(JOURNALS), 0, -1))
+
+
+class SeedSizes(NamedTuple):
+    users: int
+    drugs: int
+    clinical_trials: int
+    publications: int
+    # (fewest, most) per trial or publication
+    participants: Tuple[int, int]
+    authors: Tuple[int, int]
+    publication_trials: Tuple[int, int]
+
+
+class SeededData(NamedTuple):
+    affiliations: List[Affiliation]
+    users: List[User]
+    drugs: List[Drug]
+    clinical_trials: List[ClinicalTrial]
+    publications: List[Publication]
+
+
+def create_affiliations(amount: int, prefix: str = "seed") -> List[Affiliation]:
+    return Affiliation.objects.bulk_create(
+        (
+            Affiliation(
+                name=f"{prefix} affiliation {number}",
+                location="-",
+                description="-",
+                website="https://example.com",
+            )
+            for number in range(amount)
+        ),
+        batch_size=IMPORT_BATCH_SIZE,
+    )
+
+
+def seed_affiliation(
+    affiliation: Affiliation,
+    number: int,
+    sizes: SeedSizes,
+    seed: int = 1,
+    prefix: str = "seed",
+) -> SeededData:
+    # Every affiliation gets its own generator, so the output does not depend
+    # on which process seeds it or in what order.
+    generator: random.Random = random.Random(f"{seed}:{number}")
+    name: str = f"{prefix} {number}"
+
+    users: List[User] = _create(
+        USER_MODEL,
+        (
+            USER_MODEL(
+                username=f"{prefix}_{number}_{user_number}",
+                first_name=f"First{user_number}",
+                last_name=f"Last{number}",
+                password=UNUSABLE_PASSWORD_PREFIX,
+            )
+            for user_number in range(sizes.users)
+        ),
+    )
+    # bulk_create skips the post_save receiver that creates profiles.
+    UserProfile.objects.bulk_create(
+        (
+            UserProfile(
+                user=user,
+                affiliation=affiliation,
+                specialization=_choose(
+                    generator,
+                    UserProfile.CHOICES_SPECIALIZATION,
+                    SPECIALIZATION_WEIGHTS,
+                ),
+            )
+            for user in users
+        ),
+        batch_size=IMPORT_BATCH_SIZE,
+    )
+
+    drugs: List[Drug] = _create(
+        Drug,
+        (
+            Drug(
+                proprietary_name=f"{name} drug {drug_number}",
+                international_non_proprietary_name=f"{name}mab {drug_number}",
+                affiliated_institution=affiliation,
+                drug_type=_choose(generator, Drug.CHOICES_TYPES, DRUG_TYPE_WEIGHTS),
+                development_status=_choose(
+                    generator,
+                    Drug.CHOICES_DEVELOPMENT_STATUS,
+                    DEVELOPMENT_STATUS_WEIGHTS,
+                ),
+                description="-",
+            )
+            for drug_number in range(sizes.drugs)
+        ),
+        send=False,
+    )
+    clinical_trials: List[ClinicalTrial] = _create(
+        ClinicalTrial,
+        (
+            _clinical_trial(
+                generator,
+                f"{name} trial {trial_number}",
+                drugs[trial_number % len(drugs)],
+            )
+            for trial_number in range(sizes.clinical_trials if drugs else 0)
+        ),
+        send=False,
+    )
+    publications: List[Publication] = _create(
+        Publication,
+        (
+            Publication(
+                title=f"{name} publication {publication_number}",
+                affiliation=affiliation,
+                journal=_choose(generator, JOURNALS, JOURNAL_WEIGHTS),
+            )
+            for publication_number in range(sizes.publications)
+        ),
+        send=False,
+    )
+
+    insert_through_rows(
+        ClinicalTrial,
+        "participants",
+        _pairs(generator, clinical_trials, users, sizes.participants),
+    )
+    insert_through_rows(
+        Publication, "authors", _pairs(generator, publications, users, sizes.authors)
+    )
+    insert_through_rows(
+        Publication,
+        "trials",
+        _pairs(generator, publications, clinical_trials, sizes.publication_trials),
+    )
+    # Sent after the relations exist, for receivers that read them.
+    for model, instances in (
+        (Drug, drugs),
+        (ClinicalTrial, clinical_trials),
+        (Publication, publications),
+    ):
+        bulk_created.send(sender=model, instances=instances)
+
+    return SeededData([affiliation], users, drugs, clinical_trials, publications)
+
+
+def seed_affiliations(
+    numbers: Dict[int, int], sizes: SeedSizes, seed: int = 1, prefix: str = "seed"
+) -> Counter:
+    # Seeds the affiliations in ``numbers`` (pk -> number), one transaction
+    # each. Used from worker processes, so the connection is closed at the end
+    # instead of being left for a parent to share. The stats counters are
+    # shared rows, so their deltas are returned for the caller to apply once
+    # all workers are done; the summary and search rows are per affiliation
+    # and object, and are written in the transactions.
+    deltas: Counter = Counter()
+    try:
+        for affiliation in Affiliation.objects.filter(pk__in=list(numbers)):
+            with counters.deferred() as affiliation_deltas, transaction.atomic():
+                seed_affiliation(
+                    affiliation,
+                    numbers[affiliation.pk],
+                    sizes,
+                    seed=seed,
+                    prefix=prefix,
+                )
+            deltas.update(affiliation_deltas)
+    finally:
+        connections.close_all()
+    return deltas
+
+
+def seed(rows: int, seed: int = 1, prefix: str = "seed") -> SeededData:
+    # A dataset of about ``rows`` rows in total, seeded in this process.
+    affiliations: List[Affiliation] = create_affiliations(
+        max(2, rows // ROWS_PER_AFFILIATION), prefix=prefix
+    )
+    per_affiliation: Dict[str, int] = {
+        name: max(1, int(rows * share) // len(affiliations))
+        for name, share in ROW_SHARES.items()
+    }
+    sizes: SeedSizes = SeedSizes(
+        users=per_affiliation["users"],
+        drugs=per_affiliation["drugs"],
+        clinical_trials=per_affiliation["clinical_trials"],
+        publications=per_affiliation["publications"],
+        participants=_spread(per_affiliation, "participants", "clinical_trials"),
+        authors=_spread(per_affiliation, "authors", "publications"),
+        publication_trials=_spread(
+            per_affiliation, "publication_trials", "publications"
+        ),
+    )
+
+    seeded: List[SeededData] = [
+        seed_affiliation(affiliation, number, sizes, seed=seed, prefix=prefix)
+        for number, affiliation in enumerate(affiliations)
+    ]
+    return SeededData(
+        *(
+            [instance for data in seeded for instance in getattr(data, field)]
+            for field in SeededData._fields
+        )
+    )
+
+
+def _choose(
+    generator: random.Random, choices: Sequence, weights: Sequence[int]
+) -> str:
+    choice: str | Tuple[str, str] = generator.choices(choices, weights)[0]
+    return choice if isinstance(choice, str) else choice[0]
+
+
+def _clinical_trial(
+    generator: random.Random, title: str, drug: Drug
+) -> ClinicalTrial:
+    phases: List[str] = [phase for phase, _ in ClinicalTrial.CHOICES_PHASE_STATUS]
+    reached: List[str] = phases[: phases.index(drug.development_status) + 1]
+    phase: str = _choose(
+        generator,
+        reached,
+        [1] * (len(reached) - 1) + [LATEST_PHASE_WEIGHT],
+    )
+    start_date: datetime.date = FIRST_DAY + datetime.timedelta(
+        days=generator.randrange(START_DAYS)
+    )
+    return ClinicalTrial(
+        title=title,
+        drug=drug,
+        phase=phase,
+        affiliation_id=drug.affiliated_institution_id,
+        start_date=start_date,
+        end_date=start_date
+        + datetime.timedelta(days=generator.randint(*TRIAL_DURATIONS[phase])),
+        description="-",
+    )
+
+
+def _create(
+    model: Type[models.Model], instances: Iterable[models.Model], send: bool = True
+) -> List[models.Model]:
+    created: List[models.Model] = model._default_manager.bulk_create(
+        instances, batch_size=IMPORT_BATCH_SIZE
+    )
+    if send:
+        bulk_created.send(sender=model, instances=created)
+    return created
+
+
+def _pairs(
+    generator: random.Random,
+    sources: List[models.Model],
+    targets: List[models.Model],
+    per_source: Tuple[int, int],
+) -> List[Tuple[int, int]]:
+    fewest, most = per_source
+    return [
+        (source.pk, target.pk)
+        for source in sources
+        for target in generator.sample(
+            targets, min(generator.randint(fewest, most), len(targets))
+        )
+    ]
+
+
+def _spread(
+    per_affiliation: Dict[str, int], relation: str, sources: str
+) -> Tuple[int, int]:
+    # Between none and twice the average, so the total comes out about right.
+    average: int = per_affiliation[relation] // per_affiliation[sources]
+    return (0, 2 * average)
@@ -0,0 +1,321 @@
+from collections import Counter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Type
+
+from django.contrib.auth import get_user_model
+from django.core.signals import request_finished
+from django.db import models, transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from drug_insights_hub.accounts.models import Affiliation
+from drug_insights_hub.core.cache import bump_version
+from drug_insights_hub.core.signals import bulk_created
+from drug_insights_hub.research import conditional, object_cache, search, summary
+from drug_insights_hub.research.autocomplete import DrugNames, drug_name_index
+from drug_insights_hub.research.forms import (
+    AFFILIATION_CHOICES_NAMESPACE,
+    DRUG_CHOICES_NAMESPACE,
+)
+from drug_insights_hub.research.models import (
+    PAGE_DEPENDENT_FIELDS,
+    PAGE_DEPENDENTS,
+    ClinicalTrial,
+    Drug,
+    Publication,
+)
+
+
+@receiver(post_save, sender=Drug)
+@receiver(post_save, sender=ClinicalTrial)
+@receiver(post_save, sender=Publication)
+def update_search_entry(sender, instance, raw=False, **kwargs) -> None:
+    if not raw:
+        search.index_objects(sender, [instance])
+
+
+@receiver(post_delete, sender=Drug)
+@receiver(post_delete, sender=ClinicalTrial)
+@receiver(post_delete, sender=Publication)
+def delete_search_entry(sender, instance, **kwargs) -> None:
+    search.remove_object(sender, instance.pk)
+
+
+@receiver(bulk_created, sender=Drug)
+@receiver(bulk_created, sender=ClinicalTrial)
+@receiver(bulk_created, sender=Publication)
+def update_search_entries_in_bulk(sender, instances, **kwargs) -> None:
+    search.index_objects(sender, instances)
+
+
+def drug_names(drug: Drug) -> DrugNames:
+    return (drug.pk, drug.proprietary_name, drug.international_non_proprietary_name)
+
+
+@receiver(post_save, sender=Drug)
+def update_drug_name_index(sender, instance, **kwargs) -> None:
+    added: List[DrugNames] = [drug_names(instance)]
+    transaction.on_commit(lambda: drug_name_index.publish(added, []))
+
+
+@receiver(post_delete, sender=Drug)
+def delete_from_drug_name_index(sender, instance, **kwargs) -> None:
+    removed: List[int] = [instance.pk]
+    transaction.on_commit(lambda: drug_name_index.publish([], removed))
+
+
+@receiver(bulk_created, sender=Drug)
+def update_drug_name_index_in_bulk(sender, instances, **kwargs) -> None:
+    added: List[DrugNames] = [drug_names(drug) for drug in instances]
+    transaction.on_commit(lambda: drug_name_index.publish(added, []))
+
+
+def stored_fields(model: Type[models.Model]) -> List[str]:
+    fields: List[str] = list(PAGE_DEPENDENT_FIELDS.get(model, ()))
+    if model in summary.SUMMARIZED_MODELS:
+        fields = [*summary.summary_fields(model), *fields]
+    return fields
+
+
+def saves_fields(
+    model: Type[models.Model], fields: Iterable[str], update_fields: Iterable[str]
+) -> bool:
+    # update_fields may name a foreign key by its field name or its attname.
+    get_field: Callable[[str], models.Field] = model._meta.get_field
+    return not {get_field(name) for name in fields}.isdisjoint(
+        map(get_field, update_fields)
+    )
+
+
+@receiver(pre_save, sender=Drug)
+@receiver(pre_save, sender=ClinicalTrial)
+@receiver(pre_save, sender=Publication)
+@receiver(pre_save, sender=Affiliation)
+@receiver(pre_save, sender=get_user_model())
+def remember_stored_values(
+    sender, instance, raw=False, update_fields=None, **kwargs
+) -> None:
+    # The one read the post_save receivers below compare against: the summary
+    # keys, the affiliation an object may move from and the fields shown on
+    # other pages.
+    instance._stored_values = None
+    if raw or instance._state.adding:
+        return
+    fields: List[str] = stored_fields(sender)
+    if update_fields is not None and not saves_fields(sender, fields, update_fields):
+        instance._stored_values = {
+            field: getattr(instance, field) for field in fields
+        }
+        return
+    instance._stored_values = (
+        sender._default_manager.filter(pk=instance.pk).values(*fields).first()
+    )
+
+
+def stored_value(instance: models.Model, field: str) -> Any:
+    stored: Optional[Dict[str, Any]] = getattr(instance, "_stored_values", None)
+    return None if stored is None else stored[field]
+
+
+def shown_fields_changed(model: Type[models.Model], instance: models.Model) -> bool:
+    stored: Optional[Dict[str, Any]] = getattr(instance, "_stored_values", None)
+    return stored is not None and any(
+        stored[field] != getattr(instance, field)
+        for field in PAGE_DEPENDENT_FIELDS.get(model, ())
+    )
+
+
+@receiver(post_save, sender=Drug)
+@receiver(post_save, sender=ClinicalTrial)
+@receiver(post_save, sender=Publication)
+def update_affiliation_summary(sender, instance, raw=False, **kwargs) -> None:
+    if raw:
+        return
+    changes: Counter = summary.count_instances([instance])
+    if instance._stored_values is not None:
+        changes.subtract(summary.summary_keys(sender, instance._stored_values))
+    summary.apply(changes)
+
+
+@receiver(post_delete, sender=Drug)
+@receiver(post_delete, sender=ClinicalTrial)
+@receiver(post_delete, sender=Publication)
+def remove_from_affiliation_summary(sender, instance, **kwargs) -> None:
+    changes: Counter = Counter()
+    changes.subtract(summary.instance_keys(instance))
+    summary.apply(changes)
+
+
+@receiver(bulk_created, sender=Drug)
+@receiver(bulk_created, sender=ClinicalTrial)
+@receiver(bulk_created, sender=Publication)
+def update_affiliation_summary_in_bulk(sender, instances, **kwargs) -> None:
+    summary.apply(summary.count_instances(instances))
+
+
+def bump_choices(namespace: str, scopes: Iterable[object]) -> None:
+    # After commit, like the object cache, so a concurrent form can't cache
+    # the pre-commit list under the new version.
+    namespaces: List[str] = [f"{namespace}:{scope}" for scope in scopes]
+    transaction.on_commit(
+        lambda: [bump_version(namespace) for namespace in namespaces]
+    )
+
+
+@receiver(post_save, sender=Drug)
+@receiver(post_delete, sender=Drug)
+def invalidate_drug_choices(sender, instance, **kwargs) -> None:
+    # A drug moved between affiliations leaves the old affiliation's choices
+    # stale as well.
+    affiliation_ids: Set[int] = {
+        instance.affiliated_institution_id,
+        stored_value(instance, "affiliated_institution_id"),
+    }
+    affiliation_ids.discard(None)
+    bump_choices(DRUG_CHOICES_NAMESPACE, affiliation_ids)
+
+
+@receiver(bulk_created, sender=Drug)
+def invalidate_drug_choices_in_bulk(sender, instances, **kwargs) -> None:
+    bump_choices(
+        DRUG_CHOICES_NAMESPACE, {drug.affiliated_institution_id for drug in instances}
+    )
+
+
+def touch_rows(rows: models.QuerySet) -> None:
+    conditional.invalidate_lists(
+        rows.model,
+        rows.order_by().values_list(
+            summary.affiliation_attname(rows.model), flat=True
+        ),
+    )
+    rows.update(updated_at=timezone.now())
+
+
+def touch(model: Type[models.Model], pks: Iterable[int]) -> None:
+    touch_rows(model._default_manager.filter(pk__in=list(pks)))
+
+
+def touch_dependents(model: Type[models.Model], pk: int) -> None:
+    for dependent, field in PAGE_DEPENDENTS.get(model, ()):
+        touch_rows(dependent._default_manager.filter(**{field: pk}))
+
+
+def invalidate_pages(
+    model: Type[models.Model],
+    instance: models.Model,
+    affiliation_ids: Iterable[Optional[int]],
+    dependents: bool,
+) -> None:
+    object_cache.invalidate(model, [instance.pk])
+    conditional.invalidate_lists(model, affiliation_ids)
+    if dependents:
+        touch_dependents(model, instance.pk)
+        object_cache.invalidate_dependents(model, instance.pk)
+
+
+@receiver(post_save, sender=Drug)
+@receiver(post_save, sender=ClinicalTrial)
+@receiver(post_save, sender=Publication)
+def update_dependent_pages(sender, instance, raw=False, **kwargs) -> None:
+    # Other objects' pages are touched only when a field they show changed. An
+    # object moved between affiliations leaves the old affiliation's list
+    # stale as well.
+    if raw:
+        return
+    attname: str = summary.affiliation_attname(sender)
+    invalidate_pages(
+        sender,
+        instance,
+        (getattr(instance, attname), stored_value(instance, attname)),
+        dependents=shown_fields_changed(sender, instance),
+    )
+
+
+@receiver(post_delete, sender=Drug)
+@receiver(post_delete, sender=ClinicalTrial)
+@receiver(post_delete, sender=Publication)
+def update_deleted_pages(sender, instance, **kwargs) -> None:
+    invalidate_pages(
+        sender,
+        instance,
+        [getattr(instance, summary.affiliation_attname(sender))],
+        dependents=True,
+    )
+
+
+@receiver(bulk_created, sender=Drug)
+@receiver(bulk_created, sender=ClinicalTrial)
+@receiver(bulk_created, sender=Publication)
+def update_list_pages_in_bulk(sender, instances, **kwargs) -> None:
+    attname: str = summary.affiliation_attname(sender)
+    conditional.invalidate_lists(
+        sender, (getattr(instance, attname) for instance in instances)
+    )
+
+
+@receiver(post_save, sender=get_user_model())
+def update_user_pages(
+    sender, instance, created=False, raw=False, update_fields=None, **kwargs
+) -> None:
+    if raw or created or not shown_fields_changed(sender, instance):
+        return
+    touch_dependents(sender, instance.pk)
+    object_cache.invalidate_dependents(sender, instance.pk)
+
+
+@receiver(m2m_changed, sender=ClinicalTrial.participants.through)
+@receiver(m2m_changed, sender=Publication.authors.through)
+@receiver(m2m_changed, sender=Publication.trials.through)
+def update_relation_pages(
+    sender, instance, action, reverse, model, pk_set, **kwargs
+) -> None:
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+    if not reverse:
+        touch(type(instance), [instance.pk])
+        object_cache.invalidate(type(instance), [instance.pk])
+        return
+
+    # Changed from the other side: the affected pages are the ``model`` rows.
+    if action == "pre_clear":
+        field = next(
+            field
+            for field in model._meta.many_to_many
+            if field.remote_field.through is sender
+        )
+        pk_set = sender.objects.filter(
+            **{field.m2m_reverse_field_name(): instance.pk}
+        ).values_list(f"{field.m2m_field_name()}_id", flat=True)
+    pks: List[int] = list(pk_set)
+    touch(model, pks)
+    object_cache.invalidate(model, pks)
+
+
+def invalidate_affiliation_pages(affiliation_id: int) -> None:
+    # The name is on every page of the affiliation's objects. Their detail
+    # pages check the affiliation's version, so no row needs touching.
+    bump_choices(AFFILIATION_CHOICES_NAMESPACE, [affiliation_id])
+    conditional.invalidate_affiliation(affiliation_id)
+    for model in summary.SUMMARIZED_MODELS:
+        conditional.invalidate_lists(model, [affiliation_id])
+
+
+@receiver(post_save, sender=Affiliation)
+def update_affiliation_pages(
+    sender, instance, created=False, raw=False, **kwargs
+) -> None:
+    if created:
+        bump_choices(AFFILIATION_CHOICES_NAMESPACE, [instance.pk])
+    elif not raw and shown_fields_changed(sender, instance):
+        invalidate_affiliation_pages(instance.pk)
+
+
+@receiver(post_delete, sender=Affiliation)
+def delete_affiliation_pages(sender, instance, **kwargs) -> None:
+    invalidate_affiliation_pages(instance.pk)
+
+
+@receiver(request_finished)
+def flush_object_cache_stats(sender, **kwargs) -> None:
+    object_cache.object_cache_stats.flush()
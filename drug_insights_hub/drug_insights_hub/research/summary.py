@@ -0,0 +1,189 @@
+import datetime
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Type
+
+from django.db import IntegrityError, models, transaction
+from django.db.models import Count, F
+
+from drug_insights_hub.research.models import (
+    AffiliationSummary,
+    ClinicalTrial,
+    Drug,
+    Publication,
+)
+
+# model -> (affiliation field, ((dimension, field), ...))
+SummarizedModel = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+SUMMARIZED_MODELS: Dict[Type[models.Model], SummarizedModel] = {
+    Drug: (
+        "affiliated_institution",
+        (
+            ("drug_development_status", "development_status"),
+            ("drug_type", "drug_type"),
+        ),
+    ),
+    ClinicalTrial: (
+        "affiliation",
+        (
+            ("trial_phase", "phase"),
+            ("trial_start_date", "start_date"),
+            ("trial_end_date", "end_date"),
+        ),
+    ),
+    Publication: ("affiliation", (("publication_journal", "journal"),)),
+}
+
+# (affiliation id, dimension, key)
+SummaryKey = Tuple[int, str, str]
+
+
+def affiliation_attname(model: Type[models.Model]) -> str:
+    affiliation_field, _ = SUMMARIZED_MODELS[model]
+    return f"{affiliation_field}_id"
+
+
+def summary_fields(model: Type[models.Model]) -> List[str]:
+    _, dimensions = SUMMARIZED_MODELS[model]
+    return [affiliation_attname(model), *(field for _, field in dimensions)]
+
+
+def summary_keys(
+    model: Type[models.Model], values: Dict[str, Any]
+) -> List[SummaryKey]:
+    affiliation_field, dimensions = SUMMARIZED_MODELS[model]
+    affiliation_id: int = values[f"{affiliation_field}_id"]
+    return [
+        (affiliation_id, dimension, _key(values[field]))
+        for dimension, field in dimensions
+    ]
+
+
+def instance_keys(instance: models.Model) -> List[SummaryKey]:
+    return summary_keys(type(instance), _instance_values(instance))
+
+
+def count_instances(instances: Iterable[models.Model]) -> Counter:
+    return Counter(key for instance in instances for key in instance_keys(instance))
+
+
+def apply(changes: Counter) -> None:
+    for (affiliation_id, dimension, key), delta in changes.items():
+        if delta:
+            _increment(affiliation_id, dimension, key, delta)
+
+
+def rebuild() -> int:
+    with transaction.atomic():
+        AffiliationSummary.objects.all().delete()
+        rows: List[AffiliationSummary] = [
+            AffiliationSummary(
+                affiliation_id=affiliation_id,
+                dimension=dimension,
+                key=key,
+                count=count,
+            )
+            for (affiliation_id, dimension, key), count in expected_counts().items()
+        ]
+        AffiliationSummary.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
+
+
+def expected_counts() -> Counter:
+    counts: Counter = Counter()
+    for model, (affiliation_field, dimensions) in SUMMARIZED_MODELS.items():
+        for dimension, field in dimensions:
+            for affiliation_id, value, count in (
+                model._default_manager.order_by()
+                .values_list(f"{affiliation_field}_id", field)
+                .annotate(count=Count("pk"))
+            ):
+                counts[(affiliation_id, dimension, _key(value))] += count
+    return counts
+
+
+def stored_counts() -> Counter:
+    return Counter(
+        {
+            (affiliation_id, dimension, key): count
+            for affiliation_id, dimension, key, count in (
+                AffiliationSummary.objects.exclude(count=0).values_list(
+                    "affiliation_id", "dimension", "key", "count"
+                )
+            )
+        }
+    )
+
+
+def find_inconsistencies() -> Dict[SummaryKey, Tuple[int, int]]:
+    expected: Counter = expected_counts()
+    stored: Counter = stored_counts()
+    return {
+        key: (stored[key], expected[key])
+        for key in sorted(set(expected) | set(stored))
+        if stored[key] != expected[key]
+    }
+
+
+def read_summary(affiliation_id: int, today: Optional[datetime.date] = None) -> Dict:
+    today = today or datetime.date.today()
+    summary: Dict[str, Dict[str, int]] = {
+        dimension: {} for dimension, _ in AffiliationSummary.CHOICES_DIMENSIONS
+    }
+    for dimension, key, count in AffiliationSummary.objects.filter(
+        affiliation_id=affiliation_id, count__gt=0
+    ).values_list("dimension", "key", "count"):
+        summary[dimension][key] = count
+
+    # Keys are ISO dates, so they compare like the dates.
+    start_dates: Dict[str, int] = summary.pop("trial_start_date")
+    end_dates: Dict[str, int] = summary.pop("trial_end_date")
+    started: int = sum(
+        count
+        for start_date, count in start_dates.items()
+        if start_date <= today.isoformat()
+    )
+    finished: int = sum(
+        count
+        for end_date, count in end_dates.items()
+        if end_date < today.isoformat()
+    )
+    summary["trial_state"] = {
+        "Not started": sum(start_dates.values()) - started,
+        "Active": started - finished,
+        "Finished": finished,
+    }
+    return summary
+
+
+def _increment(affiliation_id: int, dimension: str, key: str, delta: int) -> None:
+    rows = AffiliationSummary.objects.filter(
+        affiliation_id=affiliation_id, dimension=dimension, key=key
+    )
+    if rows.update(count=F("count") + delta):
+        return
+
+    try:
+        with transaction.atomic():
+            AffiliationSummary.objects.create(
+                affiliation_id=affiliation_id,
+                dimension=dimension,
+                key=key,
+                count=max(delta, 0),
+            )
+    except IntegrityError:
+        rows.update(count=F("count") + delta)
+
+
+def _instance_values(instance: models.Model) -> Dict[str, Any]:
+    return {
+        field: getattr(instance, field) for field in summary_fields(type(instance))
+    }
+
+
+def _key(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, datetime.date):
+        return value.isoformat()
+    return str(value)
@@ -1,3 +1,1319 @@
+import csv
+import datetime
+import gzip
+import json
+import os
+import shutil
+import tempfile
+import threading
+from io import StringIO
+from typing import List
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import User
+from django.core.cache import cache, caches
+from django.core.exceptions import ValidationError
+from django.core.management import CommandError, call_command
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from drug_insights_hub.accounts.models import Affiliation, UserProfile
+from drug_insights_hub.core import counters
+from drug_insights_hub.core.cache import bump_version
+from drug_insights_hub.core.signals import bulk_created
+from drug_insights_hub.core.testing import QueryPlanTestMixin, query_plan
+from drug_insights_hub.research.autocomplete import (
+    DRUG_NAMES_NAMESPACE,
+    DrugNameIndex,
+    drug_name_index,
+)
+from drug_insights_hub.research.forms import (
+    ClinicalTrialCreationForm,
+    ClinicalTrialUpdateForm,
+    PublicationCreationForm,
+)
+from drug_insights_hub.research.models import ClinicalTrial, Drug, Publication
+from drug_insights_hub.research.object_cache import (
+    OBJECT_CACHE_ALIAS,
+    ObjectCacheStats,
+    object_cache_stats,
+)
+from drug_insights_hub.research.search import search_objects
+from drug_insights_hub.research.summary import read_summary
+
+USER_MODEL = get_user_model()
+
+
+class ResearchTestCase(TestCase):
+    def setUp(self):
+        caches[OBJECT_CACHE_ALIAS].clear()
+        self.affiliation = Affiliation.objects.create(
+            name="Test Affiliation",
+            location="Sofia",
+            description="Test description",
+            website="https://example.com",
+        )
+        self.user = USER_MODEL.objects.create_user(
+            username="test_user",
+            first_name="first_name_test",
+            last_name="last_name_test",
+            password="test_password",
+        )
+        self.user.userprofile.affiliation = self.affiliation
+        self.user.userprofile.save()
+
+        self.drug = Drug.objects.create(
+            proprietary_name="Testamol",
+            international_non_proprietary_name="testamol",
+            affiliated_institution=self.affiliation,
+            description="Test description",
+        )
+
+    def create_users(self, amount: int, prefix: str = "user") -> List[User]:
+        return USER_MODEL.objects.bulk_create(
+            USER_MODEL(
+                username=f"{prefix}_{number}",
+                first_name=f"first_{number}",
+                last_name=f"last_{number}",
+            )
+            for number in range(amount)
+        )
+
+    def create_trials(self, amount: int, prefix: str = "trial") -> List[ClinicalTrial]:
+        return ClinicalTrial.objects.bulk_create(
+            ClinicalTrial(
+                title=f"{prefix}_{number}",
+                drug=self.drug,
+                phase="Phase I",
+                affiliation=self.affiliation,
+                start_date=datetime.date(2024, 1, 1),
+                end_date=datetime.date(2024, 12, 31),
+                description="Test description",
+            )
+            for number in range(amount)
+        )
+
+
+class RelatedObjectsQueryCountTest(ResearchTestCase):
+    def create_publication(self, related_rows: int) -> Publication:
+        publication = Publication.objects.create(
+            title=f"Publication {related_rows}",
+            affiliation=self.affiliation,
+            journal="Test journal",
+        )
+        publication.authors.add(*self.create_users(related_rows, prefix="author"))
+        publication.trials.add(*self.create_trials(related_rows))
+        return publication
+
+    def create_trial(self, related_rows: int) -> ClinicalTrial:
+        trial = self.create_trials(1, prefix="participated_trial")[0]
+        trial.participants.add(*self.create_users(related_rows, prefix="participant"))
+        return trial
+
+    def assert_query_counts(self, related_rows: int) -> None:
+        publication = self.create_publication(related_rows)
+        trial = self.create_trial(related_rows)
+
+        # Cold card cache: page, then cards with their two prefetches.
+        with self.assertNumQueries(5):
+            self.client.get(reverse("index"))
+        with self.assertNumQueries(2):
+            self.client.get(reverse("index"))
+
+        self.client.force_login(self.user)
+        with self.assertNumQueries(6):
+            self.client.get(
+                reverse("publication_details", kwargs={"pk": publication.pk})
+            )
+        with self.assertNumQueries(5):
+            self.client.get(reverse("clinical_trial_details", kwargs={"pk": trial.pk}))
+
+    def test_query_counts_with_10_related_rows(self):
+        self.assert_query_counts(10)
+
+    def test_query_counts_with_1000_related_rows(self):
+        self.assert_query_counts(1000)
+
+
+class AffiliatedObjectLoaderTest(ResearchTestCase):
+    def setUp(self):
+        super().setUp()
+        self.other_affiliation = Affiliation.objects.create(
+            name="Other Affiliation",
+            location="Plovdiv",
+            description="Test description",
+            website="https://example.org",
+        )
+        self.other_drug = Drug.objects.create(
+            proprietary_name="Otheramol",
+            international_non_proprietary_name="otheramol",
+            affiliated_institution=self.other_affiliation,
+            description="Test description",
+        )
+        self.client.force_login(self.user)
+
+    def test_owned_object_is_loaded_in_one_query(self):
+        url = reverse("drug_update", kwargs={"pk": self.drug.pk})
+        with self.assertNumQueries(3):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+
+    def test_foreign_object_is_forbidden(self):
+        for name in ("drug_update", "drug_delete"):
+            response = self.client.get(reverse(name, kwargs={"pk": self.other_drug.pk}))
+            self.assertEqual(response.status_code, 403)
+            self.assertTemplateUsed(response, "errors/error.html")
+
+    def test_missing_object_is_not_found(self):
+        response = self.client.get(reverse("drug_delete", kwargs={"pk": 0}))
+        self.assertContains(response, "Drug not found!", status_code=404)
+
+    def test_details_report_rights(self):
+        response = self.client.get(reverse("drug_details", kwargs={"pk": self.drug.pk}))
+        self.assertTrue(response.context["has_rights"])
+
+        response = self.client.get(
+            reverse("drug_details", kwargs={"pk": self.other_drug.pk})
+        )
+        self.assertFalse(response.context["has_rights"])
+
+
+class FullTextSearchTest(ResearchTestCase):
+    def test_search_ranks_across_models(self):
+        trial = self.create_trials(1, prefix="Cardiology")[0]
+        trial.save()
+        Publication.objects.create(
+            title="Testamol outcomes", affiliation=self.affiliation, journal="Lancet"
+        )
+
+        response = self.client.get(reverse("search"), {"q": "testamol"})
+        kinds = [hit.kind for hit in response.context["results"]]
+        self.assertEqual(sorted(kinds), ["drug", "publication"])
+
+        response = self.client.get(reverse("search"), {"q": "cardiology"})
+        self.assertEqual(
+            [hit.object for hit in response.context["results"]], [trial]
+        )
+
+    def test_search_entries_follow_updates_and_deletes(self):
+        self.drug.proprietary_name = "Renamed"
+        self.drug.international_non_proprietary_name = "renamed"
+        self.drug.save()
+        self.assertFalse(search_objects("testamol"))
+        self.assertEqual(search_objects("renamed")[0].object, self.drug)
+
+        self.drug.delete()
+        self.assertFalse(search_objects("renamed"))
+
+
+class DrugAutocompleteTest(ResearchTestCase):
+    def setUp(self):
+        super().setUp()
+        drug_name_index.build()
+
+    def autocomplete(self, query: str) -> List[str]:
+        response = self.client.get(reverse("drug_autocomplete"), {"q": query})
+        return [result["proprietary_name"] for result in response.json()["results"]]
+
+    def test_prefix_and_misspelled_queries(self):
+        self.assertEqual(self.autocomplete("tes"), ["Testamol"])
+        self.assertEqual(self.autocomplete("Tsetamol"), ["Testamol"])
+        self.assertEqual(self.autocomplete("zzz"), [])
+
+    def test_index_follows_saves_and_deletes(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.drug.proprietary_name = "Curamol"
+            self.drug.save()
+        self.assertEqual(self.autocomplete("cura"), ["Curamol"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.drug.delete()
+        self.assertEqual(self.autocomplete("cura"), [])
+
+    def test_index_replays_changes_from_other_workers(self):
+        self.assertEqual(self.autocomplete("cura"), [])
+        other_worker = DrugNameIndex()
+        other_worker.publish([(self.drug.pk, "Curamol", "curamol")], [])
+
+        with mock.patch.object(drug_name_index, "build") as build:
+            self.assertEqual(self.autocomplete("cura"), ["Curamol"])
+        build.assert_not_called()
+
+        other_worker.publish([], [self.drug.pk])
+        self.assertEqual(self.autocomplete("cura"), [])
+
+    def test_index_is_rebuilt_off_the_request_when_changes_are_missing(self):
+        bump_version(DRUG_NAMES_NAMESPACE)
+        released = threading.Event()
+
+        def rows():
+            released.wait()
+            return [(self.drug.pk, "Curamol", "curamol")]
+
+        with mock.patch.object(drug_name_index, "_rows", side_effect=rows):
+            # The old index answers until the rebuild is done.
+            self.assertEqual(self.autocomplete("tes"), ["Testamol"])
+            released.set()
+            drug_name_index._rebuild.join()
+        self.assertEqual(self.autocomplete("cura"), ["Curamol"])
+
+
+class StreamingApiTest(ResearchTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client.login(username="test_user", password="test_password")
+        self.other_affiliation = Affiliation.objects.create(
+            name="Other Affiliation",
+            location="Plovdiv",
+            description="Other description",
+            website="https://example.org",
+        )
+
+    def stream(self, resource_name: str, **params) -> bytes:
+        response = self.client.get(
+            reverse("api_list", kwargs={"resource_name": resource_name}), params
+        )
+        self.assertTrue(response.streaming)
+        return b"".join(response.streaming_content)
+
+    def test_list_streams_records_with_many_to_many_ids(self):
+        trials = self.create_trials(3)
+        trials[0].participants.add(self.user)
+
+        records = json.loads(self.stream("clinical_trials"))
+        self.assertEqual(
+            [record["title"] for record in records], ["trial_0", "trial_1", "trial_2"]
+        )
+        self.assertEqual(records[0]["participants"], [self.user.pk])
+        self.assertEqual(records[0]["drug"], self.drug.pk)
+        self.assertEqual(records[0]["start_date"], "2024-01-01")
+
+    def test_ndjson_field_selection_and_affiliation_filter(self):
+        Drug.objects.create(
+            proprietary_name="Otheramol",
+            international_non_proprietary_name="otheramol",
+            affiliated_institution=self.other_affiliation,
+            description="Other description",
+        )
+
+        lines = self.stream(
+            "drugs", format="ndjson", fields="id,proprietary_name", affiliation="mine"
+        ).splitlines()
+        self.assertEqual(
+            [json.loads(line) for line in lines],
+            [{"id": self.drug.pk, "proprietary_name": "Testamol"}],
+        )
+
+    def test_queries_are_bounded_by_chunks(self):
+        self.create_trials(50)
+        # session and user, one cursor over the trials and one participants
+        # lookup for each of the three chunks
+        with mock.patch("drug_insights_hub.research.api.API_CHUNK_SIZE", 20):
+            with self.assertNumQueries(6):
+                records = json.loads(self.stream("clinical_trials"))
+        self.assertEqual(len(records), 50)
+
+    async def test_list_streams_from_an_async_iterator_under_asgi(self):
+        trials = await sync_to_async(self.create_trials)(3)
+        await sync_to_async(trials[0].participants.add)(self.user)
+        await self.async_client.aforce_login(self.user)
+
+        # A synchronous iterator would be read into a list before the response
+        # starts.
+        with mock.patch("drug_insights_hub.research.api.API_CHUNK_SIZE", 2):
+            response = await self.async_client.get(
+                reverse("api_list", kwargs={"resource_name": "clinical_trials"})
+            )
+            self.assertTrue(response.is_async)
+            content = b"".join([chunk async for chunk in response.streaming_content])
+        records = json.loads(content)
+        self.assertEqual(
+            [record["title"] for record in records], ["trial_0", "trial_1", "trial_2"]
+        )
+        self.assertEqual(records[0]["participants"], [self.user.pk])
+
+    def test_detail_and_errors(self):
+        response = self.client.get(
+            reverse("api_detail", kwargs={"resource_name": "drugs", "pk": self.drug.pk})
+        )
+        self.assertEqual(response.json()["proprietary_name"], "Testamol")
+
+        response = self.client.get(
+            reverse("api_list", kwargs={"resource_name": "drugs"}), {"fields": "nope"}
+        )
+        self.assertEqual(response.status_code, 400)
+
+        response = self.client.get(
+            reverse("api_detail", kwargs={"resource_name": "drugs", "pk": 0})
+        )
+        self.assertEqual(response.status_code, 404)
+
+        self.client.logout()
+        response = self.client.get(
+            reverse("api_list", kwargs={"resource_name": "drugs"})
+        )
+        self.assertEqual(response.status_code, 401)
+
+
+class ImportResearchCommandTest(ResearchTestCase):
+    def write_file(self, suffix: str, content: str) -> str:
+        handle, path = tempfile.mkstemp(suffix=suffix)
+        with os.fdopen(handle, "w") as stream:
+            stream.write(content)
+        self.addCleanup(os.remove, path)
+        return path
+
+    def test_imports_trials_and_publications_with_relations(self):
+        trials_path = self.write_file(
+            ".csv",
+            "title,drug,phase,affiliation,start_date,end_date,participants\n"
+            "Imported 1,Testamol,Phase I,Test Affiliation,2024-01-01,2024-02-01,"
+            "test_user\n"
+            "Imported 2,Testamol,Phase II,Test Affiliation,2024-03-01,2024-04-01,\n",
+        )
+        publications_path = self.write_file(
+            ".jsonl",
+            json.dumps(
+                {
+                    "title": "Imported publication",
+                    "affiliation": "Test Affiliation",
+                    "journal": "Lancet",
+                    "authors": ["test_user"],
+                    "trials": ["Imported 1", "Imported 2"],
+                }
+            )
+            + "\n",
+        )
+
+        call_command(
+            "import_research", "clinical_trials", trials_path, stdout=StringIO()
+        )
+        call_command(
+            "import_research", "publications", publications_path, stdout=StringIO()
+        )
+
+        trial = ClinicalTrial.objects.get(title="Imported 1")
+        self.assertEqual(list(trial.participants.all()), [self.user])
+        publication = Publication.objects.get(title="Imported publication")
+        self.assertEqual(publication.trials.count(), 2)
+        self.assertEqual(list(publication.authors.all()), [self.user])
+        self.assertEqual(search_objects("imported")[0].kind, "clinical_trial")
+
+    def test_invalid_row_aborts_the_whole_import(self):
+        path = self.write_file(
+            ".csv",
+            "title,drug,phase,affiliation,start_date,end_date\n"
+            "Valid,Testamol,Phase I,Test Affiliation,2024-01-01,2024-02-01\n"
+            "Reversed,Testamol,Phase I,Test Affiliation,2024-02-01,2024-01-01\n",
+        )
+
+        with self.assertRaisesMessage(CommandError, "line 3"):
+            call_command("import_research", "clinical_trials", path, batch_size=1)
+        self.assertFalse(ClinicalTrial.objects.exists())
+
+    def test_too_long_value_aborts_the_whole_import(self):
+        title = "T" * (ClinicalTrial.MAX_TITLE_LENGTH + 1)
+        path = self.write_file(
+            ".csv",
+            "title,drug,phase,affiliation,start_date,end_date\n"
+            "Valid,Testamol,Phase I,Test Affiliation,2024-01-01,2024-02-01\n"
+            f"{title},Testamol,Phase I,Test Affiliation,2024-01-01,2024-02-01\n",
+        )
+
+        with self.assertRaisesMessage(CommandError, "line 3: title is longer"):
+            call_command("import_research", "clinical_trials", path, batch_size=1)
+        self.assertFalse(ClinicalTrial.objects.exists())
+
+
+class ExportResearchCommandTest(ResearchTestCase):
+    def setUp(self):
+        super().setUp()
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def test_exports_gzip_csv_per_affiliation(self):
+        trial = self.create_trials(1)[0]
+        trial.participants.add(self.user)
+
+        call_command(
+            "export_research",
+            self.directory,
+            format="csv",
+            gzip=True,
+            affiliations=[self.affiliation.pk],
+            stdout=StringIO(),
+        )
+
+        path = os.path.join(
+            self.directory, str(self.affiliation.pk), "clinical_trials.csv.gz"
+        )
+        with gzip.open(path, "rt", newline="") as stream:
+            rows = list(csv.DictReader(stream))
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]["title"], "trial_0")
+        self.assertEqual(rows[0]["participants"], str(self.user.pk))
+
+    def test_exports_jsonl_in_chunks(self):
+        self.create_trials(5)
+
+        call_command(
+            "export_research", self.directory, chunk_size=2, stdout=StringIO()
+        )
+
+        with open(os.path.join(self.directory, "clinical_trials.jsonl")) as stream:
+            records = [json.loads(line) for line in stream]
+        self.assertEqual(
+            [record["title"] for record in records],
+            [f"trial_{number}" for number in range(5)],
+        )
+
+
+class HotQueryPlanTest(QueryPlanTestMixin, ResearchTestCase):
+    def setUp(self):
+        super().setUp()
+        Drug.objects.bulk_create(
+            Drug(
+                proprietary_name=f"Drug {number}",
+                international_non_proprietary_name=f"drug {number}",
+                affiliated_institution=self.affiliation,
+                description="Test description",
+            )
+            for number in range(20)
+        )
+        self.trial = self.create_trials(20)[0]
+        self.trial.participants.add(self.user)
+        self.publication = Publication.objects.bulk_create(
+            Publication(
+                title=f"Publication {number}",
+                affiliation=self.affiliation,
+                journal="Test journal",
+            )
+            for number in range(20)
+        )[0]
+        self.publication.authors.add(self.user)
+        self.publication.trials.add(self.trial)
+        self.client.force_login(self.user)
+
+    def assert_pages_use_indexes(self, url: str) -> None:
+        response = self.assert_no_scan_and_sort(lambda: self.client.get(url))
+        next_cursor = response.context["page_obj"].next_cursor
+        self.assertIsNotNone(next_cursor)
+        self.assert_no_scan_and_sort(
+            lambda: self.client.get(url, {"after": next_cursor})
+        )
+
+    def test_list_pages(self):
+        self.assert_pages_use_indexes(reverse("index"))
+        self.assert_pages_use_indexes(reverse("affiliated_drugs_list"))
+        self.assert_pages_use_indexes(reverse("affiliated_clinical_trials_list"))
+        self.assert_pages_use_indexes(reverse("affiliated_publications_list"))
+
+    def test_detail_pages(self):
+        for name, pk in (
+            ("drug_details", self.drug.pk),
+            ("clinical_trial_details", self.trial.pk),
+            ("publication_details", self.publication.pk),
+        ):
+            self.assert_no_scan_and_sort(
+                lambda: self.client.get(reverse(name, kwargs={"pk": pk}))
+            )
+
+
+class AffiliationSummaryTest(ResearchTestCase):
+    def create_trial(self, title: str, end_date: datetime.date) -> ClinicalTrial:
+        return ClinicalTrial.objects.create(
+            title=title,
+            drug=self.drug,
+            phase="Phase I",
+            affiliation=self.affiliation,
+            start_date=datetime.date(2020, 1, 1),
+            end_date=end_date,
+            description="Test description",
+        )
+
+    def test_summary_follows_saves_and_deletes(self):
+        self.create_trial("Finished trial", datetime.date(2020, 6, 1))
+        running = self.create_trial("Running trial", datetime.date(2999, 1, 1))
+        running.phase = "Phase II"
+        running.save()
+        Publication.objects.create(
+            title="Summary publication", affiliation=self.affiliation, journal="Lancet"
+        )
+        self.drug.drug_type = "Generic"
+        self.drug.save(update_fields=["drug_type"])
+
+        summary = read_summary(self.affiliation.pk)
+        self.assertEqual(summary["drug_development_status"], {"Preclinical": 1})
+        self.assertEqual(summary["drug_type"], {"Generic": 1})
+        self.assertEqual(summary["trial_phase"], {"Phase I": 1, "Phase II": 1})
+        self.assertEqual(
+            summary["trial_state"], {"Not started": 0, "Active": 1, "Finished": 1}
+        )
+        self.assertEqual(summary["publication_journal"], {"Lancet": 1})
+
+        running.delete()
+        summary = read_summary(self.affiliation.pk)
+        self.assertEqual(summary["trial_phase"], {"Phase I": 1})
+        call_command("check_affiliation_summary", stdout=StringIO())
+
+    def test_trials_starting_later_are_not_active(self):
+        trial = self.create_trial("Future trial", datetime.date(2999, 6, 1))
+        trial.start_date = datetime.date(2999, 1, 1)
+        trial.save()
+        self.create_trial("Running trial", datetime.date(2999, 1, 1))
+
+        summary = read_summary(self.affiliation.pk)
+        self.assertEqual(
+            summary["trial_state"], {"Not started": 1, "Active": 1, "Finished": 0}
+        )
+        summary = read_summary(self.affiliation.pk, today=datetime.date(2999, 3, 1))
+        self.assertEqual(
+            summary["trial_state"], {"Not started": 0, "Active": 1, "Finished": 1}
+        )
+        call_command("check_affiliation_summary", stdout=StringIO())
+
+    def test_dashboard_reads_the_summary_without_grouping(self):
+        self.create_trial("Finished trial", datetime.date(2020, 6, 1))
+        self.client.force_login(self.user)
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(reverse("affiliation_dashboard"))
+        self.assertEqual(len(context.captured_queries), 3)
+        self.assertFalse(
+            any("GROUP BY" in query["sql"] for query in context.captured_queries)
+        )
+        self.assertIn(
+            (
+                "Clinical trials by state",
+                [("Active", 0), ("Finished", 1), ("Not started", 0)],
+            ),
+            response.context["sections"],
+        )
+
+    def test_checker_reports_and_fixes_drift(self):
+        ClinicalTrial.objects.bulk_create(
+            [
+                ClinicalTrial(
+                    title="Unsignalled trial",
+                    drug=self.drug,
+                    phase="Phase III",
+                    affiliation=self.affiliation,
+                    start_date=datetime.date(2020, 1, 1),
+                    end_date=datetime.date(2020, 6, 1),
+                    description="Test description",
+                )
+            ]
+        )
+
+        output = StringIO()
+        with self.assertRaises(CommandError):
+            call_command("check_affiliation_summary", stdout=output)
+        self.assertIn("'Phase III': stored 0, expected 1", output.getvalue())
+
+        call_command("check_affiliation_summary", fix=True, stdout=StringIO())
+        call_command("check_affiliation_summary", stdout=StringIO())
+
+
+class TrialIntervalTest(ResearchTestCase):
+    def setUp(self):
+        super().setUp()
+        self.first, self.second, self.third = ClinicalTrial.objects.bulk_create(
+            ClinicalTrial(
+                title=title,
+                drug=self.drug,
+                phase="Phase I",
+                affiliation=self.affiliation,
+                start_date=start_date,
+                end_date=end_date,
+                description="Test description",
+            )
+            for title, start_date, end_date in (
+                ("First", datetime.date(2024, 1, 1), datetime.date(2024, 1, 10)),
+                ("Second", datetime.date(2024, 1, 5), datetime.date(2024, 1, 20)),
+                ("Third", datetime.date(2024, 2, 1), datetime.date(2024, 2, 5)),
+            )
+        )
+
+    def test_active_on_and_between(self):
+        self.assertEqual(
+            set(ClinicalTrial.objects.active_on(datetime.date(2024, 1, 7))),
+            {self.first, self.second},
+        )
+        self.assertEqual(
+            set(
+                ClinicalTrial.objects.active_between(
+                    datetime.date(2024, 1, 15), datetime.date(2024, 2, 2)
+                )
+            ),
+            {self.second, self.third},
+        )
+
+    def test_active_on_uses_an_index(self):
+        queryset = ClinicalTrial.objects.active_on(datetime.date(2024, 1, 7))
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            plan = query_plan(
+                connection.ops.last_executed_query(cursor, sql, params)
+            )
+        self.assertFalse(
+            any(
+                step.startswith(("SCAN research_clinicaltrial", "Seq Scan"))
+                and " USING " not in step
+                for step in plan
+            ),
+            plan,
+        )
+
+    def test_timeline_counts_active_trials_per_day(self):
+        response = self.client.get(
+            reverse("clinical_trial_timeline"),
+            {"start": "2023-12-31", "end": "2024-02-05"},
+        )
+        active = response.json()["active"]
+        self.assertEqual(len(active), 37)
+        expected = {
+            "2023-12-31": 0,
+            "2024-01-01": 1,
+            "2024-01-05": 2,
+            "2024-01-10": 2,
+            "2024-01-11": 1,
+            "2024-01-20": 1,
+            "2024-01-21": 0,
+            "2024-02-01": 1,
+            "2024-02-05": 1,
+        }
+        for day, count in expected.items():
+            offset = datetime.date.fromisoformat(day) - datetime.date(2023, 12, 31)
+            self.assertEqual(active[offset.days], count, day)
+
+    def test_timeline_rejects_invalid_ranges(self):
+        for params in ({"start": "2024-02-01", "end": "2024-01-01"}, {"start": "x"}):
+            response = self.client.get(reverse("clinical_trial_timeline"), params)
+            self.assertEqual(response.status_code, 400)
+
+
+class ParticipantPickerTest(ResearchTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.user)
+
+    def test_creation_page_does_not_render_every_user(self):
+        self.create_users(300)
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(reverse("clinical_trial_creation"))
+        self.assertNotContains(response, "user_299")
+        self.assertContains(response, "data-lookup-url")
+        user_queries = [
+            query["sql"]
+            for query in context.captured_queries
+            if 'FROM "auth_user"' in query["sql"]
+        ]
+        self.assertTrue(all("LIMIT" in sql for sql in user_queries), user_queries)
+
+    def test_selected_participants_are_rendered_and_validated_in_one_query(self):
+        users = self.create_users(3)
+        form = ClinicalTrialUpdateForm(
+            instance=self.create_trials(1)[0],
+            data={
+                "title": "Picked",
+                "phase": "Phase I",
+                "start_date": "2024-01-01",
+                "end_date": "2024-02-01",
+                "description": "Test description",
+                "participants": [str(user.pk) for user in users[:2]],
+            },
+        )
+
+        with self.assertNumQueries(1):
+            participants = form.fields["participants"].clean(
+                [str(user.pk) for user in users[:2]]
+            )
+        self.assertEqual(set(participants), set(users[:2]))
+
+        rendered = str(form["participants"])
+        self.assertIn(users[0].username, rendered)
+        self.assertNotIn(users[2].username, rendered)
+
+        form = ClinicalTrialUpdateForm(data={"participants": ["0", "abc"]})
+        self.assertFalse(form.is_valid())
+        self.assertIn("participants", form.errors)
+
+    def test_user_lookup_is_paginated(self):
+        self.create_users(25, prefix="picker")
+
+        response = self.client.get(reverse("user_lookup"), {"q": "picker"})
+        first_page = response.json()
+        self.assertEqual(len(first_page["results"]), 20)
+        self.assertIsNotNone(first_page["next"])
+
+        response = self.client.get(
+            reverse("user_lookup"), {"q": "picker", "after": first_page["next"]}
+        )
+        second_page = response.json()
+        self.assertEqual(len(second_page["results"]), 5)
+        self.assertIsNone(second_page["next"])
+
+    def test_user_lookup_matches_name_prefixes(self):
+        USER_MODEL.objects.create_user(
+            username="ada", first_name="Ada", last_name="Lovelace"
+        )
+
+        for query, usernames in (("love", ["ada"]), ("ADA", ["ada"]), ("ove", [])):
+            with self.subTest(query=query):
+                response = self.client.get(reverse("user_lookup"), {"q": query})
+                self.assertEqual(
+                    [result["text"] for result in response.json()["results"]],
+                    usernames,
+                )
+
+    def test_trial_lookup_filters_by_title(self):
+        self.create_trials(3, prefix="lookup")
+
+        response = self.client.get(reverse("clinical_trial_lookup"), {"q": "lookup_1"})
+        self.assertEqual(
+            [result["text"] for result in response.json()["results"]], ["lookup_1"]
+        )
+
+
+class AffiliationChoicesTest(ResearchTestCase):
+    def setUp(self):
+        cache.clear()
+        super().setUp()
+        self.other_affiliation = Affiliation.objects.create(
+            name="Other Affiliation",
+            location="Plovdiv",
+            description="Test description",
+            website="https://example.org",
+        )
+        self.other_drug = Drug.objects.create(
+            proprietary_name="Otheramol",
+            international_non_proprietary_name="otheramol",
+            affiliated_institution=self.other_affiliation,
+            description="Test description",
+        )
+        self.user = USER_MODEL.objects.select_related("userprofile__affiliation").get(
+            pk=self.user.pk
+        )
+
+    def render_choices(self, form) -> str:
+        return str(form["drug"]) + str(form["affiliation"])
+
+    def test_choices_are_limited_to_the_users_affiliation(self):
+        rendered = self.render_choices(ClinicalTrialCreationForm(user=self.user))
+        self.assertIn("Testamol", rendered)
+        self.assertIn("Test Affiliation", rendered)
+        self.assertNotIn("Otheramol", rendered)
+        self.assertNotIn("Other Affiliation", rendered)
+
+        form = ClinicalTrialCreationForm(
+            user=self.user,
+            data={
+                "title": "Foreign drug",
+                "drug": str(self.other_drug.pk),
+                "phase": "Phase I",
+                "start_date": "2024-01-01",
+                "end_date": "2024-02-01",
+                "description": "Test description",
+                "participants": [str(self.user.pk)],
+            },
+        )
+        self.assertFalse(form.is_valid())
+        self.assertIn("drug", form.errors)
+
+    def test_cached_choices_render_without_queries(self):
+        self.render_choices(ClinicalTrialCreationForm(user=self.user))
+
+        with self.assertNumQueries(0):
+            form = ClinicalTrialCreationForm(user=self.user)
+            rendered = self.render_choices(form)
+        self.assertIn("Testamol", rendered)
+
+    def test_changes_invalidate_cached_choices(self):
+        self.render_choices(ClinicalTrialCreationForm(user=self.user))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Drug.objects.create(
+                proprietary_name="Newamol",
+                international_non_proprietary_name="newamol",
+                affiliated_institution=self.affiliation,
+                description="Test description",
+            )
+            self.affiliation.name = "Renamed Affiliation"
+            self.affiliation.save()
+
+        rendered = self.render_choices(ClinicalTrialCreationForm(user=self.user))
+        self.assertIn("Newamol", rendered)
+        self.assertIn("Renamed Affiliation", rendered)
+
+    def test_moved_drug_leaves_the_old_affiliations_choices(self):
+        self.render_choices(ClinicalTrialCreationForm(user=self.user))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.drug.affiliated_institution = self.other_affiliation
+            self.drug.save(update_fields=["affiliated_institution"])
+
+        rendered = self.render_choices(ClinicalTrialCreationForm(user=self.user))
+        self.assertNotIn("Testamol", rendered)
+
+    def test_publication_trials_are_limited_to_the_users_affiliation(self):
+        trial = self.create_trials(1)[0]
+        other_trial = ClinicalTrial.objects.create(
+            title="Other trial",
+            drug=self.other_drug,
+            phase="Phase I",
+            affiliation=self.other_affiliation,
+            start_date=datetime.date(2024, 1, 1),
+            end_date=datetime.date(2024, 12, 31),
+            description="Test description",
+        )
+
+        trials = PublicationCreationForm(user=self.user).fields["trials"]
+        self.assertEqual(trials.clean([str(trial.pk)]).get(), trial)
+        with self.assertRaises(ValidationError):
+            trials.clean([str(other_trial.pk)])
+
+        self.client.force_login(self.user)
+        response = self.client.get(
+            reverse("clinical_trial_lookup"), {"q": "trial"}
+        )
+        self.assertEqual(
+            [result["text"] for result in response.json()["results"]], ["trial_0"]
+        )
+
+
+class AsyncViewTest(ResearchTestCase):
+    def setUp(self):
+        super().setUp()
+        self.trial = self.create_trials(1)[0]
+        self.publication = Publication.objects.create(
+            title="Async publication",
+            affiliation=self.affiliation,
+            journal="Test journal",
+        )
+        self.publication.trials.add(self.trial)
+        self.async_client.force_login(self.user)
+
+    async def test_read_views_render_under_asgi(self):
+        urls = [
+            reverse("index"),
+            reverse("affiliated_drugs_list"),
+            reverse("affiliated_clinical_trials_list"),
+            reverse("affiliated_publications_list"),
+            reverse("drug_details", kwargs={"pk": self.drug.pk}),
+            reverse("clinical_trial_details", kwargs={"pk": self.trial.pk}),
+            reverse("publication_details", kwargs={"pk": self.publication.pk}),
+        ]
+        for url in urls:
+            with self.subTest(url=url):
+                response = await self.async_client.get(url)
+                self.assertEqual(response.status_code, 200)
+
+        response = await self.async_client.get(reverse("affiliated_publications_list"))
+        self.assertContains(response, "Async publication")
+
+    async def test_async_views_keep_access_checks(self):
+        await self.async_client.alogout()
+        response = await self.async_client.get(reverse("affiliated_drugs_list"))
+        self.assertEqual(response.status_code, 302)
+        self.assertIn(reverse("login"), response.url)
+
+        response = await self.async_client.get(
+            reverse("drug_details", kwargs={"pk": 0})
+        )
+        self.assertContains(response, "Drug not found!", status_code=404)
+
+
+class ObjectCacheTest(ResearchTestCase):
+    def setUp(self):
+        super().setUp()
+        object_cache_stats.reset()
+        self.trial = self.create_trials(1)[0]
+        self.participant = self.create_users(1, prefix="participant")[0]
+        self.trial.participants.add(self.participant)
+        self.publication = Publication.objects.create(
+            title="Cached publication",
+            affiliation=self.affiliation,
+            journal="Test journal",
+        )
+        self.publication.trials.add(self.trial)
+        self.trial_url = reverse("clinical_trial_details", kwargs={"pk": self.trial.pk})
+
+    def test_repeated_views_are_served_from_the_cache(self):
+        drug_url = reverse("drug_details", kwargs={"pk": self.drug.pk})
+        for url in (drug_url, self.trial_url):
+            self.client.get(url)
+            # Only the updated_at lookup for the ETag.
+            with self.assertNumQueries(1):
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertFalse(response.context["has_rights"])
+
+        self.client.force_login(self.user)
+        response = self.client.get(drug_url)
+        self.assertTrue(response.context["has_rights"])
+
+    def test_changes_bump_the_object_version(self):
+        self.client.get(self.trial_url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.trial.title = "Renamed trial"
+            self.trial.save()
+        self.assertContains(self.client.get(self.trial_url), "Renamed trial")
+
+        newcomer = USER_MODEL.objects.create_user(
+            username="newcomer", first_name="Newcomer", last_name="Person"
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            newcomer.clinicaltrial_set.add(self.trial)
+        self.assertContains(self.client.get(self.trial_url), "Newcomer Person")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            newcomer.clinicaltrial_set.clear()
+        self.assertNotContains(self.client.get(self.trial_url), "Newcomer Person")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            newcomer.first_name = "Renamed"
+            newcomer.save()
+            self.trial.participants.add(newcomer)
+        self.assertContains(self.client.get(self.trial_url), "Renamed Person")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.drug.proprietary_name = "Renamed drug"
+            self.drug.save()
+        self.assertContains(self.client.get(self.trial_url), "Renamed drug")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.affiliation.name = "Renamed affiliation"
+            self.affiliation.save()
+        self.assertContains(self.client.get(self.trial_url), "Renamed affiliation")
+
+    def test_changes_saved_by_another_process_are_not_served(self):
+        self.client.get(self.trial_url)
+
+        # Another worker's save: its version bump never reaches this process.
+        ClinicalTrial.objects.filter(pk=self.trial.pk).update(
+            title="Renamed elsewhere", updated_at=timezone.now()
+        )
+        self.assertContains(self.client.get(self.trial_url), "Renamed elsewhere")
+
+    def test_related_trial_changes_reach_publication_pages(self):
+        url = reverse("publication_details", kwargs={"pk": self.publication.pk})
+        self.client.force_login(self.user)
+        self.client.get(url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.trial.title = "Retitled trial"
+            self.trial.save()
+        self.assertContains(self.client.get(url), "Retitled trial")
+
+    def test_saves_without_shown_changes_leave_other_pages_alone(self):
+        self.affiliation.description = "Changed description"
+        self.trial.description = "Changed description"
+        self.participant.email = "participant@example.com"
+        for obj in (self.affiliation, self.trial, self.participant):
+            with CaptureQueriesContext(connection) as queries:
+                obj.save()
+            updates = [
+                query["sql"] for query in queries if query["sql"].startswith("UPDATE")
+            ]
+            self.assertEqual(len(updates), 1, updates)
+            self.assertIn(obj._meta.db_table, updates[0])
+
+        # Nothing to compare against needs reading either.
+        with self.assertNumQueries(1):
+            self.participant.save(update_fields=["last_login"])
+
+    def test_affiliation_renames_reach_pages_without_touching_rows(self):
+        etag = self.client.get(self.trial_url)["ETag"]
+        updated_at = ClinicalTrial.objects.get(pk=self.trial.pk).updated_at
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.affiliation.name = "Renamed affiliation"
+            self.affiliation.save()
+        response = self.client.get(self.trial_url, headers={"if-none-match": etag})
+        self.assertContains(response, "Renamed affiliation")
+        self.assertEqual(
+            ClinicalTrial.objects.get(pk=self.trial.pk).updated_at, updated_at
+        )
+
+    def test_hit_counts_are_shared_between_processes(self):
+        self.client.get(self.trial_url)
+        self.client.get(self.trial_url)
+
+        # Another process: its own object cache and no pending counts.
+        caches[OBJECT_CACHE_ALIAS].clear()
+        stats = ObjectCacheStats().read()
+        self.assertEqual(stats["research.clinicaltrial"], (1, 1))
+
+    def test_file_backend_and_hit_ratio(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        file_cache = {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": directory,
+        }
+        caches_setting = {
+            alias: file_cache for alias in ("default", "objects", "versions")
+        }
+        with self.settings(CACHES=caches_setting):
+            for _ in range(4):
+                self.client.get(self.trial_url)
+            with self.captureOnCommitCallbacks(execute=True):
+                self.trial.save()
+            self.client.get(self.trial_url)
+
+            # Flushed as each request finished.
+            stats = object_cache_stats.read()
+            self.assertEqual(stats["research.clinicaltrial"], (3, 2))
+            out = StringIO()
+            call_command("object_cache_stats", stdout=out)
+            self.assertIn("research.clinicaltrial: 3 hits, 2 misses", out.getvalue())
+
+
+class ConditionalGetTest(ResearchTestCase):
+    def setUp(self):
+        super().setUp()
+        self.trial = self.create_trials(1)[0]
+        self.trial_url = reverse("clinical_trial_details", kwargs={"pk": self.trial.pk})
+
+    def test_unchanged_detail_page_is_not_modified(self):
+        response = self.client.get(self.trial_url)
+        self.assertTrue(response.has_header("ETag"))
+        self.assertTrue(response.has_header("Last-Modified"))
+
+        with self.assertNumQueries(1), self.assertTemplateNotUsed(
+            "research/clinical_trials/clinical_trial_details.html"
+        ):
+            response = self.client.get(
+                self.trial_url, headers={"if-none-match": response["ETag"]}
+            )
+        self.assertEqual(response.status_code, 304)
+
+        response = self.client.get(
+            self.trial_url, headers={"if-modified-since": response["Last-Modified"]}
+        )
+        self.assertEqual(response.status_code, 304)
+
+    def test_changes_produce_a_new_etag(self):
+        etag = self.client.get(self.trial_url)["ETag"]
+
+        self.trial.participants.add(self.create_users(1)[0])
+        response = self.client.get(self.trial_url, headers={"if-none-match": etag})
+        self.assertEqual(response.status_code, 200)
+        etag = response["ETag"]
+
+        self.drug.proprietary_name = "Renamed drug"
+        self.drug.save()
+        response = self.client.get(self.trial_url, headers={"if-none-match": etag})
+        self.assertEqual(response.status_code, 200)
+
+    def test_etag_depends_on_the_viewer(self):
+        anonymous = self.client.get(self.trial_url)
+
+        self.client.force_login(self.user)
+        response = self.client.get(
+            self.trial_url, headers={"if-none-match": anonymous["ETag"]}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.context["has_rights"])
+        self.assertFalse(response.has_header("Last-Modified"))
+
+    def test_list_page_is_not_modified_until_the_list_changes(self):
+        self.client.force_login(self.user)
+        url = reverse("affiliated_clinical_trials_list")
+        etag = self.client.get(url)["ETag"]
+
+        response = self.client.get(url, headers={"if-none-match": etag})
+        self.assertEqual(response.status_code, 304)
+
+        # The versions are bumped on commit.
+        with self.captureOnCommitCallbacks(execute=True):
+            trial = self.create_trials(1, prefix="another")[0]
+            bulk_created.send(sender=ClinicalTrial, instances=[trial])
+        response = self.client.get(url, headers={"if-none-match": etag})
+        self.assertEqual(response.status_code, 200)
+        etag = response["ETag"]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ClinicalTrial.objects.filter(title="another_0").delete()
+        response = self.client.get(url, headers={"if-none-match": etag})
+        self.assertEqual(response.status_code, 200)
+        etag = response["ETag"]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.drug.proprietary_name = "Renamed drug"
+            self.drug.save()
+        response = self.client.get(url, headers={"if-none-match": etag})
+        self.assertEqual(response.status_code, 200)
+
+    def test_list_validators_run_no_queries(self):
+        self.client.force_login(self.user)
+        url = reverse("affiliated_clinical_trials_list")
+        etag = self.client.get(url)["ETag"]
+
+        # Session and user only.
+        with self.assertNumQueries(2):
+            response = self.client.get(url, headers={"if-none-match": etag})
+        self.assertEqual(response.status_code, 304)
+
+
+class SeedResearchCommandTest(ResearchTestCase):
+    def seed(self, prefix: str) -> None:
+        call_command(
+            "seed_research",
+            affiliations=2,
+            users=30,
+            drugs=5,
+            trials=6,
+            publications=4,
+            participants=(5, 10),
+            prefix=prefix,
+            stdout=StringIO(),
+        )
+
+    def seeded_trials(self, prefix: str):
+        return ClinicalTrial.objects.filter(title__startswith=prefix).order_by("pk")
+
+    def test_seeds_profiles_and_consistent_trials(self):
+        self.seed("first")
+
+        users = USER_MODEL.objects.filter(username__startswith="first_")
+        self.assertEqual(users.count(), 60)
+        self.assertEqual(
+            UserProfile.objects.filter(
+                user__in=users, affiliation__name__startswith="first"
+            ).count(),
+            60,
+        )
+
+        phases = [phase for phase, _ in ClinicalTrial.CHOICES_PHASE_STATUS]
+        trials = self.seeded_trials("first").select_related("drug")
+        self.assertEqual(len(trials), 12)
+        for trial in trials.prefetch_related("participants"):
+            self.assertLessEqual(trial.start_date, trial.end_date)
+            self.assertLessEqual(
+                phases.index(trial.phase), phases.index(trial.drug.development_status)
+            )
+            self.assertEqual(trial.affiliation_id, trial.drug.affiliated_institution_id)
+            self.assertTrue(5 <= trial.participants.count() <= 10)
+            self.assertTrue(
+                all(
+                    participant.userprofile.affiliation_id == trial.affiliation_id
+                    for participant in trial.participants.all()
+                )
+            )
+
+        affiliation = Affiliation.objects.get(name="first affiliation 0")
+        self.assertEqual(sum(read_summary(affiliation.pk)["trial_phase"].values()), 6)
+
+    def test_counters_are_applied_after_the_affiliation_transactions(self):
+        counters.rebuild()
+        before = counters.read_counters()
+        with CaptureQueriesContext(connection) as queries:
+            self.seed("first")
+
+        # Worker transactions must not lock the shared counter rows; the
+        # deltas land in one transaction after the last seeded row.
+        statements = [query["sql"] for query in queries.captured_queries]
+        first_counter = next(
+            number
+            for number, sql in enumerate(statements)
+            if "core_statscounter" in sql
+        )
+        self.assertFalse(
+            any("INSERT INTO" in sql for sql in statements[first_counter:])
+        )
+        after = counters.read_counters()
+        self.assertEqual(after["users"] - before["users"], 60)
+        self.assertEqual(after["clinical_trials"] - before["clinical_trials"], 12)
+
+    def test_same_seed_gives_the_same_data(self):
+        self.seed("first")
+        self.seed("second")
+
+        def shape(prefix):
+            return [
+                (
+                    trial.phase,
+                    trial.start_date,
+                    trial.end_date,
+                    trial.participants.count(),
+                )
+                for trial in self.seeded_trials(prefix)
+            ]
+
+        self.assertEqual(shape("first"), shape("second"))
+
+
+class AdminQueryBudgetTest(ResearchTestCase):
+    # Session and user, the count, the page, then the list filter choices.
+    QUERY_BUDGETS = {
+        "research_drug": 5,
+        # Also the two date hierarchy queries.
+        "research_clinicaltrial": 7,
+        "research_publication": 5,
+    }
+
+    def setUp(self):
+        super().setUp()
+        self.user.is_staff = True
+        self.user.is_superuser = True
+        self.user.save()
+        self.client.force_login(self.user)
+
+    def create_rows(self, amount: int) -> None:
+        Drug.objects.bulk_create(
+            Drug(
+                proprietary_name=f"Drug {number}",
+                international_non_proprietary_name=f"drug {number}",
+                affiliated_institution=Affiliation.objects.create(
+                    name=f"Affiliation {number}",
+                    location="Sofia",
+                    description="Test description",
+                    website="https://example.com",
+                ),
+                description="Test description",
+            )
+            for number in range(amount)
+        )
+        self.create_trials(amount)
+        Publication.objects.bulk_create(
+            Publication(
+                title=f"Publication {number}",
+                affiliation=self.affiliation,
+                journal="Test journal",
+            )
+            for number in range(amount)
+        )
+        counters.rebuild()
+
+    def assert_query_budgets(self, rows: int) -> None:
+        self.create_rows(rows)
+        for name, budget in self.QUERY_BUDGETS.items():
+            url = reverse(f"admin:{name}_changelist")
+            for params in ({}, {"q": "1"}):
+                with self.subTest(name, **params), self.assertNumQueries(budget):
+                    response = self.client.get(url, params)
+                    self.assertEqual(response.status_code, 200)
+
+    def test_query_budgets_with_5_rows(self):
+        self.assert_query_budgets(5)
+
+    def test_query_budgets_with_a_full_page(self):
+        self.assert_query_budgets(100)
+
+    def test_unfiltered_lists_use_the_stats_counters(self):
+        self.create_rows(5)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("admin:research_drug_changelist"))
 
-# Create your tests here.
+        self.assertEqual(response.context["cl"].result_count, 6)
+        self.assertFalse(
+            any("COUNT(" in query["sql"].upper() for query in queries.captured_queries)
+        )
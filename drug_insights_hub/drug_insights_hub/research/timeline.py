@@ -0,0 +1,32 @@
+import datetime
+from typing import List, Tuple
+
+import numpy as np
+from django.db.models import QuerySet
+
+MAX_TIMELINE_DAYS: int = 3660
+
+
+def active_trials_per_day(
+    trials: QuerySet, start: datetime.date, end: datetime.date
+) -> np.ndarray:
+    days: int = (end - start).days + 1
+    periods: List[Tuple[datetime.date, datetime.date]] = list(
+        trials.active_between(start, end)
+        .order_by()
+        .values_list("start_date", "end_date")
+    )
+    if not periods:
+        return np.zeros(days, dtype=np.int64)
+
+    dates: np.ndarray = np.array(periods, dtype="datetime64[D]")
+    origin: np.datetime64 = np.datetime64(start, "D")
+    # Offsets of each trial's first and one-past-last active day, clipped to
+    # the window; every trial overlaps it, so both land in [0, days].
+    first: np.ndarray = np.clip((dates[:, 0] - origin).astype(np.int64), 0, days)
+    after: np.ndarray = np.clip((dates[:, 1] - origin).astype(np.int64) + 1, 0, days)
+
+    changes: np.ndarray = np.bincount(first, minlength=days + 1) - np.bincount(
+        after, minlength=days + 1
+    )
+    return np.cumsum(changes[:days])
@@ -1,13 +1,18 @@
 from django.urls import include, path
 
+from drug_insights_hub.research.api import api_detail, api_list
 from drug_insights_hub.research.views import (
     affiliated_clinical_trials_list,
     affiliated_drugs_list,
     affiliated_publications_list,
+    affiliation_dashboard,
     clinical_trial_creation,
     clinical_trial_delete,
     clinical_trial_details,
+    clinical_trial_lookup,
+    clinical_trial_timeline,
     clinical_trial_update,
+    drug_autocomplete,
     drug_creation,
     drug_delete,
     drug_details,
@@ -16,14 +21,27 @@ from drug_insights_hub.research.views import (
     publication_delete,
     publication_details,
     publication_update,
+    search,
 )
 
 urlpatterns = [
+    path("search/", search, name="search"),
+    path("dashboard/", affiliation_dashboard, name="affiliation_dashboard"),
+    path(
+        "api/<str:resource_name>/",
+        include(
+            [
+                path("", api_list, name="api_list"),
+                path("<int:pk>/", api_detail, name="api_detail"),
+            ]
+        ),
+    ),
     path(
         "drugs/",
         include(
             [
                 path("create/", drug_creation, name="drug_creation"),
+                path("autocomplete/", drug_autocomplete, name="drug_autocomplete"),
                 path(
                     "affiliated_drugs_list/",
                     affiliated_drugs_list,
@@ -49,6 +67,10 @@ urlpatterns = [
                 path(
                     "create/", clinical_trial_creation, name="clinical_trial_creation"
                 ),
+                path("lookup/", clinical_trial_lookup, name="clinical_trial_lookup"),
+                path(
+                    "timeline/", clinical_trial_timeline, name="clinical_trial_timeline"
+                ),
                 path(
                     "affiliated_clinical_trials_list/",
                     affiliated_clinical_trials_list,
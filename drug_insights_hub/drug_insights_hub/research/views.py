@@ -1,11 +1,18 @@
-from django.contrib.auth.decorators import login_required
-from django.core.exceptions import PermissionDenied
-from django.core.paginator import Page, Paginator
+import datetime
+from typing import Dict, List, Tuple
+
+from django.core.paginator import Page
 from django.db.models import QuerySet
-from django.http import Http404, HttpRequest, HttpResponse
-from django.shortcuts import get_object_or_404, redirect, render
+from django.http import HttpRequest, HttpResponse, JsonResponse
+from django.shortcuts import redirect, render
 
 from drug_insights_hub.accounts.models import Affiliation
+from drug_insights_hub.core.decorators import conditional, login_required
+from drug_insights_hub.core.lookups import lookup_response
+from drug_insights_hub.core.pagination import KeysetPage, apaginate
+from drug_insights_hub.errors.exceptions import NoAffiliation
+from drug_insights_hub.research.autocomplete import drug_name_index
+from drug_insights_hub.research.conditional import detail_validators, list_validators
 from drug_insights_hub.research.forms import (
     ClinicalTrialCreationForm,
     ClinicalTrialDeleteForm,
@@ -17,18 +24,28 @@ from drug_insights_hub.research.forms import (
     PublicationDeleteForm,
     PublicationUpdateForm,
 )
+from drug_insights_hub.research.loaders import affiliated_object
 from drug_insights_hub.research.models import ClinicalTrial, Drug, Publication
+from drug_insights_hub.research.search import SearchHit, search_objects
+from drug_insights_hub.research.summary import read_summary
+from drug_insights_hub.research.timeline import (
+    MAX_TIMELINE_DAYS,
+    active_trials_per_day,
+)
+
+DASHBOARD_SECTIONS: Tuple[Tuple[str, str], ...] = (
+    ("drug_development_status", "Drugs by development status"),
+    ("drug_type", "Drugs by type"),
+    ("trial_phase", "Clinical trials by phase"),
+    ("trial_state", "Clinical trials by state"),
+    ("publication_journal", "Publications by journal"),
+)
 
 
 @login_required
 def drug_creation(request: HttpRequest) -> HttpResponse:
     form: DrugCreationForm = DrugCreationForm(request.POST or None, user=request.user)
-    try:
-        affiliation_variable: Affiliation = affiliation_getter(request=request)
-    except PermissionDenied as e:
-        request.session["error_message"] = str(e)
-        request.session["status_code"] = 403
-        return redirect("error")
+    affiliation_variable: Affiliation = affiliation_getter(request=request)
 
     if form.is_valid():
         drug: Drug = form.save(commit=False)
@@ -47,28 +64,16 @@ def drug_creation(request: HttpRequest) -> HttpResponse:
 
 
 @login_required
-def drug_update(request: HttpRequest, pk: int) -> HttpResponse:
-    try:
-        drug: Drug = get_object_or_404(Drug, id=pk)
-    except Http404:
-        request.session["error_message"] = "Drug not found!"
-        request.session["status_code"] = 404
-        return redirect("error")
-
-    try:
-        user_affiliation: Affiliation = affiliation_getter(request=request)
-    except PermissionDenied as e:
-        request.session["error_message"] = str(e)
-        request.session["status_code"] = 403
-        return redirect("error")
-
-    if user_affiliation != drug.affiliated_institution:
-        request.session["error_message"] = (
-            "Your affiliation doesn't match the drug's affiliation, so you lack permission!"
-        )
-        request.session["status_code"] = 403
-        return redirect("error")
-
+@affiliated_object(
+    Drug,
+    affiliation_field="affiliated_institution",
+    not_found_message="Drug not found!",
+    forbidden_message=(
+        "Your affiliation doesn't match the drug's affiliation, "
+        "so you lack permission!"
+    ),
+)
+def drug_update(request: HttpRequest, drug: Drug) -> HttpResponse:
     form: DrugUpdateForm = DrugUpdateForm(request.POST or None, instance=drug)
     if form.is_valid():
         form.save()
@@ -77,33 +82,21 @@ def drug_update(request: HttpRequest, pk: int) -> HttpResponse:
         return render(
             request=request,
             template_name="research/drugs/drug_update.html",
-            context={"form": form, "drug": drug, "pk": pk, "logged": True},
+            context={"form": form, "drug": drug, "pk": drug.pk, "logged": True},
         )
 
 
 @login_required
-def drug_delete(request: HttpRequest, pk: int) -> HttpResponse:
-    try:
-        drug: Drug = get_object_or_404(Drug, id=pk)
-    except Http404:
-        request.session["error_message"] = "Drug not found!"
-        request.session["status_code"] = 404
-        return redirect("error")
-
-    try:
-        user_affiliation: Affiliation = affiliation_getter(request=request)
-    except PermissionDenied as e:
-        request.session["error_message"] = str(e)
-        request.session["status_code"] = 403
-        return redirect("error")
-
-    if user_affiliation != drug.affiliated_institution:
-        request.session["error_message"] = (
-            "Your affiliation doesn't match the drug's affiliation, so you lack permission!"
-        )
-        request.session["status_code"] = 403
-        return redirect("error")
-
+@affiliated_object(
+    Drug,
+    affiliation_field="affiliated_institution",
+    not_found_message="Drug not found!",
+    forbidden_message=(
+        "Your affiliation doesn't match the drug's affiliation, "
+        "so you lack permission!"
+    ),
+)
+def drug_delete(request: HttpRequest, drug: Drug) -> HttpResponse:
     form: DrugDeleteForm = DrugDeleteForm(request.POST or None, instance=drug)
     if form.is_valid():
         drug.delete()
@@ -112,28 +105,22 @@ def drug_delete(request: HttpRequest, pk: int) -> HttpResponse:
         return render(
             request=request,
             template_name="research/drugs/drug_delete.html",
-            context={"form": form, "pk": pk, "logged": True},
+            context={"form": form, "pk": drug.pk, "logged": True},
         )
 
 
 @login_required
-def affiliated_drugs_list(request: HttpRequest) -> HttpResponse:
-    try:
-        user_affiliation: Affiliation = affiliation_getter(request=request)
-    except PermissionDenied as e:
-        request.session["error_message"] = str(e)
-        request.session["status_code"] = 403
-        return redirect("error")
-
-    drugs: QuerySet[Drug] = (
-        Drug.objects.filter(affiliated_institution=user_affiliation)
-        .order_by("proprietary_name")
-        .all()
+@conditional(list_validators(Drug))
+async def affiliated_drugs_list(request: HttpRequest) -> HttpResponse:
+    user_affiliation: Affiliation = affiliation_getter(request=request)
+
+    drugs: QuerySet[Drug] = Drug.objects.with_related().filter(
+        affiliated_institution=user_affiliation
     )
     per_page: int = 9
-    paginator: Paginator = Paginator(drugs, per_page=per_page)
-    page_number: int = request.GET.get("page")
-    page_obj: Page = paginator.get_page(page_number)
+    page_obj: KeysetPage | Page = await apaginate(
+        request, drugs, per_page=per_page, ordering=("proprietary_name",)
+    )
     return render(
         request=request,
         template_name="research/drugs/affiliated_drugs_list.html",
@@ -141,21 +128,17 @@ def affiliated_drugs_list(request: HttpRequest) -> HttpResponse:
     )
 
 
-def drug_details(request: HttpRequest, pk: int) -> HttpResponse:
-    try:
-        drug: Drug = get_object_or_404(Drug, pk=pk)
-    except Http404:
-        request.session["error_message"] = "Drug not found!"
-        request.session["status_code"] = 404
-        return redirect("error")
-
-    has_rights: bool = False
-    logged: bool = False
-    if request.user.is_authenticated:
-        logged = True
-        user_affiliation: Affiliation = request.user.userprofile.affiliation
-        if user_affiliation == drug.affiliated_institution:
-            has_rights = True
+@conditional(detail_validators(Drug))
+@affiliated_object(
+    Drug.objects.with_related(),
+    affiliation_field="affiliated_institution",
+    not_found_message="Drug not found!",
+    require_affiliation=False,
+    cached=True,
+)
+async def drug_details(request: HttpRequest, drug: Drug) -> HttpResponse:
+    has_rights: bool = drug.is_affiliated
+    logged: bool = request.user.is_authenticated
 
     return render(
         request=request,
@@ -169,12 +152,7 @@ def clinical_trial_creation(request: HttpRequest) -> HttpResponse:
     form: ClinicalTrialCreationForm = ClinicalTrialCreationForm(
         request.POST or None, user=request.user
     )
-    try:
-        affiliation_variable: Affiliation = affiliation_getter(request=request)
-    except PermissionDenied as e:
-        request.session["error_message"] = str(e)
-        request.session["status_code"] = 403
-        return redirect("error")
+    affiliation_variable: Affiliation = affiliation_getter(request=request)
 
     if form.is_valid():
         clinical_trial: ClinicalTrial = form.save(commit=False)
@@ -190,28 +168,18 @@ def clinical_trial_creation(request: HttpRequest) -> HttpResponse:
 
 
 @login_required
-def clinical_trial_update(request: HttpRequest, pk: int) -> HttpResponse:
-    try:
-        clinical_trial: ClinicalTrial = get_object_or_404(ClinicalTrial, pk=pk)
-    except Http404:
-        request.session["error_message"] = "Clinical trial not found!"
-        request.session["status_code"] = 404
-        return redirect("error")
-
-    try:
-        user_affiliation: Affiliation = affiliation_getter(request=request)
-    except PermissionDenied as e:
-        request.session["error_message"] = str(e)
-        request.session["status_code"] = 403
-        return redirect("error")
-
-    if user_affiliation != clinical_trial.affiliation:
-        request.session["error_message"] = (
-            "Your affiliation doesn't match the clinical trial's affiliation, so you lack permission!"
-        )
-        request.session["status_code"] = 403
-        return redirect("error")
-
+@affiliated_object(
+    ClinicalTrial,
+    affiliation_field="affiliation",
+    not_found_message="Clinical trial not found!",
+    forbidden_message=(
+        "Your affiliation doesn't match the clinical trial's affiliation, "
+        "so you lack permission!"
+    ),
+)
+def clinical_trial_update(
+    request: HttpRequest, clinical_trial: ClinicalTrial
+) -> HttpResponse:
     form: ClinicalTrialUpdateForm = ClinicalTrialUpdateForm(
         request.POST or None, instance=clinical_trial
     )
@@ -222,33 +190,23 @@ def clinical_trial_update(request: HttpRequest, pk: int) -> HttpResponse:
         return render(
             request=request,
             template_name="research/clinical_trials/clinical_trial_update.html",
-            context={"form": form, "pk": pk, "logged": True},
+            context={"form": form, "pk": clinical_trial.pk, "logged": True},
         )
 
 
 @login_required
-def clinical_trial_delete(request: HttpRequest, pk: int) -> HttpResponse:
-    try:
-        clinical_trial: ClinicalTrial = get_object_or_404(ClinicalTrial, pk=pk)
-    except Http404:
-        request.session["error_message"] = "Clinical trial not found!"
-        request.session["status_code"] = 404
-        return redirect("error")
-
-    try:
-        user_affiliation: Affiliation = affiliation_getter(request=request)
-    except PermissionDenied as e:
-        request.session["error_message"] = str(e)
-        request.session["status_code"] = 403
-        return redirect("error")
-
-    if user_affiliation != clinical_trial.affiliation:
-        request.session["error_message"] = (
-            "Your affiliation doesn't match the clinical trial's affiliation, so you lack permission!"
-        )
-        request.session["status_code"] = 403
-        return redirect("error")
-
+@affiliated_object(
+    ClinicalTrial,
+    affiliation_field="affiliation",
+    not_found_message="Clinical trial not found!",
+    forbidden_message=(
+        "Your affiliation doesn't match the clinical trial's affiliation, "
+        "so you lack permission!"
+    ),
+)
+def clinical_trial_delete(
+    request: HttpRequest, clinical_trial: ClinicalTrial
+) -> HttpResponse:
     form: ClinicalTrialDeleteForm = ClinicalTrialDeleteForm(
         request.POST or None, instance=clinical_trial
     )
@@ -259,28 +217,22 @@ def clinical_trial_delete(request: HttpRequest, pk: int) -> HttpResponse:
         return render(
             request=request,
             template_name="research/clinical_trials/clinical_trial_delete.html",
-            context={"form": form, "pk": pk, "logged": True},
+            context={"form": form, "pk": clinical_trial.pk, "logged": True},
         )
 
 
 @login_required
-def affiliated_clinical_trials_list(request: HttpRequest) -> HttpResponse:
-    try:
-        user_affiliation: Affiliation = affiliation_getter(request=request)
-    except PermissionDenied as e:
-        request.session["error_message"] = str(e)
-        request.session["status_code"] = 403
-        return redirect("error")
+@conditional(list_validators(ClinicalTrial))
+async def affiliated_clinical_trials_list(request: HttpRequest) -> HttpResponse:
+    user_affiliation: Affiliation = affiliation_getter(request=request)
 
     clinical_trials: QuerySet[ClinicalTrial] = (
-        ClinicalTrial.objects.filter(affiliation=user_affiliation)
-        .order_by("title")
-        .all()
+        ClinicalTrial.objects.with_related().filter(affiliation=user_affiliation)
     )
     per_page: int = 9
-    paginator: Paginator = Paginator(clinical_trials, per_page=per_page)
-    page_number: int = request.GET.get("page")
-    page_obj: Page = paginator.get_page(page_number)
+    page_obj: KeysetPage | Page = await apaginate(
+        request, clinical_trials, per_page=per_page, ordering=("title",)
+    )
     return render(
         request=request,
         template_name="research/clinical_trials/affiliated_clinical_trials_list.html",
@@ -288,21 +240,19 @@ def affiliated_clinical_trials_list(request: HttpRequest) -> HttpResponse:
     )
 
 
-def clinical_trial_details(request: HttpRequest, pk: int) -> HttpResponse:
-    try:
-        clinical_trial: ClinicalTrial = get_object_or_404(ClinicalTrial, pk=pk)
-    except Http404:
-        request.session["error_message"] = "Clinical trial not found!"
-        request.session["status_code"] = 404
-        return redirect("error")
-
-    has_rights: bool = False
-    logged: bool = False
-    if request.user.is_authenticated:
-        logged = True
-        user_affiliation: Affiliation = request.user.userprofile.affiliation
-        if user_affiliation == clinical_trial.affiliation:
-            has_rights = True
+@conditional(detail_validators(ClinicalTrial))
+@affiliated_object(
+    ClinicalTrial.objects.with_related(),
+    affiliation_field="affiliation",
+    not_found_message="Clinical trial not found!",
+    require_affiliation=False,
+    cached=True,
+)
+async def clinical_trial_details(
+    request: HttpRequest, clinical_trial: ClinicalTrial
+) -> HttpResponse:
+    has_rights: bool = clinical_trial.is_affiliated
+    logged: bool = request.user.is_authenticated
 
     return render(
         request=request,
@@ -320,12 +270,7 @@ def publication_creation(request: HttpRequest) -> HttpResponse:
     form: PublicationCreationForm = PublicationCreationForm(
         request.POST or None, user=request.user
     )
-    try:
-        affiliation_variable: Affiliation = affiliation_getter(request=request)
-    except PermissionDenied as e:
-        request.session["error_message"] = str(e)
-        request.session["status_code"] = 403
-        return redirect("error")
+    affiliation_variable: Affiliation = affiliation_getter(request=request)
 
     if form.is_valid():
         publication: Publication = form.save(commit=False)
@@ -341,28 +286,16 @@ def publication_creation(request: HttpRequest) -> HttpResponse:
 
 
 @login_required
-def publication_update(request: HttpRequest, pk: int) -> HttpResponse:
-    try:
-        publication: Publication = get_object_or_404(Publication, pk=pk)
-    except Http404:
-        request.session["error_message"] = "Publication not found!"
-        request.session["status_code"] = 404
-        return redirect("error")
-
-    try:
-        user_affiliation: Affiliation = affiliation_getter(request=request)
-    except PermissionDenied as e:
-        request.session["error_message"] = str(e)
-        request.session["status_code"] = 403
-        return redirect("error")
-
-    if user_affiliation != publication.affiliation:
-        request.session["error_message"] = (
-            "Your affiliation doesn't match the publication's affiliation, so you lack permission!"
-        )
-        request.session["status_code"] = 403
-        return redirect("error")
-
+@affiliated_object(
+    Publication,
+    affiliation_field="affiliation",
+    not_found_message="Publication not found!",
+    forbidden_message=(
+        "Your affiliation doesn't match the publication's affiliation, "
+        "so you lack permission!"
+    ),
+)
+def publication_update(request: HttpRequest, publication: Publication) -> HttpResponse:
     form: PublicationUpdateForm = PublicationUpdateForm(
         request.POST or None, instance=publication
     )
@@ -373,33 +306,21 @@ def publication_update(request: HttpRequest, pk: int) -> HttpResponse:
         return render(
             request=request,
             template_name="research/publications/publication_update.html",
-            context={"form": form, "pk": pk, "logged": True},
+            context={"form": form, "pk": publication.pk, "logged": True},
         )
 
 
 @login_required
-def publication_delete(request: HttpRequest, pk: int) -> HttpResponse:
-    try:
-        publication: Publication = get_object_or_404(Publication, pk=pk)
-    except Http404:
-        request.session["error_message"] = "Publication not found!"
-        request.session["status_code"] = 404
-        return redirect("error")
-
-    try:
-        user_affiliation: Affiliation = affiliation_getter(request=request)
-    except PermissionDenied as e:
-        request.session["error_message"] = str(e)
-        request.session["status_code"] = 403
-        return redirect("error")
-
-    if user_affiliation != publication.affiliation:
-        request.session["error_message"] = (
-            "Your affiliation doesn't match the publication's affiliation, so you lack permission!"
-        )
-        request.session["status_code"] = 403
-        return redirect("error")
-
+@affiliated_object(
+    Publication,
+    affiliation_field="affiliation",
+    not_found_message="Publication not found!",
+    forbidden_message=(
+        "Your affiliation doesn't match the publication's affiliation, "
+        "so you lack permission!"
+    ),
+)
+def publication_delete(request: HttpRequest, publication: Publication) -> HttpResponse:
     form: PublicationDeleteForm = PublicationDeleteForm(
         request.POST or None, instance=publication
     )
@@ -410,26 +331,22 @@ def publication_delete(request: HttpRequest, pk: int) -> HttpResponse:
         return render(
             request=request,
             template_name="research/publications/publication_delete.html",
-            context={"form": form, "pk": pk, "logged": True},
+            context={"form": form, "pk": publication.pk, "logged": True},
         )
 
 
 @login_required
-def affiliated_publications_list(request: HttpRequest) -> HttpResponse:
-    try:
-        user_affiliation: Affiliation = affiliation_getter(request=request)
-    except PermissionDenied as e:
-        request.session["error_message"] = str(e)
-        request.session["status_code"] = 403
-        return redirect("error")
+@conditional(list_validators(Publication))
+async def affiliated_publications_list(request: HttpRequest) -> HttpResponse:
+    user_affiliation: Affiliation = affiliation_getter(request=request)
 
     publications: QuerySet[Publication] = (
-        Publication.objects.filter(affiliation=user_affiliation).order_by("title").all()
+        Publication.objects.with_related().filter(affiliation=user_affiliation)
     )
     per_page: int = 9
-    paginator: Paginator = Paginator(publications, per_page=per_page)
-    page_number: int = request.GET.get("page")
-    page_obj: Page = paginator.get_page(page_number)
+    page_obj: KeysetPage | Page = await apaginate(
+        request, publications, per_page=per_page, ordering=("title",)
+    )
     return render(
         request=request,
         template_name="research/publications/affiliated_publications_list.html",
@@ -438,22 +355,19 @@ def affiliated_publications_list(request: HttpRequest) -> HttpResponse:
 
 
 @login_required
-def publication_details(request: HttpRequest, pk: int) -> HttpResponse:
-    try:
-        publication: Publication = get_object_or_404(Publication, pk=pk)
-    except Http404:
-        request.session["error_message"] = "Publication not found!"
-        request.session["status_code"] = 404
-        return redirect("error")
-
-    has_rights: bool = False
-    logged: bool = False
-
-    if request.user.is_authenticated:
-        logged = True
-        user_affiliation: Affiliation = request.user.userprofile.affiliation
-        if user_affiliation == publication.affiliation:
-            has_rights = True
+@conditional(detail_validators(Publication))
+@affiliated_object(
+    Publication.objects.with_related(),
+    affiliation_field="affiliation",
+    not_found_message="Publication not found!",
+    require_affiliation=False,
+    cached=True,
+)
+async def publication_details(
+    request: HttpRequest, publication: Publication
+) -> HttpResponse:
+    has_rights: bool = publication.is_affiliated
+    logged: bool = request.user.is_authenticated
 
     return render(
         request=request,
@@ -466,10 +380,112 @@ def publication_details(request: HttpRequest, pk: int) -> HttpResponse:
     )
 
 
-def affiliation_getter(request: HttpRequest) -> HttpResponse | Affiliation:
-    affiliation_result: Affiliation = request.user.userprofile.affiliation
+def search(request: HttpRequest) -> HttpResponse:
+    query: str = request.GET.get("q", "").strip()
+    per_page: int = 30
+    results: List[SearchHit] = search_objects(query, limit=per_page) if query else []
+
+    return render(
+        request=request,
+        template_name="research/search.html",
+        context={
+            "query": query,
+            "results": results,
+            "logged": request.user.is_authenticated,
+        },
+    )
+
+
+def drug_autocomplete(request: HttpRequest) -> JsonResponse:
+    query: str = request.GET.get("q", "")
+    try:
+        limit: int = min(max(int(request.GET.get("limit", 10)), 1), 20)
+    except ValueError:
+        limit = 10
+
+    drug_name_index.ensure_current()
+    matches: List[Tuple[int, str, str]] = drug_name_index.search(query, limit=limit)
+    return JsonResponse(
+        {
+            "results": [
+                {
+                    "id": pk,
+                    "proprietary_name": proprietary_name,
+                    "international_non_proprietary_name": inn,
+                }
+                for pk, proprietary_name, inn in matches
+            ]
+        }
+    )
+
+
+@login_required
+def clinical_trial_lookup(request: HttpRequest) -> JsonResponse:
+    return lookup_response(
+        request,
+        ClinicalTrial.objects.filter(affiliation=request.affiliation).only("title"),
+        search_fields=("title",),
+        ordering=("title",),
+    )
+
+
+def clinical_trial_timeline(request: HttpRequest) -> JsonResponse:
+    today: datetime.date = datetime.date.today()
+    year_ago: datetime.date = today - datetime.timedelta(days=364)
+    try:
+        start: datetime.date = datetime.date.fromisoformat(
+            request.GET.get("start") or year_ago.isoformat()
+        )
+        end: datetime.date = datetime.date.fromisoformat(
+            request.GET.get("end") or today.isoformat()
+        )
+    except ValueError:
+        return JsonResponse({"error": "Dates must be YYYY-MM-DD."}, status=400)
+    if not 0 <= (end - start).days < MAX_TIMELINE_DAYS:
+        return JsonResponse(
+            {"error": f"The range must span 1 to {MAX_TIMELINE_DAYS} days."},
+            status=400,
+        )
+
+    trials: QuerySet[ClinicalTrial] = ClinicalTrial.objects.all()
+    if request.GET.get("affiliation") == "mine":
+        if request.affiliation is None:
+            return JsonResponse({"error": "You do not have affiliation!"}, status=403)
+        trials = trials.filter(affiliation=request.affiliation)
+
+    return JsonResponse(
+        {
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+            "active": active_trials_per_day(trials, start, end).tolist(),
+        }
+    )
+
+
+@login_required
+def affiliation_dashboard(request: HttpRequest) -> HttpResponse:
+    user_affiliation: Affiliation = affiliation_getter(request=request)
+
+    counts: Dict[str, Dict[str, int]] = read_summary(user_affiliation.pk)
+    sections: List[Tuple[str, List[Tuple[str, int]]]] = [
+        (title, sorted(counts[dimension].items()))
+        for dimension, title in DASHBOARD_SECTIONS
+    ]
+    return render(
+        request=request,
+        template_name="research/dashboard.html",
+        context={
+            "affiliation": user_affiliation,
+            "sections": sections,
+            "logged": True,
+        },
+    )
+
+
+def affiliation_getter(request: HttpRequest) -> Affiliation:
+    affiliation_result: Affiliation = request.affiliation
     if affiliation_result is None:
-        raise PermissionDenied("You do not have affiliation!")
+        raise NoAffiliation()
 
     else:
         return affiliation_result
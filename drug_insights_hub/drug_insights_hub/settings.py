@@ -46,11 +46,15 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "drug_insights_hub.core.middleware.RequestInstrumentationMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "drug_insights_hub.accounts.middleware.AffiliationMiddleware",
+    "drug_insights_hub.core.middleware.ProfilingMiddleware",
+    "drug_insights_hub.errors.middleware.ErrorPageMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -59,7 +63,8 @@ ROOT_URLCONF = "drug_insights_hub.urls"
 
 TEMPLATES = [
     {
-        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        # DjangoTemplates that reports render time to the request metrics.
+        "BACKEND": "drug_insights_hub.core.instrumentation.DjangoTemplates",
         "DIRS": [BASE_DIR / "templates"],
         "APP_DIRS": True,
         "OPTIONS": {
@@ -91,6 +96,38 @@ DATABASES = {
 }
 
 
+AUTHENTICATION_BACKENDS = [
+    "drug_insights_hub.accounts.backends.AffiliationModelBackend",
+]
+
+
+# Every alias goes through CountedCache, which counts hits and misses for the
+# request metrics; OPTIONS["BACKEND"] is the backend that stores the entries.
+CACHES = {
+    "default": {
+        "BACKEND": "drug_insights_hub.core.instrumentation.CountedCache",
+        "OPTIONS": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    },
+    # Detail-page object cache. Entries are keyed by the row's updated_at and
+    # the affiliation's shared version, so a per-process LocMemCache stays
+    # correct when another worker saves; FileBasedCache with a shared LOCATION
+    # also shares the entries.
+    "objects": {
+        "BACKEND": "drug_insights_hub.core.instrumentation.CountedCache",
+        "LOCATION": "objects",
+        "OPTIONS": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    },
+    # Version keys that invalidate entries cached in other processes, like
+    # the form choice lists. Every worker must see the same versions, so this
+    # is a shared backend; use Redis or Memcached when workers span hosts.
+    "versions": {
+        "BACKEND": "drug_insights_hub.core.instrumentation.CountedCache",
+        "LOCATION": BASE_DIR / "cache" / "versions",
+        "OPTIONS": {"BACKEND": "django.core.cache.backends.filebased.FileBasedCache"},
+    },
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
 
@@ -135,5 +172,45 @@ STATICFILES_DIRS = (BASE_DIR / "static",)
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 LOGIN_REDIRECT_URL = reverse_lazy("index")
-LOGIN_URL = reverse_lazy("login_user")
+LOGIN_URL = reverse_lazy("login")
 LOGOUT_REDIRECT_URL = reverse_lazy("index")
+
+# "keyset" paginates list pages with opaque ?after=/?before= cursors; "offset"
+# restores the classic ?page=N paginator.
+PAGINATION_MODE = "keyset"
+
+# "in_place" renders errors/error.html in the failing request; "redirect"
+# falls back to storing the error in the session and redirecting to /errors/.
+ERROR_RENDERING = "in_place"
+
+# Requests slower than this log their SQL to drug_insights_hub.requests.slow.
+SLOW_REQUEST_THRESHOLD_MS = 500
+
+# Staff can profile a request by sending a token from the profile report
+# admin as ?_profile= or an X-Profile header. Only the newest reports are kept.
+PROFILE_REPORT_DIR = BASE_DIR / "profiles"
+PROFILE_REPORT_LIMIT = 100
+PROFILE_TOKEN_MAX_AGE = 60 * 60
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "formatters": {"message": {"format": "%(message)s"}},
+    "handlers": {
+        # One JSON line per request, in production too.
+        "requests": {"class": "logging.StreamHandler", "formatter": "message"},
+        "slow_requests": {"class": "logging.StreamHandler", "formatter": "message"},
+    },
+    "loggers": {
+        "drug_insights_hub.requests": {
+            "handlers": ["requests"],
+            "level": "INFO",
+            "propagate": False,
+        },
+        "drug_insights_hub.requests.slow": {
+            "handlers": ["slow_requests"],
+            "level": "WARNING",
+            "propagate": False,
+        },
+    },
+}
@@ -0,0 +1,93 @@
+(function() {
+  "use strict";
+
+  const DEBOUNCE_MS = 250;
+
+  const setup = (select) => {
+    const search = document.createElement("input");
+    search.type = "search";
+    search.className = "form-control mb-1";
+    search.placeholder = "Type to search";
+
+    const results = document.createElement("div");
+    results.className = "list-group mb-1";
+
+    const more = document.createElement("button");
+    more.type = "button";
+    more.className = "btn btn-sm btn-outline-secondary mb-2";
+    more.textContent = "More results";
+    more.hidden = true;
+
+    select.parentNode.insertBefore(search, select);
+    select.parentNode.insertBefore(results, select);
+    select.parentNode.insertBefore(more, select);
+
+    let next = null;
+    let timer = null;
+    let request = 0;
+
+    const isSelected = (id) =>
+      [...select.options].some((option) => option.value === String(id));
+
+    const addOption = (item) => {
+      if (isSelected(item.id)) {
+        return;
+      }
+      const option = new Option(item.text, item.id, true, true);
+      select.add(option);
+    };
+
+    const render = (items, append) => {
+      if (!append) {
+        results.replaceChildren();
+      }
+      items.forEach((item) => {
+        const button = document.createElement("button");
+        button.type = "button";
+        button.className = "list-group-item list-group-item-action";
+        button.textContent = item.text;
+        button.addEventListener("click", () => {
+          addOption(item);
+          button.remove();
+        });
+        results.append(button);
+      });
+    };
+
+    const load = (append) => {
+      const url = new URL(select.dataset.lookupUrl, window.location.origin);
+      url.searchParams.set("q", search.value);
+      if (append && next) {
+        url.searchParams.set("after", next);
+      }
+      const current = ++request;
+      fetch(url, { credentials: "same-origin" })
+        .then((response) => response.json())
+        .then((data) => {
+          if (current !== request) {
+            return;
+          }
+          next = data.next;
+          more.hidden = !next;
+          render(data.results.filter((item) => !isSelected(item.id)), append);
+        });
+    };
+
+    search.addEventListener("input", () => {
+      clearTimeout(timer);
+      timer = setTimeout(() => load(false), DEBOUNCE_MS);
+    });
+    more.addEventListener("click", () => load(true));
+
+    // Clicking a selected option removes it.
+    select.addEventListener("change", () => {
+      [...select.options]
+        .filter((option) => !option.selected)
+        .forEach((option) => option.remove());
+    });
+  };
+
+  document.addEventListener("DOMContentLoaded", () => {
+    document.querySelectorAll("select[data-async-select]").forEach(setup);
+  });
+})();